@@ -0,0 +1,48 @@
+"""course rating histograms
+
+Revision ID: a8b2e5d14c70
+Revises: f6a0d3c81e57
+Create Date: 2026-10-19 15:05:48.270391
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8b2e5d14c70'
+down_revision: Union[str, Sequence[str], None] = 'f6a0d3c81e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'course_rankings',
+        sa.Column('histogram', postgresql.ARRAY(sa.Integer()), nullable=True),
+    )
+    # Backfill: counts of rating 1-5, difficulty 1-5, workload 1-5
+    counts = ", ".join(
+        f"count(*) FILTER (WHERE r.{column} = {value})"
+        for column in ("rating_overall", "difficulty", "workload")
+        for value in range(1, 6)
+    )
+    op.execute(
+        f"""
+        UPDATE course_rankings cr
+        SET histogram = (
+            SELECT ARRAY[{counts}]::integer[]
+            FROM reviews r
+            WHERE r.course_id = cr.course_id AND r.is_hidden IS false
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('course_rankings', 'histogram')
@@ -0,0 +1,47 @@
+"""course tag counts
+
+Revision ID: c9ad3bf09fd7
+Revises: bcd59385275b
+Create Date: 2026-10-19 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9ad3bf09fd7'
+down_revision: Union[str, Sequence[str], None] = 'bcd59385275b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'course_tag_counts',
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('tag_id', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id']),
+        sa.ForeignKeyConstraint(['tag_id'], ['tags.id']),
+        sa.PrimaryKeyConstraint('course_id', 'tag_id'),
+    )
+    # Backfill from existing visible reviews
+    op.execute(
+        """
+        INSERT INTO course_tag_counts (course_id, tag_id, count)
+        SELECT r.course_id, rt.tag_id, count(*)
+        FROM reviews r
+        JOIN review_tags rt ON rt.review_id = r.id
+        WHERE r.is_hidden IS false
+        GROUP BY r.course_id, rt.tag_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('course_tag_counts')
@@ -0,0 +1,42 @@
+"""course rankings score index tiebreak
+
+Revision ID: d72c5e09a4b1
+Revises: b3d9c4e27f18
+Create Date: 2026-10-19 18:12:40.731925
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd72c5e09a4b1'
+down_revision: Union[str, Sequence[str], None] = 'b3d9c4e27f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The recommended sort breaks score ties on course id; with it in the
+    # index the whole ORDER BY is read off the index
+    op.drop_index('ix_course_rankings_score', table_name='course_rankings')
+    op.create_index(
+        'ix_course_rankings_score',
+        'course_rankings',
+        [sa.text('score DESC NULLS LAST'), 'course_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_course_rankings_score', table_name='course_rankings')
+    op.create_index(
+        'ix_course_rankings_score',
+        'course_rankings',
+        [sa.text('score DESC NULLS LAST')],
+        unique=False,
+    )
@@ -0,0 +1,70 @@
+"""course rankings
+
+Revision ID: e41f7a2b9c03
+Revises: c9ad3bf09fd7
+Create Date: 2026-10-19 13:40:12.518304
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.repositories.course import ranking_score
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41f7a2b9c03'
+down_revision: Union[str, Sequence[str], None] = 'c9ad3bf09fd7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'course_rankings',
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id']),
+        sa.PrimaryKeyConstraint('course_id'),
+    )
+    op.create_index(
+        'ix_course_rankings_score',
+        'course_rankings',
+        [sa.text('score DESC NULLS LAST')],
+        unique=False,
+    )
+    # Backfill with the repository's own score expression, so the stored
+    # scores match what refresh_review_aggregates writes with the
+    # RankingConstants of the release that runs this migration
+    reviews = sa.table(
+        'reviews',
+        sa.column('id'),
+        sa.column('course_id'),
+        sa.column('rating_overall'),
+        sa.column('difficulty'),
+        sa.column('workload'),
+        sa.column('is_hidden'),
+    )
+    score = ranking_score(
+        sa.func.sum(reviews.c.rating_overall),
+        sa.func.sum(reviews.c.difficulty),
+        sa.func.sum(reviews.c.workload),
+        sa.func.count(reviews.c.id),
+    )
+    op.execute(
+        sa.table('course_rankings', sa.column('course_id'), sa.column('score'))
+        .insert()
+        .from_select(
+            ['course_id', 'score'],
+            sa.select(reviews.c.course_id, score)
+            .where(reviews.c.is_hidden.is_(False))
+            .group_by(reviews.c.course_id),
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_course_rankings_score', table_name='course_rankings')
+    op.drop_table('course_rankings')
@@ -0,0 +1,30 @@
+"""course offering filter indexes
+
+Revision ID: f6a0d3c81e57
+Revises: e41f7a2b9c03
+Create Date: 2026-10-19 14:22:05.913746
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a0d3c81e57'
+down_revision: Union[str, Sequence[str], None] = 'e41f7a2b9c03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_course_offerings_grade_semester', 'course_offerings', ['grade_target', 'semester', 'status', 'course_id'], unique=False)
+    op.create_index('ix_course_offerings_semester_grade', 'course_offerings', ['semester', 'grade_target', 'status', 'course_id'], unique=False)
+    op.create_index('ix_majors_department', 'majors', ['department'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_majors_department', table_name='majors')
+    op.drop_index('ix_course_offerings_semester_grade', table_name='course_offerings')
+    op.drop_index('ix_course_offerings_grade_semester', table_name='course_offerings')
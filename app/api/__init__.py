@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from app.api.v1.admin import router as admin_router
 from app.api.v1.auth import router as auth_router
 from app.api.v1.courses import router as courses_router
 from app.api.v1.majors import router as majors_router
@@ -14,3 +15,4 @@ api_router.include_router(courses_router, prefix="/courses", tags=["courses"])
 api_router.include_router(reviews_router, tags=["reviews"])
 api_router.include_router(tags_router, prefix="/tags", tags=["tags"])
 api_router.include_router(search_router, tags=["search"])
+api_router.include_router(admin_router, prefix="/admin", tags=["admin"])
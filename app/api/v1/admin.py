@@ -0,0 +1,65 @@
+"""
+Operator endpoints (profiling, review moderation), authenticated with
+ADMIN_TOKEN (see deps/admin.py).
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.profiling import (
+    PROFILE_HEADER,
+    RequestProfile,
+    request_profiler,
+    sign_profile_token,
+)
+from app.db import get_db
+from app.deps.admin import require_admin
+from app.schemas import ProfileDetail, ProfileSummary, ProfileTokenResponse
+from app.services import ReviewService
+from app.services.review.errors import ReviewNotFoundError
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+def _get_profile(profile_id: str) -> RequestProfile:
+    profile = request_profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+
+@router.post("/profile-token", response_model=ProfileTokenResponse)
+async def create_profile_token(
+    ttl: int = Query(300, ge=1, le=3600, description="Seconds the token stays valid"),
+) -> ProfileTokenResponse:
+    """Signed `X-Profile` header value: requests sending it are profiled."""
+    return ProfileTokenResponse(
+        header=PROFILE_HEADER, value=sign_profile_token(ttl), expires_in=ttl
+    )
+
+
+@router.get("/profiles", response_model=list[ProfileSummary])
+async def list_profiles() -> list[dict]:
+    """Recent request profiles in this worker process, newest first."""
+    return [profile.summary() for profile in request_profiler.list()]
+
+
+@router.get("/profiles/{profile_id}", response_model=ProfileDetail)
+async def get_profile(profile_id: str) -> RequestProfile:
+    return _get_profile(profile_id)
+
+
+@router.get("/profiles/{profile_id}/collapsed", response_class=PlainTextResponse)
+async def get_profile_collapsed(profile_id: str) -> str:
+    """The profile's stacks in collapsed format, for flamegraph.pl or speedscope."""
+    return _get_profile(profile_id).collapsed()
+
+
+@router.post("/reviews/{review_id}/hide", status_code=204)
+async def hide_review(review_id: int, db: AsyncSession = Depends(get_db)) -> None:
+    """Hide a review and take it out of its course's ratings and tag counts."""
+    try:
+        await ReviewService(db).hide_review(review_id)
+    except ReviewNotFoundError:
+        raise HTTPException(status_code=404, detail="Review not found")
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.password_hasher import PasswordHasherBusyError
 from app.core.rate_limit import RATE_LIMIT_AUTH, limiter
 from app.db import get_db
 from app.schemas import (
@@ -32,6 +33,14 @@ Authentication and User Management Endpoints
 """
 
 
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many sign-in attempts in progress. Please retry shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/signup", response_model=MessageResponse, status_code=201)
 @limiter.limit(RATE_LIMIT_AUTH)
 async def signup(
@@ -49,6 +58,8 @@ async def signup(
         raise HTTPException(status_code=403, detail=str(e))
     except EmailAlreadyExistsError as e:
         raise HTTPException(status_code=409, detail=str(e))
+    except PasswordHasherBusyError:
+        raise _hasher_busy()
 
     return MessageResponse(
         message="Signup successful. Please check your email to verify your account."
@@ -91,6 +102,8 @@ async def login(
         raise HTTPException(status_code=403, detail=str(e))
     except EmailNotVerifiedError as e:
         raise HTTPException(status_code=403, detail=str(e))
+    except PasswordHasherBusyError:
+        raise _hasher_busy()
 
     access_token = create_access_token(user.id)
     return TokenResponse(access_token=access_token)
@@ -112,14 +125,19 @@ async def resend_verification(
     except AuthServiceError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    # TODO: Send verification email with token
-
     return MessageResponse(message="Verification email sent.")
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: CurrentUser) -> UserResponse:
-    return UserResponse.model_validate(current_user)
+async def get_me(
+    current_user: CurrentUser,
+    db: AsyncSession = Depends(get_db),
+) -> UserResponse:
+    # The principal has no email, so load the full row here
+    user = await AuthService(db).get_user(current_user.id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return UserResponse.model_validate(user)
 
 
 @router.delete("/me", response_model=MessageResponse)
@@ -129,5 +147,5 @@ async def delete_account(
 ) -> MessageResponse:
     """Delete the current user's account (soft delete)."""
     auth_service = AuthService(db)
-    await auth_service.delete_account(current_user)
+    await auth_service.delete_account(current_user.id)
     return MessageResponse(message="Account deleted successfully.")
@@ -1,16 +1,24 @@
 from enum import Enum
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.constants import CourseValidation, PaginationDefaults
+from app.core.responses import RowsJSONResponse
 from app.db import get_db
 from app.deps.cache import get_cache
 from app.repositories import CourseRepository
-from app.schemas import CourseDetailResponse, CourseEvalSummary, CourseListResponse
+from app.schemas import (
+    CourseDetailResponse,
+    CourseEvalSummary,
+    CourseFacetsResponse,
+    CourseListResponse,
+    ReviewPageResponse,
+)
 from app.services import CourseService
 from app.services.cache import RedisCache
-from app.utils import CurrentUser, OptionalCurrentUser
+from app.utils import CurrentUser, InvalidCursorError, LazyCurrentUser
 
 router = APIRouter()
 
@@ -19,36 +27,129 @@ class SortOption(str, Enum):
     TOP_RATED = "top_rated"
     MOST_REVIEWED = "most_reviewed"
     LATEST = "latest"
+    RECOMMENDED = "recommended"
+
+
+class ReviewSortOption(str, Enum):
+    NEWEST = "newest"
+    RATING = "rating"
+    DIFFICULTY = "difficulty"
 
 
 @router.get("", response_model=list[CourseListResponse])
 async def get_courses(
-    current_user: OptionalCurrentUser,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     cache: RedisCache = Depends(get_cache),
     major_id: Annotated[int | None, Query(description="Filter by major")] = None,
+    department: Annotated[str | None, Query(description="Filter by department")] = None,
+    grade: Annotated[
+        int | None,
+        Query(
+            ge=CourseValidation.GRADE_MIN,
+            le=CourseValidation.GRADE_MAX,
+            description="Filter by target grade (학년)",
+        ),
+    ] = None,
+    semester: Annotated[
+        int | None,
+        Query(
+            ge=CourseValidation.SEMESTER_MIN,
+            le=CourseValidation.SEMESTER_MAX,
+            description="Filter by semester (학기)",
+        ),
+    ] = None,
     q: Annotated[str | None, Query(description="Search query")] = None,
     sort: Annotated[
         SortOption, Query(description="Sort option")
     ] = SortOption.TOP_RATED,
     limit: Annotated[int, Query(ge=1, le=100)] = 20,
     offset: Annotated[int, Query(ge=0)] = 0,
-) -> list[CourseListResponse]:
+) -> Response:
     service = CourseService(db=db, cache=cache)
-    return await service.get_list(
-        user=current_user,
+    # Public listing: no token decode or user lookup
+    if not q:
+        body = await service.get_list_body(
+            major_id=major_id,
+            sort=sort.value,
+            limit=limit,
+            offset=offset,
+            grade=grade,
+            semester=semester,
+            department=department,
+        )
+        return body.response(request.headers.get("accept-encoding", ""))
+    rows = await service.get_list_rows(
         major_id=major_id,
         q=q,
         sort=sort.value,
         limit=limit,
         offset=offset,
+        grade=grade,
+        semester=semester,
+        department=department,
     )
+    return RowsJSONResponse(CourseListResponse, rows)
+
+
+@router.get("/facets", response_model=CourseFacetsResponse)
+async def get_course_facets(
+    db: AsyncSession = Depends(get_db),
+    cache: RedisCache = Depends(get_cache),
+) -> CourseFacetsResponse:
+    """Course counts per grade, semester and department for the `GET /courses` filters."""
+    service = CourseService(db=db, cache=cache)
+    return await service.get_facets()
+
+
+@router.get("/batch", response_model=list[CourseDetailResponse])
+async def get_courses_batch(
+    current_user: LazyCurrentUser,
+    ids: Annotated[
+        list[int],
+        Query(
+            min_length=1,
+            max_length=PaginationDefaults.COURSE_COMPARE_MAX_IDS,
+            description="Course ids",
+        ),
+    ],
+    db: AsyncSession = Depends(get_db),
+    cache: RedisCache = Depends(get_cache),
+) -> list[CourseDetailResponse]:
+    """
+    Several courses at once for the compare view, in the requested order.
+    Unknown ids are skipped. Reviews are limited to a short preview per course;
+    use `reviews_next_cursor` with `GET /courses/{id}/reviews` for more.
+    """
+    service = CourseService(db=db, cache=cache)
+    return await service.get_batch(list(dict.fromkeys(ids)), current_user)
+
+
+@router.get("/eval-summaries", response_model=dict[int, CourseEvalSummary])
+async def get_course_eval_summaries(
+    current_user: CurrentUser,
+    ids: Annotated[
+        list[int],
+        Query(
+            min_length=1,
+            max_length=PaginationDefaults.COURSE_BATCH_MAX_IDS,
+            description="Course ids",
+        ),
+    ],
+    db: AsyncSession = Depends(get_db),
+) -> dict[int, CourseEvalSummary]:
+    """
+    Eval summaries for many courses at once, keyed by course id.
+    Unknown course ids get an empty summary.
+    """
+    summaries = await CourseRepository(db).get_eval_summaries(list(dict.fromkeys(ids)))
+    return {course_id: CourseEvalSummary(**s) for course_id, s in summaries.items()}
 
 
 @router.get("/{course_id}", response_model=CourseDetailResponse)
 async def get_course(
     course_id: int,
-    current_user: OptionalCurrentUser,
+    current_user: LazyCurrentUser,
     db: AsyncSession = Depends(get_db),
     cache: RedisCache = Depends(get_cache),
 ) -> CourseDetailResponse:
@@ -61,6 +162,43 @@ async def get_course(
     return result
 
 
+@router.get("/{course_id}/reviews", response_model=ReviewPageResponse)
+async def get_course_reviews(
+    course_id: int,
+    current_user: LazyCurrentUser,
+    db: AsyncSession = Depends(get_db),
+    cache: RedisCache = Depends(get_cache),
+    sort: Annotated[
+        ReviewSortOption, Query(description="Sort option")
+    ] = ReviewSortOption.NEWEST,
+    limit: Annotated[
+        int, Query(ge=1, le=PaginationDefaults.REVIEW_PAGE_MAX_LIMIT)
+    ] = PaginationDefaults.REVIEW_PAGE_DEFAULT_LIMIT,
+    cursor: Annotated[str | None, Query(description="Cursor from the previous page")] = None,
+) -> ReviewPageResponse:
+    """
+    Paginated reviews for a course.
+    Pass `next_cursor` from the previous response to get the next page.
+    """
+    service = CourseService(db=db, cache=cache)
+
+    try:
+        result = await service.get_reviews_page(
+            course_id,
+            current_user,
+            sort=sort.value,
+            limit=limit,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if result is None:
+        raise HTTPException(status_code=404, detail="Course not found")
+
+    return result
+
+
 @router.get("/{course_id}/eval-summary", response_model=CourseEvalSummary)
 async def get_course_eval_summary(
     course_id: int,
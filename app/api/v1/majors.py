@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_db
@@ -13,9 +13,11 @@ router = APIRouter()
 
 @router.get("", response_model=list[MajorResponse])
 async def get_majors(
+    request: Request,
     current_user: CurrentUser,
     db: AsyncSession = Depends(get_db),
     cache: RedisCache = Depends(get_cache)
-) -> list[dict]:
+) -> Response:
     service = MajorService(db=db, cache=cache)
-    return await service.get_all()
+    body = await service.get_all_body()
+    return body.response(request.headers.get("accept-encoding", ""))
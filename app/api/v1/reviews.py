@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.rate_limit import RATE_LIMIT_WRITE, limiter
+from app.core.rate_limit import RATE_LIMIT_WRITE, limiter, user_or_ip_key
 from app.db import get_db
+from app.deps.tag_registry import get_tag_registry
 from app.schemas import ReviewCreate, ReviewResponse
 from app.services import ReviewService
 from app.services.review.errors import (
@@ -11,6 +12,7 @@ from app.services.review.errors import (
     InvalidReviewTextError,
     TagNotFoundError,
 )
+from app.services.tag_registry import TagRegistry
 from app.utils import CurrentUser
 
 router = APIRouter()
@@ -19,15 +21,16 @@ router = APIRouter()
 @router.post(
     "/courses/{course_id}/reviews", response_model=ReviewResponse, status_code=201
 )
-@limiter.limit(RATE_LIMIT_WRITE)
+@limiter.limit(RATE_LIMIT_WRITE, key_func=user_or_ip_key)
 async def create_review(
     request: Request,
     course_id: int,
     review_data: ReviewCreate,
     current_user: CurrentUser,
     db: AsyncSession = Depends(get_db),
+    tags: TagRegistry = Depends(get_tag_registry),
 ) -> ReviewResponse:
-    service = ReviewService(db)
+    service = ReviewService(db, tags)
 
     try:
         return await service.create_review(course_id, current_user, review_data)
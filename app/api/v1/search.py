@@ -7,7 +7,8 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.rate_limit import RATE_LIMIT_SEARCH, limiter
+from app.core.rate_limit import RATE_LIMIT_SEARCH, limiter, user_or_ip_key
+from app.core.responses import RowsJSONResponse
 from app.db import get_db
 from app.deps.cache import get_cache_backend
 from app.repositories import CourseRepository
@@ -20,7 +21,7 @@ router = APIRouter()
 
 
 @router.get("/search", response_model=list[SearchResult])
-@limiter.limit(RATE_LIMIT_SEARCH)
+@limiter.limit(RATE_LIMIT_SEARCH, key_func=user_or_ip_key)
 async def search_courses(
     request: Request,
     current_user: CurrentUser,
@@ -28,7 +29,7 @@ async def search_courses(
     db: AsyncSession = Depends(get_db),
     cache: CacheBackend = Depends(get_cache_backend),
     limit: Annotated[int, Query(ge=1, le=50)] = 20,
-) -> list[SearchResult]:
+) -> RowsJSONResponse:
     """
     Search courses by name.
     Also logs the search query for trending tracking.
@@ -39,7 +40,7 @@ async def search_courses(
         pass
 
     results = await CourseRepository(db).search(q, limit=limit)
-    return [SearchResult(**r) for r in results]
+    return RowsJSONResponse(SearchResult, results)
 
 
 @router.get("/trending", response_model=list[TrendingItem])
@@ -1,9 +1,8 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_db
+from app.deps.tag_registry import get_tag_registry
 from app.schemas import TagResponse
-from app.services import TagService
+from app.services.tag_registry import TagRegistry
 from app.utils import CurrentUser
 
 router = APIRouter()
@@ -12,8 +11,6 @@ router = APIRouter()
 @router.get("", response_model=list[TagResponse])
 async def get_tags(
     current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db),
+    tags: TagRegistry = Depends(get_tag_registry),
 ) -> list[TagResponse]:
-    service = TagService(db)
-    tags = await service.get_all()
-    return [TagResponse.model_validate(t) for t in tags]
+    return tags.all()
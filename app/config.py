@@ -17,6 +17,27 @@ class Settings(BaseSettings):
     )
 
     database_url: str
+    # SQLAlchemy compiled-SQL cache entries per engine
+    db_query_cache_size: int = 1000
+    # asyncpg prepared statements kept per connection (0 behind pgbouncer transaction mode)
+    db_prepared_statement_cache_size: int = 500
+    # Warn when a single request runs more SQL statements than this
+    query_count_warn_threshold: int = 10
+
+    # Bearer token for /admin endpoints and signing X-Profile headers (empty disables them)
+    admin_token: str = ""
+    # Request profiling: share of requests sampled, stack sampling interval, profiles kept
+    profile_sample_rate: float = 0.0
+    profile_interval_ms: float = 5.0
+    profile_buffer_size: int = 50
+
+    # bcrypt runs in a dedicated thread pool: concurrent hashes, and callers
+    # allowed to wait for one before new logins/signups get a 503
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 32
+    # bcrypt cost: pinned if set, otherwise calibrated at startup to the target time
+    password_hash_rounds: int | None = None
+    password_hash_target_ms: int = 250
 
     redis_url: str | None = None  # Optional - falls back to in-memory cache
 
@@ -30,6 +51,10 @@ class Settings(BaseSettings):
 
     sendgrid_api_key: str = ""  # Optional - emails won't send if not set
     from_email: str = ""
+    # Local SMTP server (e.g. a fake catch-all one); takes precedence over SendGrid
+    smtp_host: str = ""
+    smtp_port: int = 1025
+    mail_send_rate_per_second: float = 10.0  # Outbox worker's send rate (per process)
 
     sentry_dsn: str = ""  # Optional - error tracking disabled if not set
 
@@ -11,9 +11,13 @@ Usage:
 
 from app.constants.auth import AuthConstants
 from app.constants.cache import CacheKeys, CacheTTL
-from app.constants.course import CourseStatus
-from app.constants.rate_limit import RateLimits
-from app.constants.review import ReviewConstants
+from app.constants.compression import CompressionConstants
+from app.constants.course import CourseStatus, RankingConstants
+from app.constants.health import HealthConstants, HealthStatus
+from app.constants.mail import MailConstants, OutboxStatus
+from app.constants.metrics import MetricsConstants
+from app.constants.rate_limit import RateLimitConstants, RateLimits
+from app.constants.review import EvalTags, ReviewConstants
 from app.constants.validation import (
     CourseValidation,
     PaginationDefaults,
@@ -27,12 +31,25 @@ __all__ = [
     # Cache
     "CacheTTL",
     "CacheKeys",
+    # Compression
+    "CompressionConstants",
     # Course
     "CourseStatus",
+    "RankingConstants",
+    # Health
+    "HealthConstants",
+    "HealthStatus",
+    # Mail
+    "MailConstants",
+    "OutboxStatus",
+    # Metrics
+    "MetricsConstants",
     # Rate Limit
     "RateLimits",
+    "RateLimitConstants",
     # Review
     "ReviewConstants",
+    "EvalTags",
     # Validation
     "ReviewValidation",
     "CourseValidation",
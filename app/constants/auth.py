@@ -12,6 +12,16 @@ class AuthConstants:
     PASSWORD_MIN_LENGTH = 8
     PASSWORD_MAX_LENGTH = 100
 
+    # bcrypt cost: used until startup calibration runs, and calibration bounds.
+    # Calibration times one hash at CALIBRATION_ROUNDS and extrapolates
+    PASSWORD_HASH_DEFAULT_ROUNDS = 12
+    PASSWORD_HASH_MIN_ROUNDS = 10
+    PASSWORD_HASH_MAX_ROUNDS = 15
+    PASSWORD_HASH_CALIBRATION_ROUNDS = 8
+
     # Access control
     REQUIRED_REVIEWS_FOR_FULL_ACCESS = 3
     NEW_USER_GRACE_PERIOD_DAYS = 3
+
+    # Verified access tokens kept in the per-process LRU (see token_cache.py)
+    VERIFIED_TOKEN_CACHE_SIZE = 4096
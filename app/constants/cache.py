@@ -11,9 +11,30 @@ class CacheTTL:
     TRENDING_DATA = 60 * 60 * 24  # 24 hours
     TRENDING_RESPONSE = 120  # 2 minutes
 
+    # How often a worker checks whether the tag catalog changed
+    TAG_VERSION_CHECK = 60  # 1 minute
+
+    # Full reload of the in-process course catalog index
+    CATALOG_INDEX_REFRESH = 60  # 1 minute
+
+    # Cached auth principal; writes invalidate it explicitly
+    USER_PRINCIPAL = 300  # 5 minutes
+
+    # Facet counts are keyed by catalog version; the TTL only clears old versions
+    COURSE_FACETS = 60 * 60 * 24  # 24 hours
+
 
 class CacheKeys:
     """Redis key prefixes and patterns."""
 
     TRENDING_24H = "trending:24h"
     TRENDING_CACHED_PREFIX = "trending:cached:24h"
+
+    TAG_CATALOG_VERSION = "tags:catalog:version"
+
+    COURSE_CATALOG_VERSION = "courses:catalog:version"
+    COURSE_FACETS_PREFIX = "courses:facets"
+
+    USER_PRINCIPAL_PREFIX = "users:principal"
+
+    RATE_LIMIT_PREFIX = "ratelimit"
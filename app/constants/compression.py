@@ -0,0 +1,21 @@
+"""Response compression constants."""
+
+
+class CompressionConstants:
+    """
+    Bodies smaller than MIN_SIZE are sent as is: below about a kilobyte the
+    saved bytes don't pay for the CPU and the Content-Encoding round trip.
+    """
+
+    MIN_SIZE = 1024  # bytes
+
+    # Compressed per request by the middleware: fast settings
+    GZIP_LEVEL = 6
+    BROTLI_QUALITY = 4
+
+    # Compressed once per cache fill and served many times: smaller output
+    CACHED_GZIP_LEVEL = 9
+    CACHED_BROTLI_QUALITY = 9
+
+    # Precompressed course list bodies kept per worker and catalog version
+    MAX_CACHED_BODIES = 256
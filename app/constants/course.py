@@ -6,3 +6,19 @@ from enum import StrEnum
 class CourseStatus(StrEnum):
     ACTIVE = "active"
     DEPRECATED = "deprecated"
+
+
+class RankingConstants:
+    """
+    Weights of the "recommended" ranking score.
+
+    Each average is a Bayesian average pulled towards PRIOR_MEAN with the weight
+    of PRIOR_WEIGHT reviews, so a single 5-star review can't outrank hundreds
+    of 4.8s. Difficulty and workload are inverted (easier/lighter is better).
+    """
+
+    PRIOR_MEAN = 3.0
+    PRIOR_WEIGHT = 5.0
+    RATING_WEIGHT = 0.6
+    EASE_WEIGHT = 0.2
+    LIGHTNESS_WEIGHT = 0.2
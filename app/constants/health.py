@@ -0,0 +1,32 @@
+"""Health check constants and enums."""
+
+from enum import StrEnum
+
+
+class HealthStatus(StrEnum):
+    OK = "ok"
+    DEGRADED = "degraded"  # still serving, but worth a look
+    DOWN = "down"  # readiness fails: the load balancer stops sending traffic
+
+
+class HealthConstants:
+    # The background checker refreshes the readiness report this often; the
+    # probe endpoint only reads the last report, so probes add no DB load
+    CHECK_INTERVAL_SECONDS = 5
+
+    # A dependency check taking longer than this counts as down
+    CHECK_TIMEOUT_SECONDS = 2.0
+
+    # Slower than this and the dependency is degraded
+    DB_SLOW_MS = 100
+    REDIS_SLOW_MS = 50
+
+    # Checked-out share of the DB pool (size + max overflow). At 1.0 new
+    # requests queue for a connection until they time out, so the node sheds
+    # traffic instead
+    POOL_DEGRADED_SATURATION = 0.75
+    POOL_DOWN_SATURATION = 1.0
+
+    # A report older than this many intervals means the checker is stuck
+    # (e.g. a blocked event loop): not ready
+    STALE_AFTER_INTERVALS = 3
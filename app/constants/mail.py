@@ -0,0 +1,33 @@
+"""Outbound email constants and enums."""
+
+from enum import StrEnum
+
+
+class OutboxStatus(StrEnum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class MailConstants:
+    # Messages claimed from the outbox per worker round trip
+    BATCH_SIZE = 50
+
+    # A claimed message is invisible to other workers for this long; if the
+    # worker dies mid-send it is picked up again once the lease runs out
+    CLAIM_LEASE_SECONDS = 120
+
+    # While a batch is in flight (paced sends, provider pauses) the worker
+    # extends its lease this often, so a live worker's claims never expire
+    LEASE_RENEW_INTERVAL_SECONDS = 30
+
+    # Fallback poll when nothing wakes the worker (e.g. rows from another process)
+    POLL_INTERVAL_SECONDS = 5
+
+    # Retries: exponential backoff from RETRY_BASE_SECONDS, capped, then give up
+    MAX_ATTEMPTS = 8
+    RETRY_BASE_SECONDS = 30
+    RETRY_MAX_SECONDS = 60 * 60
+
+    # Upper bound on a provider-requested pause (429 Retry-After)
+    MAX_PROVIDER_PAUSE_SECONDS = 60 * 5
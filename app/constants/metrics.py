@@ -0,0 +1,14 @@
+"""Prometheus metrics constants."""
+
+
+class MetricsConstants:
+    # Request latency histogram buckets (seconds)
+    LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    # Event loop lag: how often the monitor wakes up, and histogram buckets (seconds)
+    LOOP_LAG_INTERVAL_SECONDS = 0.5
+    LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+    # In multiprocess mode, how often each worker refreshes its collected
+    # gauges; a scrape sees other workers' pool and queue sizes at most this old
+    COLLECT_INTERVAL_SECONDS = 5
@@ -2,9 +2,27 @@
 
 
 class RateLimits:
-    """Rate limit values in 'count/period' format for slowapi."""
+    """Rate limit values in 'count/period' format."""
 
     AUTH = "5/minute"  # Signup, login, verification
     WRITE = "10/minute"  # Create review, etc.
     SEARCH = "30/minute"  # Search endpoints
     DEFAULT = "60/minute"  # General API endpoints
+
+
+class RateLimitConstants:
+    """
+    Tuning of the shared limiter's local token batches (see core/rate_limit.py).
+    A worker reserves limit // BATCH_DIVISOR tokens per round trip (at least 1,
+    at most MAX_BATCH), so unspent reservations can only tighten a limit by a
+    small fraction.
+    """
+
+    BATCH_DIVISOR = 10
+    MAX_BATCH = 5
+
+    # After a denial, repeat requests are refused locally for up to this long
+    DENIAL_CACHE_SECONDS = 1.0
+
+    # Keys with local batches kept per worker (least recently used dropped)
+    MAX_LOCAL_KEYS = 10_000
@@ -4,3 +4,12 @@
 class ReviewConstants:
     # Minimum number of reviews needed for eval summary to be considered reliable
     EVAL_TAG_THRESHOLD = 3
+
+
+class EvalTags:
+    """Names of the seeded EVAL_METHOD tags used by the eval summary."""
+
+    FINAL_EXAM = "기말시험"
+    FINAL_ASSIGNMENT = "기말과제물"
+    MIDTERM = "중간과제물"
+    ATTENDANCE = "출석수업"
@@ -32,6 +32,17 @@ class PaginationDefaults:
     COURSE_LIST_DEFAULT_LIMIT = 20
     COURSE_LIST_MAX_LIMIT = 100
 
+    # Course reviews (first page is embedded in course detail)
+    REVIEW_PAGE_DEFAULT_LIMIT = 20
+    REVIEW_PAGE_MAX_LIMIT = 50
+
+    # Batch lookups by course id (matches the largest course list page)
+    COURSE_BATCH_MAX_IDS = 100
+
+    # Compare view (GET /courses/batch): courses per request, reviews per course
+    COURSE_COMPARE_MAX_IDS = 50
+    COURSE_BATCH_REVIEW_PREVIEW = 3
+
     # Search results
     SEARCH_DEFAULT_LIMIT = 20
     SEARCH_MAX_LIMIT = 50
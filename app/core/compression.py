@@ -0,0 +1,120 @@
+"""
+Response compression: Accept-Encoding negotiation and precompressed bodies.
+
+Brotli ("br") is preferred, gzip offered to clients without it.
+`CompressionMiddleware` (core/middleware.py) compresses responses per
+request; cached responses are stored as a `PrecompressedBody` instead, so
+their compression is paid once per cache fill and requests only pick the
+variant the client accepts.
+"""
+
+import base64
+import functools
+import gzip
+import json
+from dataclasses import dataclass, field
+
+import brotli
+from starlette.responses import Response
+
+from app.constants import CompressionConstants
+from app.core.timing import span
+
+# Preferred first
+ENCODINGS = ("br", "gzip")
+
+
+@functools.lru_cache(maxsize=64)
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Best supported encoding allowed by an Accept-Encoding header, if any."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+    wildcard = weights.get("*", 0.0)
+    for encoding in ENCODINGS:
+        if weights.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, cached: bool = False) -> bytes:
+    if encoding == "br":
+        quality = (
+            CompressionConstants.CACHED_BROTLI_QUALITY
+            if cached
+            else CompressionConstants.BROTLI_QUALITY
+        )
+        return brotli.compress(body, quality=quality)
+    level = CompressionConstants.CACHED_GZIP_LEVEL if cached else CompressionConstants.GZIP_LEVEL
+    # mtime=0 keeps the output stable for identical bodies
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+@dataclass(frozen=True)
+class PrecompressedBody:
+    """A response body together with its compressed variants."""
+
+    raw: bytes
+    media_type: str = "application/json"
+    variants: dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls,
+        raw: bytes,
+        media_type: str = "application/json",
+        minimum_size: int = CompressionConstants.MIN_SIZE,
+    ) -> "PrecompressedBody":
+        variants: dict[str, bytes] = {}
+        if len(raw) < minimum_size:
+            return cls(raw, media_type, variants)
+        with span("compress"):
+            for encoding in ENCODINGS:
+                compressed = compress(raw, encoding, cached=True)
+                if len(compressed) < len(raw):
+                    variants[encoding] = compressed
+        return cls(raw, media_type, variants)
+
+    @classmethod
+    def from_json(cls, data: str) -> "PrecompressedBody":
+        stored = json.loads(data)
+        return cls(
+            raw=stored["raw"].encode(),
+            media_type=stored["media_type"],
+            variants={
+                encoding: base64.b64decode(value)
+                for encoding, value in stored["variants"].items()
+            },
+        )
+
+    def to_json(self) -> str:
+        """Cache representation (the cache stores text, so variants are base64)."""
+        return json.dumps(
+            {
+                "raw": self.raw.decode(),
+                "media_type": self.media_type,
+                "variants": {
+                    encoding: base64.b64encode(value).decode()
+                    for encoding, value in self.variants.items()
+                },
+            },
+            ensure_ascii=False,
+        )
+
+    def response(self, accept_encoding: str) -> Response:
+        headers = {"Vary": "Accept-Encoding"}
+        encoding = choose_encoding(accept_encoding) if self.variants else None
+        if encoding is not None and encoding in self.variants:
+            body = self.variants[encoding]
+            headers["Content-Encoding"] = encoding
+        else:
+            body = self.raw
+        return Response(body, media_type=self.media_type, headers=headers)
@@ -0,0 +1,162 @@
+"""
+Prometheus metrics served by GET /metrics, kept with prometheus_client.
+
+Counters and histograms are updated where things happen (requests in the
+middleware in core/middleware.py, cache lookups, rate limit rejections, event
+loop lag); gauges and counters mirrored from elsewhere (DB pool, bcrypt
+queue) are refreshed by collectors registered with `metrics.add_collector`,
+which run before every scrape.
+
+Each uvicorn worker only sees its own requests. With PROMETHEUS_MULTIPROC_DIR
+set in the environment before the app starts, prometheus_client's multiprocess
+mode keeps every worker's values in that directory and /metrics on any worker
+adds them up; gauges declare how workers combine (`multiprocess_mode`). Each
+worker then also runs its collectors every COLLECT_INTERVAL_SECONDS, so the
+others see its gauges, and drops its live gauges on shutdown. Empty the
+directory when the service restarts.
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import Callable
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.constants import MetricsConstants
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsExporter:
+    """Runs the collectors and renders the registry (or every worker's values)."""
+
+    def __init__(
+        self,
+        registry: CollectorRegistry = REGISTRY,
+        multiproc_dir: str | None = os.environ.get("PROMETHEUS_MULTIPROC_DIR"),
+    ):
+        self._registry = registry
+        self._dir = multiproc_dir or None
+        self._collectors: list[Callable[[], None]] = []
+        self._task: asyncio.Task | None = None
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Run `collector` before every scrape to refresh gauges."""
+        self._collectors.append(collector)
+
+    def collect(self) -> None:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception:
+                logger.exception("Metrics collector %r failed", collector)
+
+    def render(self) -> bytes:
+        """This worker's metrics, or all workers' in multiprocess mode."""
+        self.collect()
+        if self._dir is None:
+            return generate_latest(self._registry)
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=self._dir)
+        return generate_latest(registry)
+
+    def start(self) -> None:
+        if self._dir is None or self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._collect_periodically())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        multiprocess.mark_process_dead(os.getpid(), self._dir)
+
+    async def _collect_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(MetricsConstants.COLLECT_INTERVAL_SECONDS)
+            self.collect()
+
+
+class LoopLagMonitor:
+    """
+    Observes how late the event loop wakes a task that sleeps `interval`:
+    time the loop spent on blocking code or a backlog of ready callbacks.
+    """
+
+    def __init__(
+        self,
+        histogram: Histogram,
+        interval: float = MetricsConstants.LOOP_LAG_INTERVAL_SECONDS,
+    ):
+        self._histogram = histogram
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self._interval
+            await asyncio.sleep(self._interval)
+            self._histogram.observe(max(0.0, loop.time() - expected))
+
+
+def cache_namespace(key: str) -> str:
+    """Bounded label for a cache key: its first segment ("courses", "users", ...)."""
+    return key.partition(":")[0]
+
+
+metrics = MetricsExporter()
+
+http_requests = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status.",
+    ("method", "route", "status"),
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route"),
+    buckets=MetricsConstants.LATENCY_BUCKETS,
+)
+cache_lookups = Counter(
+    "cache_lookups_total",
+    "Cache-aside lookups by key namespace and result (hit or miss).",
+    ("namespace", "result"),
+)
+rate_limit_rejections = Counter(
+    "rate_limit_rejections_total",
+    "Requests rejected with 429, by rate limit scope.",
+    ("scope",),
+)
+event_loop_lag = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop ran a timer due now.",
+    buckets=MetricsConstants.LOOP_LAG_BUCKETS,
+)
+loop_lag_monitor = LoopLagMonitor(event_loop_lag)
@@ -1,11 +1,22 @@
 """Custom middleware for security and other cross-cutting concerns."""
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+import logging
+import time
 
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+from app.constants import CompressionConstants
+from app.core.compression import choose_encoding, compress
+from app.core.metrics import http_request_duration, http_requests
+from app.core.profiling import PROFILE_HEADER, RequestProfiler, request_profiler
+from app.core.query_stats import track_queries
+from app.core.timing import span, track_timings
+
+logger = logging.getLogger(__name__)
+
+
+class SecurityHeadersMiddleware:
     """
     Middleware to add security headers to all responses.
 
@@ -15,38 +26,243 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - X-XSS-Protection: Legacy XSS protection (for older browsers)
     - Referrer-Policy: Controls referrer information
     - Permissions-Policy: Restricts browser features
-    - Cache-Control: Prevents caching of sensitive data
+    - Cache-Control: Prevents caching of sensitive data (API paths only)
     - Strict-Transport-Security: Forces HTTPS (when not in debug mode)
+
+    Plain ASGI: the encoded header blocks are built once, and appended to
+    `http.response.start` without wrapping the response (BaseHTTPMiddleware
+    runs every request through an extra task and body stream).
     """
 
-    def __init__(self, app, debug: bool = False):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, debug: bool = False):
+        self.app = app
         self.debug = debug
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        response = await call_next(request)
+        headers = {
+            "x-content-type-options": "nosniff",
+            "x-frame-options": "DENY",
+            "x-xss-protection": "1; mode=block",
+            "referrer-policy": "strict-origin-when-cross-origin",
+            "permissions-policy": (
+                "accelerometer=(), camera=(), geolocation=(), gyroscope=(), "
+                "magnetometer=(), microphone=(), payment=(), usb=()"
+            ),
+        }
+        # HSTS - only in production (not debug mode)
+        if not debug:
+            headers["strict-transport-security"] = "max-age=31536000; includeSubDomains"
+        api_headers = {
+            **headers,
+            "cache-control": "no-store, no-cache, must-revalidate",
+            "pragma": "no-cache",
+        }
+        self._headers = self._encode(headers)
+        self._api_headers = self._encode(api_headers)
 
-        response.headers["X-Content-Type-Options"] = "nosniff"
+    @staticmethod
+    def _encode(headers: dict[str, str]) -> tuple[frozenset[bytes], list[tuple[bytes, bytes]]]:
+        raw = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+        return frozenset(name for name, _ in raw), raw
 
-        response.headers["X-Frame-Options"] = "DENY"
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        response.headers["X-XSS-Protection"] = "1; mode=block"
+        path = scope.get("raw_path") or scope["path"].encode()
+        names, extra = self._api_headers if b"/api/" in path else self._headers
 
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Replace, don't duplicate, any of these the handler already set
+                headers = [h for h in message.get("headers", ()) if h[0].lower() not in names]
+                headers.extend(extra)
+                message["headers"] = headers
+            await send(message)
 
-        response.headers["Permissions-Policy"] = (
-            "accelerometer=(), camera=(), geolocation=(), gyroscope=(), "
-            "magnetometer=(), microphone=(), payment=(), usb=()"
-        )
+        await self.app(scope, receive, send_with_headers)
 
-        if "/api/" in request.url.path:
-            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate"
-            response.headers["Pragma"] = "no-cache"
 
-        # HSTS - only in production (not debug mode)
-        if not self.debug:
-            response.headers["Strict-Transport-Security"] = (
-                "max-age=31536000; includeSubDomains"
-            )
+class CompressionMiddleware:
+    """
+    Compress JSON and text responses with the best encoding the client accepts.
+
+    Only complete bodies of at least `minimum_size` bytes are compressed;
+    streamed responses and ones that already carry a Content-Encoding (e.g. a
+    `PrecompressedBody` from the cache) pass through untouched. Every response
+    that could be compressed gets `Vary: Accept-Encoding`, including ones sent
+    raw to a client that accepts no encoding, so shared caches don't hand
+    that raw copy to gzip clients or the reverse.
+    """
+
+    COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
 
-        return response
+    def __init__(self, app: ASGIApp, minimum_size: int = CompressionConstants.MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start: Message | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # Held back until the body shows whether it is worth compressing
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            start_message, start = start, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(scope=start_message)
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or not headers.get("content-type", "").startswith(self.COMPRESSIBLE_TYPES)
+            ):
+                await send(start_message)
+                await send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            if encoding is None:
+                await send(start_message)
+                await send(message)
+                return
+
+            with span("compress"):
+                body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+class MetricsMiddleware:
+    """
+    Count requests and observe their latency per route template and status
+    for /metrics (core/metrics.py). Requests that match no route share the
+    "unmatched" label, so scanners can't blow up the series count.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500  # if the app raises before responding
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the shared scope
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            http_requests.labels(method, route, str(status)).inc()
+            http_request_duration.labels(method, route).observe(time.perf_counter() - started)
+
+
+class ServerTimingMiddleware:
+    """
+    Middleware to time each request's phases and count its SQL statements.
+
+    Adds a `Server-Timing` header with the request's spans (core/timing.py),
+    `db;dur=...` for its SQL and the `total`, and logs a warning when a
+    request runs more than `warn_threshold` queries, with the slowest
+    statement. Requests picked by the profiler (core/profiling.py) are
+    stack-sampled while they run.
+
+    Plain ASGI: the app runs in this task, inside the trackers, and the
+    headers are added to `http.response.start` as it goes out.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        warn_threshold: int = 10,
+        profiler: RequestProfiler = request_profiler,
+    ):
+        self.app = app
+        self.warn_threshold = warn_threshold
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        method, path = scope["method"], scope["path"]
+        session = None
+        trigger = self.profiler.trigger(Headers(scope=scope).get(PROFILE_HEADER))
+        if trigger is not None:
+            session = self.profiler.begin(method, path, trigger)
+
+        with track_queries() as stats, track_timings() as timings:
+
+            async def send_with_timing(message: Message) -> None:
+                nonlocal session
+                if message["type"] == "http.response.start":
+                    total = time.perf_counter() - started
+                    headers = MutableHeaders(scope=message)
+                    if stats.count:
+                        headers.append("Server-Timing", stats.server_timing())
+                    if timings.totals:
+                        headers.append("Server-Timing", timings.server_timing())
+                    headers.append("Server-Timing", f"total;dur={total * 1000:.1f}")
+
+                    if session is not None:
+                        timings.add("db", stats.total_time)
+                        timings.add("total", total)
+                        profile = session.finish(message["status"], timings.as_dict())
+                        session = None
+                        headers["X-Profile-Id"] = profile.id
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                # Raised before responding
+                if session is not None:
+                    session.finish(None, timings.as_dict())
+
+        if stats.count > self.warn_threshold:
+            route = scope.get("route")
+            logger.warning(
+                "%s %s ran %d queries in %.1f ms (budget %d); slowest %.1f ms: %s",
+                method,
+                getattr(route, "path", path),
+                stats.count,
+                stats.total_time * 1000,
+                self.warn_threshold,
+                stats.slowest_time * 1000,
+                stats.slowest_statement,
+            )
+        elif stats.count:
+            logger.debug(
+                "%s %s ran %d queries in %.1f ms",
+                method,
+                path,
+                stats.count,
+                stats.total_time * 1000,
+            )
@@ -0,0 +1,211 @@
+"""
+bcrypt hashing off the event loop.
+
+A bcrypt hash or check takes hundreds of milliseconds of pure CPU. Run inline
+in an async handler it stalls every other request on the worker, so all
+hashing goes through a small dedicated thread pool (bcrypt releases the GIL
+while it works). At most `workers` calls run at once; callers beyond that wait
+in a queue, and once `max_queue` are waiting new calls are rejected with
+`PasswordHasherBusyError` instead of piling up behind a login storm.
+
+The bcrypt cost is either pinned with PASSWORD_HASH_ROUNDS or calibrated at
+startup so one hash takes about PASSWORD_HASH_TARGET_MS on this machine.
+Stored hashes with an outdated cost are re-hashed on the next successful
+login (`needs_rehash`).
+"""
+
+import asyncio
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+
+import bcrypt
+from prometheus_client import Counter, Gauge
+
+from app.config import settings
+from app.constants import AuthConstants
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasherBusyError(Exception):
+    """Raised when too many hash/verify calls are already waiting."""
+
+    pass
+
+
+@dataclass
+class HasherStats:
+    in_flight: int = 0
+    queued: int = 0
+    max_queued: int = 0
+    completed: int = 0
+    rejected: int = 0
+    wait_seconds: float = 0.0
+    run_seconds: float = 0.0
+
+
+def rounds_for_target(
+    sample_seconds: float,
+    sample_rounds: int,
+    target_seconds: float,
+    min_rounds: int = AuthConstants.PASSWORD_HASH_MIN_ROUNDS,
+    max_rounds: int = AuthConstants.PASSWORD_HASH_MAX_ROUNDS,
+) -> int:
+    """
+    Highest cost whose hash time stays within `target_seconds`, given one hash
+    at `sample_rounds` took `sample_seconds` (each extra round doubles the work).
+    """
+    extra = math.floor(math.log2(target_seconds / max(sample_seconds, 1e-6)))
+    return max(min_rounds, min(max_rounds, sample_rounds + extra))
+
+
+def hash_rounds(password_hash: str) -> int | None:
+    """Cost factor of a `$2b$12$...` hash, None if it isn't one."""
+    parts = password_hash.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_queue: int, rounds: int | None = None):
+        self._workers = workers
+        self._max_queue = max_queue
+        # An explicit cost is enforced both ways; a calibrated one only upgrades
+        self._pinned = rounds is not None
+        self.rounds = rounds if rounds is not None else AuthConstants.PASSWORD_HASH_DEFAULT_ROUNDS
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots: asyncio.Semaphore | None = None
+        self._stats = HasherStats()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so the instance can be built at import time
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._workers)
+        return self._slots
+
+    async def hash(self, password: str, rounds: int | None = None) -> str:
+        salt = bcrypt.gensalt(rounds or self.rounds)
+        hashed = await self._run(bcrypt.hashpw, password.encode(), salt)
+        return hashed.decode()
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run(bcrypt.checkpw, password.encode(), password_hash.encode())
+
+    async def _run(self, func, *args):
+        stats = self._stats
+        slots = self._semaphore()
+        if slots.locked() and stats.queued >= self._max_queue:
+            stats.rejected += 1
+            raise PasswordHasherBusyError("Too many concurrent password operations")
+
+        stats.queued += 1
+        stats.max_queued = max(stats.max_queued, stats.queued)
+        queued_at = time.perf_counter()
+        try:
+            await slots.acquire()
+        finally:
+            stats.queued -= 1
+
+        started_at = time.perf_counter()
+        stats.wait_seconds += started_at - queued_at
+        stats.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            stats.in_flight -= 1
+            stats.completed += 1
+            stats.run_seconds += time.perf_counter() - started_at
+            slots.release()
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """
+        Whether a verified hash should be replaced with one at the current cost.
+        A calibrated cost never downgrades stored hashes, so nodes that calibrate
+        differently don't keep re-hashing each other's work; pin
+        PASSWORD_HASH_ROUNDS to lower the cost fleet-wide.
+        """
+        rounds = hash_rounds(password_hash)
+        if rounds is None:
+            return True
+        return rounds != self.rounds if self._pinned else rounds < self.rounds
+
+    async def calibrate(self, target_seconds: float) -> int:
+        """Pick the cost for `target_seconds` per hash on this machine (no-op if pinned)."""
+        if self._pinned:
+            return self.rounds
+
+        sample_rounds = AuthConstants.PASSWORD_HASH_CALIBRATION_ROUNDS
+        salt = bcrypt.gensalt(sample_rounds)
+        loop = asyncio.get_running_loop()
+
+        def sample() -> float:
+            started = time.perf_counter()
+            bcrypt.hashpw(b"calibration", salt)
+            return time.perf_counter() - started
+
+        # Fastest of a few runs: scheduling noise only ever adds time
+        sample_seconds = min(
+            [await loop.run_in_executor(self._executor, sample) for _ in range(3)]
+        )
+        self.rounds = rounds_for_target(sample_seconds, sample_rounds, target_seconds)
+        logger.info(
+            "bcrypt cost calibrated to %d (~%.0f ms per hash, target %.0f ms)",
+            self.rounds,
+            sample_seconds * 2 ** (self.rounds - sample_rounds) * 1000,
+            target_seconds * 1000,
+        )
+        return self.rounds
+
+    def stats(self) -> dict:
+        """Snapshot of queue depth and timing counters."""
+        return asdict(self._stats)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue,
+    rounds=settings.password_hash_rounds,
+)
+
+hasher_queue = Gauge(
+    "password_hash_operations",
+    "bcrypt calls running or waiting for a worker.",
+    ("state",),
+    multiprocess_mode="livesum",
+)
+hasher_completed = Counter("password_hash_completed_total", "bcrypt calls completed.")
+hasher_rejected = Counter(
+    "password_hash_rejected_total", "bcrypt calls rejected because the queue was full."
+)
+hasher_seconds = Counter(
+    "password_hash_seconds_total", "Time bcrypt calls spent queued or running.", ("phase",)
+)
+
+# Hasher totals already added to the counters (which only go up by increments)
+_reported = {"completed": 0, "rejected": 0, "wait_seconds": 0.0, "run_seconds": 0.0}
+
+
+def _collect_hasher_metrics() -> None:
+    stats = password_hasher.stats()
+    hasher_queue.labels("running").set(stats["in_flight"])
+    hasher_queue.labels("queued").set(stats["queued"])
+    for counter, key in (
+        (hasher_completed, "completed"),
+        (hasher_rejected, "rejected"),
+        (hasher_seconds.labels("wait"), "wait_seconds"),
+        (hasher_seconds.labels("run"), "run_seconds"),
+    ):
+        counter.inc(stats[key] - _reported[key])
+        _reported[key] = stats[key]
+
+
+metrics.add_collector(_collect_hasher_metrics)
@@ -0,0 +1,193 @@
+"""
+On-demand request profiling.
+
+A request is profiled when it carries a valid `X-Profile` header (a
+short-lived token signed with ADMIN_TOKEN, see `sign_profile_token`) or is
+picked at random with probability PROFILE_SAMPLE_RATE. While it runs, a
+sampler thread records the event loop thread's Python stack every
+PROFILE_INTERVAL_MS. The collapsed stacks, the request's Server-Timing spans
+and its status go into a ring buffer of the last PROFILE_BUFFER_SIZE
+profiles, served by the admin endpoints (api/v1/admin.py).
+
+Stack sampling costs the profiled request almost nothing, but the samples
+cover everything the event loop ran meanwhile, other requests included.
+At most one request per process is profiled at a time.
+"""
+
+import hashlib
+import hmac
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from types import FrameType
+
+from app.config import settings
+
+PROFILE_HEADER = "x-profile"
+
+
+def _signature(secret: str, expires: int) -> str:
+    return hmac.new(secret.encode(), f"profile:{expires}".encode(), hashlib.sha256).hexdigest()
+
+
+def sign_profile_token(ttl_seconds: int = 300, secret: str | None = None) -> str:
+    """Value for the `X-Profile` header, valid for `ttl_seconds`."""
+    expires = int(time.time()) + ttl_seconds
+    return f"{expires}.{_signature(secret or settings.admin_token, expires)}"
+
+
+def verify_profile_token(token: str, secret: str) -> bool:
+    expires, _, signature = token.partition(".")
+    if not secret or not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _signature(secret, int(expires)))
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Counts the collapsed stacks of one thread, sampled every `interval` seconds."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stopped = threading.Event()
+        # Held only while a sample is counted, so `stop` never waits on a join
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Freeze `stacks` and `samples`; the thread exits on its own."""
+        with self._lock:
+            self._stopped.set()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if not labels:
+                continue
+            # Root first, the format flame graph tools take
+            stack = ";".join(reversed(labels))
+            with self._lock:
+                if self._stopped.is_set():
+                    return
+                self.stacks[stack] += 1
+                self.samples += 1
+
+
+@dataclass
+class RequestProfile:
+    id: str
+    method: str
+    path: str
+    trigger: str  # "header" or "sample"
+    started_at: datetime
+    status: int | None = None
+    duration_ms: float = 0.0
+    samples: int = 0
+    timings_ms: dict[str, float] = field(default_factory=dict)
+    stacks: list[tuple[str, int]] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        data = asdict(self)
+        del data["stacks"]
+        return data
+
+    def collapsed(self) -> str:
+        """One `frame;frame;frame count` line per stack (flamegraph.pl, speedscope)."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks)
+
+
+class ProfileSession:
+    """One profiled request; `finish` stores it in the profiler's buffer."""
+
+    def __init__(self, profiler: "RequestProfiler", profile: RequestProfile, interval: float):
+        self._profiler = profiler
+        self.profile = profile
+        self._sampler = StackSampler(threading.get_ident(), interval)
+        self._started = time.perf_counter()
+        self._sampler.start()
+
+    def finish(self, status: int | None, timings_ms: dict[str, float]) -> RequestProfile:
+        profile = self.profile
+        try:
+            self._sampler.stop()
+            profile.status = status
+            profile.duration_ms = round((time.perf_counter() - self._started) * 1000, 3)
+            profile.samples = self._sampler.samples
+            profile.timings_ms = timings_ms
+            profile.stacks = self._sampler.stacks.most_common(self._profiler.max_stacks)
+            self._profiler._profiles.append(profile)
+        finally:
+            self._profiler._busy.release()
+        return profile
+
+
+class RequestProfiler:
+    def __init__(
+        self,
+        buffer_size: int = settings.profile_buffer_size,
+        sample_rate: float = settings.profile_sample_rate,
+        interval: float = settings.profile_interval_ms / 1000,
+        secret: str = settings.admin_token,
+        max_stacks: int = 500,
+    ):
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.max_stacks = max_stacks
+        self._secret = secret
+        self._profiles: deque[RequestProfile] = deque(maxlen=buffer_size)
+        self._busy = threading.Lock()
+
+    def trigger(self, profile_header: str | None) -> str | None:
+        """Why this request should be profiled, or None."""
+        if profile_header and verify_profile_token(profile_header, self._secret):
+            return "header"
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    def begin(self, method: str, path: str, trigger: str) -> ProfileSession | None:
+        """Start profiling on the calling (event loop) thread; None if one already runs."""
+        if not self._busy.acquire(blocking=False):
+            return None
+        profile = RequestProfile(
+            id=uuid.uuid4().hex[:12],
+            method=method,
+            path=path,
+            trigger=trigger,
+            started_at=datetime.now(UTC),
+        )
+        try:
+            return ProfileSession(self, profile, self.interval)
+        except Exception:
+            self._busy.release()
+            raise
+
+    def list(self) -> list[RequestProfile]:
+        """Newest first."""
+        return list(reversed(self._profiles))
+
+    def get(self, profile_id: str) -> RequestProfile | None:
+        return next((p for p in self._profiles if p.id == profile_id), None)
+
+
+request_profiler = RequestProfiler()
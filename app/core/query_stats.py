@@ -0,0 +1,102 @@
+"""
+Per-request SQL instrumentation.
+
+Engine event hooks add every statement's duration to the QueryStats held in a
+contextvar for the current request. The middleware in app/core/middleware.py
+emits the totals as a Server-Timing header and warns when a request runs more
+queries than `settings.query_count_warn_threshold` (usually an N+1).
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_time: float = 0.0  # seconds
+    slowest_time: float = 0.0
+    slowest_statement: str | None = None
+    statements: list[str] | None = None  # only collected when tracking in tests
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+        if self.statements is not None:
+            self.statements.append(statement)
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_time * 1000:.1f};desc="{self.count} queries"'
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries(record_statements: bool = False) -> Iterator[QueryStats]:
+    """Collect stats for every statement executed inside the block."""
+    stats = QueryStats(statements=[] if record_statements else None)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def assert_query_budget(max_queries: int) -> Iterator[QueryStats]:
+    """Fail if the block runs more than `max_queries` statements."""
+    with track_queries(record_statements=True) as stats:
+        yield stats
+    if stats.count > max_queries:
+        listing = "\n".join(f"  {i + 1}. {s}" for i, s in enumerate(stats.statements or []))
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, got {stats.count}:\n{listing}"
+        )
+
+
+# The start time lives on the statement's execution context, which is dropped
+# with the statement whether it succeeds or fails, so nothing accumulates on
+# the pooled connection.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_stats.get() is not None:
+        context._query_start = time.perf_counter()
+
+
+def _record(statement: str, context) -> None:
+    stats = _current_stats.get()
+    start = getattr(context, "_query_start", None)
+    if stats is not None and start is not None:
+        stats.record(statement, time.perf_counter() - start)
+        context._query_start = None
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record(statement, context)
+
+
+def _handle_error(exception_context) -> None:
+    # Failed statements still spent database time
+    if exception_context.execution_context is not None:
+        _record(exception_context.statement, exception_context.execution_context)
+
+
+def install_query_hooks(engine: Engine) -> None:
+    """Attach the timing hooks to a (sync) engine; use `async_engine.sync_engine`."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
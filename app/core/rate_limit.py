@@ -1,11 +1,198 @@
-"""Rate limiting configuration using slowapi."""
+"""
+Rate limiting shared across worker processes.
 
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+Requests are counted per endpoint and client key in a sliding window (the
+previous fixed window, weighted by how much of it still overlaps, plus the
+current one) stored in the cache backend. With Redis every uvicorn worker
+sees the same count; without it the count is per process.
 
-from app.constants import RateLimits
+A Redis round trip per request would cost more than most handlers, so each
+worker reserves a small batch of tokens for a key at once and spends them
+locally until the window rolls over. Near the limit the batches shrink to
+what is left. Reserved but unspent tokens still count, so the error is only
+ever on the strict side, by at most one batch per worker: concurrent
+requests that find a key's batch spent wait for a single reservation
+instead of each making their own.
+"""
 
-limiter = Limiter(key_func=get_remote_address)
+import asyncio
+import functools
+import inspect
+import logging
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from fastapi import HTTPException, Request
+
+from app.constants import CacheKeys, RateLimitConstants, RateLimits
+from app.core.metrics import rate_limit_rejections
+from app.services.cache import CacheBackend, InMemoryBackend
+
+logger = logging.getLogger(__name__)
+
+PERIOD_SECONDS = {"second": 1, "minute": 60, "hour": 60 * 60, "day": 60 * 60 * 24}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    count: int
+    seconds: int
+
+    @classmethod
+    def parse(cls, rate: str) -> "RateLimit":
+        """Parse '30/minute' style limits."""
+        count, period = rate.split("/")
+        return cls(int(count), PERIOD_SECONDS[period.strip().rstrip("s")])
+
+    @property
+    def batch(self) -> int:
+        batch = self.count // RateLimitConstants.BATCH_DIVISOR
+        return max(1, min(RateLimitConstants.MAX_BATCH, batch))
+
+    def __str__(self) -> str:
+        return f"{self.count} per {self.seconds} seconds"
+
+
+class RateLimitExceeded(HTTPException):
+    def __init__(self, limit: RateLimit, retry_after: int):
+        super().__init__(
+            status_code=429,
+            detail=f"Rate limit exceeded: {limit}",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+# Key functions get the request and the endpoint's resolved parameters
+def client_ip_key(request: Request, params: dict) -> str:
+    return f"ip:{request.client.host if request.client else '127.0.0.1'}"
+
+
+def user_or_ip_key(request: Request, params: dict) -> str:
+    """Per user on endpoints with a resolved `current_user`, per client IP otherwise."""
+    user = params.get("current_user")
+    if user is not None:
+        return f"user:{user.id}"
+    return client_ip_key(request, params)
+
+
+async def _shared_backend() -> CacheBackend:
+    # Imported on use: app.deps.cache can't be the first module to load the
+    # services package (services -> auth principal -> app.deps.cache)
+    from app.deps.cache import get_cache_backend
+
+    return await get_cache_backend()
+
+
+@dataclass
+class _LocalTokens:
+    window: int
+    tokens: int = 0
+    denied_until: float = 0.0
+    # Held while reserving a batch, so only one reservation per key is in flight
+    refill: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class SharedRateLimiter:
+    def __init__(
+        self,
+        backend_factory: Callable[[], Awaitable[CacheBackend]] = _shared_backend,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._backend_factory = backend_factory
+        self._clock = clock
+        self._local: OrderedDict[str, _LocalTokens] = OrderedDict()
+        # Used while the shared backend is unreachable: per-process counting
+        self._fallback = InMemoryBackend()
+
+    def limit(
+        self, rate: str, key_func: Callable[[Request, dict], str] = client_ip_key
+    ) -> Callable:
+        """
+        Decorate an endpoint taking a `request: Request` parameter. The check
+        runs after FastAPI resolved the endpoint's dependencies, so a key
+        function can use e.g. the authenticated user.
+        """
+        limit = RateLimit.parse(rate)
+
+        def decorator(func):
+            if "request" not in inspect.signature(func).parameters:
+                raise TypeError(f"{func.__name__} needs a `request: Request` parameter")
+            scope = f"{func.__module__}.{func.__name__}"
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                await self.hit(scope, limit, key_func(kwargs["request"], kwargs))
+                return await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    async def hit(self, scope: str, limit: RateLimit, key: str) -> None:
+        """Take one token for `key`, raising RateLimitExceeded if none are left."""
+        now = self._clock()
+        window = int(now // limit.seconds)
+        local_key = f"{scope}:{key}"
+
+        local = self._local.get(local_key)
+        if local is None or local.window != window:
+            local = _LocalTokens(window)
+            self._local[local_key] = local
+            if len(self._local) > RateLimitConstants.MAX_LOCAL_KEYS:
+                self._local.popitem(last=False)
+        self._local.move_to_end(local_key)
+
+        if local.tokens == 0:
+            async with local.refill:
+                # Re-checked: the batch may have been refilled (or denied) while waiting
+                if local.tokens == 0:
+                    await self._refill(scope, local_key, local, limit, window, now)
+        local.tokens -= 1
+
+    async def _refill(
+        self,
+        scope: str,
+        local_key: str,
+        local: _LocalTokens,
+        limit: RateLimit,
+        window: int,
+        now: float,
+    ) -> None:
+        retry_after = math.ceil((window + 1) * limit.seconds - now)
+        if now < local.denied_until:
+            rate_limit_rejections.labels(scope).inc()
+            raise RateLimitExceeded(limit, retry_after)
+
+        local.tokens += await self._reserve(local_key, limit, window, now)
+        if local.tokens == 0:
+            local.denied_until = now + min(RateLimitConstants.DENIAL_CACHE_SECONDS, retry_after)
+            rate_limit_rejections.labels(scope).inc()
+            raise RateLimitExceeded(limit, retry_after)
+
+    async def _reserve(self, local_key: str, limit: RateLimit, window: int, now: float) -> int:
+        prefix = f"{CacheKeys.RATE_LIMIT_PREFIX}:{local_key}"
+
+        async def reserve(backend: CacheBackend) -> int:
+            return await backend.reserve_tokens(
+                key=f"{prefix}:{window}",
+                previous_key=f"{prefix}:{window - 1}",
+                limit=limit.count,
+                previous_weight=1 - (now % limit.seconds) / limit.seconds,
+                amount=limit.batch,
+                ttl=limit.seconds * 2,
+            )
+
+        try:
+            return await reserve(await self._backend_factory())
+        except Exception:
+            logger.warning("Rate limit backend unavailable, counting per process", exc_info=True)
+            return await reserve(self._fallback)
+
+
+limiter = SharedRateLimiter()
 
 RATE_LIMIT_AUTH = RateLimits.AUTH
 RATE_LIMIT_WRITE = RateLimits.WRITE
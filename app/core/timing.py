@@ -0,0 +1,97 @@
+"""
+Per-request phase timings for the Server-Timing header.
+
+Code marks a phase with `span("name")` or `@timed("name")`; the time is added
+to the RequestTimings held in a contextvar for the current request, and the
+middleware in app/core/middleware.py emits the totals next to the `db` entry
+from query_stats.py. Outside a tracked request both are a contextvar lookup.
+
+Spans with the same name don't add up when nested (a cache helper calling a
+cache backend counts once), but different names may overlap: `repo` includes
+the `db` time of its statements, `auth` the `cache` time of its lookup.
+"""
+
+import functools
+import inspect
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+
+@dataclass
+class RequestTimings:
+    totals: dict[str, float] = field(default_factory=dict)  # seconds
+    counts: dict[str, int] = field(default_factory=dict)
+    _open: set[str] = field(default_factory=set)
+
+    def add(self, name: str, elapsed: float) -> None:
+        self.totals[name] = self.totals.get(name, 0.0) + elapsed
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def server_timing(self) -> str:
+        return ", ".join(
+            f'{name};dur={total * 1000:.1f};desc="{self.counts[name]}x"'
+            for name, total in self.totals.items()
+        )
+
+    def as_dict(self) -> dict[str, float]:
+        """Milliseconds per span."""
+        return {name: round(total * 1000, 3) for name, total in self.totals.items()}
+
+
+_current_timings: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> RequestTimings | None:
+    return _current_timings.get()
+
+
+@contextmanager
+def track_timings() -> Iterator[RequestTimings]:
+    """Collect the spans of everything run inside the block."""
+    timings = RequestTimings()
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    timings = _current_timings.get()
+    if timings is None or name in timings._open:
+        yield
+        return
+    timings._open.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings._open.discard(name)
+        timings.add(name, time.perf_counter() - started)
+
+
+def timed(name: str):
+    """Decorator form of `span` for coroutine functions."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if _current_timings.get() is None:
+                return await func(*args, **kwargs)
+            with span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def time_public_methods(cls: type, name: str) -> None:
+    """Wrap the public coroutine methods `cls` defines itself in `timed(name)`."""
+    for attr, value in list(vars(cls).items()):
+        if not attr.startswith("_") and inspect.iscoroutinefunction(value):
+            setattr(cls, attr, timed(name)(value))
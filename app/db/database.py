@@ -1,15 +1,71 @@
-from collections.abc import AsyncGenerator
+import logging
+from collections.abc import AsyncGenerator, Callable
 
+from prometheus_client import Gauge
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.core.metrics import metrics
+from app.core.query_stats import install_query_hooks
+
+logger = logging.getLogger(__name__)
+
+engine = create_async_engine(
+    settings.database_url,
+    echo=settings.debug,
+    query_cache_size=settings.db_query_cache_size,
+    connect_args={
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+    },
+)
+install_query_hooks(engine.sync_engine)
+
+# Every worker has its own pool: summed over the live ones
+db_pool_size = Gauge(
+    "db_pool_size", "Connections the pool keeps open.", multiprocess_mode="livesum"
+)
+db_pool_connections = Gauge(
+    "db_pool_connections", "Pool connections by state.", ("state",), multiprocess_mode="livesum"
+)
+
+
+def pool_stats() -> dict[str, int] | None:
+    """Connections of the engine's pool by state; None if the pool keeps none (NullPool)."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return None
+    return {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,  # -1: unlimited
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+
+
+def _collect_pool_metrics() -> None:
+    stats = pool_stats()
+    if stats is None:
+        return
+    db_pool_size.set(stats["size"])
+    for state in ("checked_out", "idle", "overflow"):
+        db_pool_connections.labels(state).set(stats[state])
+
+
+metrics.add_collector(_collect_pool_metrics)
 
-engine = create_async_engine(settings.database_url, echo=settings.debug)
 AsyncSessionLocal = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
 
+async def ping_database() -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         try:
@@ -18,3 +74,22 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+def run_after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """Run `callback` once the session's current transaction commits (dropped on rollback)."""
+    session.sync_session.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session: Session) -> None:
+    for callback in session.info.pop("after_commit", []):
+        try:
+            callback()
+        except Exception:
+            logger.exception("after_commit callback failed")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit_callbacks(session: Session) -> None:
+    session.info.pop("after_commit", None)
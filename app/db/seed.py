@@ -2,25 +2,45 @@
 Seed script for initial data.
 Run with: python -m app.db.seed
 
+To apply catalog changes to a seeded DB: python -m app.db.seed --sync
+
 To scrape fresh data first: python -m scripts.scrape_knou
 """
 
 import asyncio
 import json
 import re
+from dataclasses import dataclass, field
 from pathlib import Path
 
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.constants import CourseStatus
+from app.constants import CourseStatus, EvalTags
 from app.db.database import AsyncSessionLocal, engine
-from app.models import Base, Course, CourseOffering, Major, Review, ReviewTag, Tag, TagType, User
+from app.deps.cache import get_cache_backend
+from app.models import (
+    Base,
+    Course,
+    CourseOffering,
+    CourseTagCount,
+    Major,
+    Review,
+    ReviewTag,
+    Tag,
+    TagType,
+    User,
+)
+from app.repositories import CourseRepository
+from app.services.course import publish_catalog_version
+from app.services.tag_registry import tag_registry
 
 EVAL_TAGS = [
-    "기말시험",
-    "기말과제물",
-    "중간과제물",
-    "출석수업",
+    EvalTags.FINAL_EXAM,
+    EvalTags.FINAL_ASSIGNMENT,
+    EvalTags.MIDTERM,
+    EvalTags.ATTENDANCE,
 ]
 
 FREEFORM_TAGS = [
@@ -105,6 +125,174 @@ def load_scraped_data() -> dict:
         return json.load(f)
 
 
+def parse_catalog(data: dict) -> tuple[dict[str, str], dict[str, dict]]:
+    """
+    Normalize scraped data.
+    Returns ({major name: department}, {course_code: course dict}).
+    """
+    majors = {}
+    for major_data in data.get("majors", []):
+        # Handle both old format (string) and new format (dict)
+        if isinstance(major_data, str):
+            name = major_data
+            department = MAJOR_DEPARTMENTS.get(name, "기타")
+        else:
+            name = major_data["name"]
+            department = major_data.get("department", MAJOR_DEPARTMENTS.get(name, "기타"))
+        majors[name] = department
+
+    courses = {}
+    for course_data in data.get("courses", []):
+        course_code = course_data["course_code"]
+        # Skip duplicates (same course may appear in multiple majors as 교양)
+        if course_code in courses:
+            continue
+        # Skip if major not found (e.g., courses from departments with 0 results)
+        if course_data["major"] not in majors:
+            continue
+        courses[course_code] = {
+            "name": course_data["name"],
+            "major": course_data["major"],
+            "semester": course_data.get("semester", 1),
+            "grade": course_data.get("grade", 1),
+        }
+
+    return majors, courses
+
+
+@dataclass
+class CatalogDiff:
+    """Changes needed to bring the DB catalog in line with the scraped data."""
+
+    insert: list[dict] = field(default_factory=list)  # new courses
+    update: list[dict] = field(default_factory=list)  # {"id", "name", "major_id", "is_archived"}
+    archive: list[int] = field(default_factory=list)  # course ids no longer offered
+    offerings_insert: list[dict] = field(default_factory=list)
+    offerings_status: list[dict] = field(default_factory=list)  # {"id", "status"}
+
+    @property
+    def is_empty(self) -> bool:
+        return not (
+            self.insert
+            or self.update
+            or self.archive
+            or self.offerings_insert
+            or self.offerings_status
+        )
+
+
+def diff_catalog(
+    courses: dict[str, dict],
+    major_ids: dict[str, int],
+    existing_courses: dict[str, dict],
+    existing_offerings: dict[int, dict[tuple[int, int], tuple[int, CourseStatus]]],
+) -> CatalogDiff:
+    """
+    Compare scraped courses against the DB.
+
+    existing_courses: {course_code: {"id", "name", "major_id", "is_archived"}}
+    existing_offerings: {course_id: {(semester, grade): (offering id, status)}}
+
+    Offerings for new courses are not included; they need the new course ids.
+    """
+    diff = CatalogDiff()
+
+    for code, course in courses.items():
+        major_id = major_ids[course["major"]]
+        current = existing_courses.get(code)
+
+        if current is None:
+            diff.insert.append(
+                {"course_code": code, "name": course["name"], "major_id": major_id}
+            )
+            continue
+
+        if (
+            current["name"] != course["name"]
+            or current["major_id"] != major_id
+            or current["is_archived"]
+        ):
+            diff.update.append(
+                {
+                    "id": current["id"],
+                    "name": course["name"],
+                    "major_id": major_id,
+                    "is_archived": False,
+                }
+            )
+
+        wanted = (course["semester"], course["grade"])
+        offerings = existing_offerings.get(current["id"], {})
+        if wanted not in offerings:
+            diff.offerings_insert.append(
+                {
+                    "course_id": current["id"],
+                    "semester": wanted[0],
+                    "grade_target": wanted[1],
+                    "status": CourseStatus.ACTIVE,
+                }
+            )
+        for key, (offering_id, status) in offerings.items():
+            target = CourseStatus.ACTIVE if key == wanted else CourseStatus.DEPRECATED
+            if status != target:
+                diff.offerings_status.append({"id": offering_id, "status": target})
+
+    for code, current in existing_courses.items():
+        if code not in courses and not current["is_archived"]:
+            diff.archive.append(current["id"])
+
+    return diff
+
+
+async def _insert_majors(db: AsyncSession, majors: dict[str, str]) -> dict[str, int]:
+    """Insert missing majors in one statement and return {name: id} for all majors."""
+    if majors:
+        await db.execute(
+            insert(Major)
+            .values(
+                [
+                    {
+                        "name": name,
+                        "department": department,
+                        "slug": slugify(name),
+                        "is_active": True,
+                    }
+                    for name, department in majors.items()
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[Major.name])
+        )
+    result = await db.execute(select(Major.id, Major.name))
+    return {row.name: row.id for row in result.all()}
+
+
+async def _insert_courses(db: AsyncSession, rows: list[dict]) -> dict[str, int]:
+    """Bulk insert courses (insertmanyvalues) and return {course_code: id}."""
+    if not rows:
+        return {}
+    result = await db.execute(
+        insert(Course).returning(Course.id, Course.course_code), rows
+    )
+    return {row.course_code: row.id for row in result.all()}
+
+
+async def _insert_offerings(db: AsyncSession, rows: list[dict]) -> None:
+    if rows:
+        await db.execute(insert(CourseOffering), rows)
+
+
+def _new_course_offerings(courses: dict[str, dict], course_ids: dict[str, int]) -> list[dict]:
+    return [
+        {
+            "course_id": course_id,
+            "semester": courses[code]["semester"],
+            "grade_target": courses[code]["grade"],
+            "status": CourseStatus.ACTIVE,
+        }
+        for code, course_id in course_ids.items()
+    ]
+
+
 async def seed_database():
     """Seed the database with scraped KNOU data."""
     async with engine.begin() as conn:
@@ -114,41 +302,17 @@ async def seed_database():
         # Check if already seeded
         result = await db.execute(select(Major))
         if result.first():
-            print("Database already seeded. Skipping...")
+            print("Database already seeded. Run with --sync to apply catalog changes.")
             return
 
-        # Load scraped data
-        data = load_scraped_data()
-        majors_list = data.get("majors", [])
-        courses_list = data.get("courses", [])
+        majors, courses = parse_catalog(load_scraped_data())
 
-        if not majors_list:
+        if not majors:
             print("No majors found in scraped data.")
             return
 
-        # Seed majors with new fields
-        majors = {}
-        for major_data in majors_list:
-            # Handle both old format (string) and new format (dict)
-            if isinstance(major_data, str):
-                name = major_data
-                department = MAJOR_DEPARTMENTS.get(name, "기타")
-            else:
-                name = major_data["name"]
-                department = major_data.get(
-                    "department", MAJOR_DEPARTMENTS.get(name, "기타")
-                )
-
-            major = Major(
-                name=name,
-                department=department,
-                slug=slugify(name),
-                is_active=True,
-            )
-            db.add(major)
-            majors[name] = major
-        await db.flush()
-        print(f"Added {len(majors_list)} majors")
+        major_ids = await _insert_majors(db, majors)
+        print(f"Added {len(majors)} majors")
 
         # Seed tags
         tags = {}
@@ -163,48 +327,18 @@ async def seed_database():
         await db.flush()
         print(f"Added {len(EVAL_TAGS) + len(FREEFORM_TAGS)} tags")
 
-        # Seed courses from scraped data
-        course_count = 0
-        offering_count = 0
-        seen_course_codes = set()
-
-        for course_data in courses_list:
-            course_code = course_data["course_code"]
-            major_name = course_data["major"]
-
-            # Skip duplicates (same course may appear in multiple majors as 교양)
-            if course_code in seen_course_codes:
-                continue
-            seen_course_codes.add(course_code)
-
-            # Skip if major not found (e.g., courses from departments with 0 results)
-            if major_name not in majors:
-                continue
-
-            major = majors[major_name]
-
-            course = Course(
-                major_id=major.id,
-                course_code=course_code,
-                name=course_data["name"],
-            )
-            db.add(course)
-            course_count += 1
-
-            # Create course offering with new schema
-            await db.flush()  # Need course.id
-            offering = CourseOffering(
-                course_id=course.id,
-                semester=course_data.get("semester", 1),
-                grade_target=course_data.get("grade", 1),
-                status=CourseStatus.ACTIVE,
-            )
-            db.add(offering)
-            offering_count += 1
-
-        await db.flush()
-        print(f"Added {course_count} courses")
-        print(f"Added {offering_count} course offerings")
+        # Seed courses and their offerings in two bulk statements
+        course_ids = await _insert_courses(
+            db,
+            [
+                {"course_code": code, "name": c["name"], "major_id": major_ids[c["major"]]}
+                for code, c in courses.items()
+            ],
+        )
+        offerings = _new_course_offerings(courses, course_ids)
+        await _insert_offerings(db, offerings)
+        print(f"Added {len(course_ids)} courses")
+        print(f"Added {len(offerings)} course offerings")
 
         # Create a test user for sample reviews (with full access)
         test_user = User(
@@ -248,19 +382,102 @@ async def seed_database():
             tag_기말시험 = tags["기말시험"]
 
             if sample_reviews:
-                db.add(
-                    ReviewTag(review_id=sample_reviews[0].id, tag_id=tag_기출많음.id)
-                )
-                db.add(
-                    ReviewTag(review_id=sample_reviews[0].id, tag_id=tag_기말시험.id)
-                )
+                for tag in (tag_기출많음, tag_기말시험):
+                    db.add(ReviewTag(review_id=sample_reviews[0].id, tag_id=tag.id))
+                    db.add(
+                        CourseTagCount(
+                            course_id=sample_reviews[0].course_id, tag_id=tag.id, count=1
+                        )
+                    )
+
+            # Score and histogram, as ReviewService does for every new review;
+            # without them the SQL `recommended` sort puts these courses last
+            course_repo = CourseRepository(db)
+            for course_id in {review.course_id for review in sample_reviews}:
+                await course_repo.refresh_review_aggregates(course_id)
 
             print(f"Added {len(sample_reviews)} sample reviews with tags")
 
         await db.commit()
+        cache = await get_cache_backend()
+        await tag_registry.publish_version(cache)
+        await publish_catalog_version(cache)
         print("Seeding complete!")
 
 
+async def sync_catalog():
+    """
+    Apply changes in the scraped data to an already seeded DB.
+
+    Idempotent: inserts new majors/courses/offerings, updates renamed or moved
+    courses, archives courses that disappeared and flips offering status.
+    Running it twice in a row makes no changes the second time.
+    """
+    async with AsyncSessionLocal() as db:
+        majors, courses = parse_catalog(load_scraped_data())
+        if not majors:
+            print("No majors found in scraped data.")
+            return
+
+        major_ids = await _insert_majors(db, majors)
+
+        result = await db.execute(
+            select(Course.id, Course.course_code, Course.name, Course.major_id, Course.is_archived)
+        )
+        existing_courses = {
+            row.course_code: {
+                "id": row.id,
+                "name": row.name,
+                "major_id": row.major_id,
+                "is_archived": row.is_archived,
+            }
+            for row in result.all()
+        }
+
+        result = await db.execute(
+            select(
+                CourseOffering.id,
+                CourseOffering.course_id,
+                CourseOffering.semester,
+                CourseOffering.grade_target,
+                CourseOffering.status,
+            )
+        )
+        existing_offerings: dict[int, dict] = {}
+        for row in result.all():
+            existing_offerings.setdefault(row.course_id, {})[
+                (row.semester, row.grade_target)
+            ] = (row.id, row.status)
+
+        diff = diff_catalog(courses, major_ids, existing_courses, existing_offerings)
+        if diff.is_empty:
+            print("Catalog already up to date.")
+            return
+
+        course_ids = await _insert_courses(db, diff.insert)
+        await _insert_offerings(
+            db, _new_course_offerings(courses, course_ids) + diff.offerings_insert
+        )
+        if diff.update:
+            await db.execute(update(Course), diff.update)
+        if diff.archive:
+            await db.execute(
+                update(Course).where(Course.id.in_(diff.archive)).values(is_archived=True)
+            )
+        if diff.offerings_status:
+            await db.execute(update(CourseOffering), diff.offerings_status)
+
+        await db.commit()
+        await publish_catalog_version(await get_cache_backend())
+        print(f"Inserted {len(diff.insert)} courses")
+        print(f"Updated {len(diff.update)} courses")
+        print(f"Archived {len(diff.archive)} courses")
+        print(
+            f"Added {len(course_ids) + len(diff.offerings_insert)} offerings, "
+            f"changed status of {len(diff.offerings_status)}"
+        )
+
+
 async def clear_database():
     """Clear all data from the database (for development)."""
     async with engine.begin() as conn:
@@ -274,5 +491,7 @@ if __name__ == "__main__":
 
     if len(sys.argv) > 1 and sys.argv[1] == "--clear":
         asyncio.run(clear_database())
+    elif len(sys.argv) > 1 and sys.argv[1] == "--sync":
+        asyncio.run(sync_catalog())
     else:
         asyncio.run(seed_database())
@@ -10,6 +10,9 @@ from app.services.cache import Cache, InMemoryBackend, RedisBackend
 # Singleton in-memory backend (shared across requests when Redis is not available)
 _in_memory_backend: InMemoryBackend | None = None
 
+# Redis backend for the current client, so its registered scripts are reused
+_redis_backend: RedisBackend | None = None
+
 
 def _get_in_memory_backend() -> InMemoryBackend:
     """Get or create the singleton in-memory backend."""
@@ -19,12 +22,20 @@ def _get_in_memory_backend() -> InMemoryBackend:
     return _in_memory_backend
 
 
+def _get_redis_backend(redis_client) -> RedisBackend:
+    """Get the Redis backend, rebuilt if the client has been replaced."""
+    global _redis_backend
+    if _redis_backend is None or _redis_backend.client is not redis_client:
+        _redis_backend = RedisBackend(redis_client)
+    return _redis_backend
+
+
 async def get_cache() -> Cache:
     """Get cache instance with appropriate backend."""
     redis_client = await get_redis()
 
     if redis_client is not None:
-        return Cache(RedisBackend(redis_client))
+        return Cache(_get_redis_backend(redis_client))
 
     # Fall back to in-memory cache
     return Cache(_get_in_memory_backend())
@@ -35,6 +46,6 @@ async def get_cache_backend():
     redis_client = await get_redis()
 
     if redis_client is not None:
-        return RedisBackend(redis_client)
+        return _get_redis_backend(redis_client)
 
     return _get_in_memory_backend()
@@ -0,0 +1,14 @@
+"""Tag registry dependency, refreshed against the shared catalog version."""
+
+from fastapi import Depends
+
+from app.deps.cache import get_cache_backend
+from app.services.cache import CacheBackend
+from app.services.tag_registry import TagRegistry, tag_registry
+
+
+async def get_tag_registry(
+    cache: CacheBackend = Depends(get_cache_backend),
+) -> TagRegistry:
+    await tag_registry.ensure_fresh(cache)
+    return tag_registry
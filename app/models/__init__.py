@@ -1,5 +1,6 @@
 from app.models.base import Base
-from app.models.course import Course, CourseOffering
+from app.models.course import Course, CourseOffering, CourseRanking, CourseTagCount
+from app.models.email_outbox import OutboxEmail
 from app.models.major import Major
 from app.models.review import Review, ReviewTag
 from app.models.tag import Tag, TagType
@@ -10,6 +11,9 @@ __all__ = [
     "Major",
     "Course",
     "CourseOffering",
+    "CourseRanking",
+    "CourseTagCount",
+    "OutboxEmail",
     "Tag",
     "TagType",
     "Review",
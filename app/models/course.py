@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, ForeignKey, Index, Integer, SmallInteger, String
+from sqlalchemy import ARRAY, Boolean, Float, ForeignKey, Index, Integer, SmallInteger, String
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -37,6 +37,24 @@ class Course(Base):
 
 class CourseOffering(Base):
     __tablename__ = "course_offerings"
+    __table_args__ = (
+        # Grade/semester browsing ("2학년 1학기"). Status and course_id are
+        # included so the offered-course semi-join is an index-only scan.
+        Index(
+            "ix_course_offerings_grade_semester",
+            "grade_target",
+            "semester",
+            "status",
+            "course_id",
+        ),
+        Index(
+            "ix_course_offerings_semester_grade",
+            "semester",
+            "grade_target",
+            "status",
+            "course_id",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     course_id: Mapped[int] = mapped_column(ForeignKey("courses.id"), nullable=False)
@@ -50,3 +68,49 @@ class CourseOffering(Base):
 
     def __repr__(self) -> str:
         return f"CourseOffering(course_id={self.course_id}, semester={self.semester})"
+
+
+class CourseTagCount(Base):
+    """
+    Number of visible reviews of a course carrying a tag.
+    Maintained in the review write path so the eval summary is a PK lookup.
+    """
+
+    __tablename__ = "course_tag_counts"
+
+    course_id: Mapped[int] = mapped_column(ForeignKey("courses.id"), primary_key=True)
+    tag_id: Mapped[int] = mapped_column(ForeignKey("tags.id"), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"CourseTagCount(course_id={self.course_id}, tag_id={self.tag_id}, count={self.count})"
+
+
+class CourseRanking(Base):
+    """
+    Precomputed review aggregates of a course, refreshed from its visible
+    reviews whenever one is created or hidden. Courses without visible
+    reviews have no row.
+
+    - `score`: Bayesian ranking score (see `ranking_score`)
+    - `histogram`: review counts per 1-5 value, flattened to 15 ints:
+      rating 1-5, then difficulty 1-5, then workload 1-5
+    """
+
+    __tablename__ = "course_rankings"
+
+    course_id: Mapped[int] = mapped_column(ForeignKey("courses.id"), primary_key=True)
+    score: Mapped[float | None] = mapped_column(Float, nullable=True)
+    histogram: Mapped[list[int] | None] = mapped_column(ARRAY(Integer), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"CourseRanking(course_id={self.course_id}, score={self.score})"
+
+
+# Matches the `recommended` sort order, ties on course id included, so
+# Postgres reads it straight off the index
+Index(
+    "ix_course_rankings_score",
+    CourseRanking.score.desc().nullslast(),
+    CourseRanking.course_id,
+)
@@ -0,0 +1,45 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import DateTime, Index, Integer, String, Text
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.constants.mail import OutboxStatus
+from app.models.base import Base
+
+
+class OutboxEmail(Base):
+    """
+    An email waiting to be sent, written in the same transaction as the change
+    that triggered it and delivered by the outbox worker (services/mail_outbox.py).
+    """
+
+    __tablename__ = "email_outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    to_email: Mapped[str] = mapped_column(String(255), nullable=False)
+    subject: Mapped[str] = mapped_column(String(255), nullable=False)
+    html_body: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[OutboxStatus] = mapped_column(
+        SAEnum(OutboxStatus, name="outbox_status"), default=OutboxStatus.PENDING
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC)
+    )
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC)
+    )
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"OutboxEmail(id={self.id}, to={self.to_email}, status={self.status})"
+
+
+# Only pending rows are ever polled, so sent/failed history doesn't bloat the index
+Index(
+    "ix_email_outbox_due",
+    OutboxEmail.next_attempt_at,
+    postgresql_where=OutboxEmail.status == OutboxStatus.PENDING,
+)
@@ -38,7 +38,7 @@ class Review(Base):
     workload: Mapped[int] = mapped_column(SmallInteger, nullable=False)  # 1-5
     text: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.now(UTC)
+        DateTime(timezone=True), default=lambda: datetime.now(UTC)
     )
     is_hidden: Mapped[bool] = mapped_column(Boolean, default=False)
 
@@ -1,4 +1,5 @@
 from app.repositories.course import CourseRepository
+from app.repositories.email_outbox import EmailOutboxRepository
 from app.repositories.major import MajorRepository
 from app.repositories.review import ReviewRepository
 from app.repositories.tag import TagRepository
@@ -7,6 +8,7 @@ from app.repositories.user import UserRepository
 __all__ = [
     "MajorRepository",
     "CourseRepository",
+    "EmailOutboxRepository",
     "ReviewRepository",
     "TagRepository",
     "UserRepository",
@@ -3,6 +3,7 @@ from typing import Generic, TypeVar
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.timing import time_public_methods, timed
 from app.models.base import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -13,32 +14,42 @@ A generic base repository providing common CRUD operations.
 
 
 class BaseRepository(Generic[ModelType]):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every repository call shows up as the `repo` Server-Timing span
+        time_public_methods(cls, "repo")
+
     def __init__(self, model: type[ModelType], db: AsyncSession):
         self.model = model
         self.db = db
 
+    @timed("repo")
     async def get_by_id(self, entity_id: int) -> ModelType | None:
         result = await self.db.execute(
             select(self.model).where(self.model.id == entity_id)
         )
         return result.scalar_one_or_none()
 
+    @timed("repo")
     async def get_all(self) -> list[ModelType]:
         result = await self.db.execute(select(self.model))
         return list(result.scalars().all())
 
+    @timed("repo")
     async def create(self, **kwargs) -> ModelType:
         instance = self.model(**kwargs)
         self.db.add(instance)
         await self.db.flush()
         return instance
 
+    @timed("repo")
     async def update(self, instance: ModelType, **kwargs) -> ModelType:
         for key, value in kwargs.items():
             setattr(instance, key, value)
         await self.db.flush()
         return instance
 
+    @timed("repo")
     async def delete(self, instance: ModelType) -> None:
         await self.db.delete(instance)
         await self.db.flush()
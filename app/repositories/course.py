@@ -1,11 +1,195 @@
-from sqlalchemy import case, func, select
+from sqlalchemy import (
+    Integer,
+    cast,
+    delete,
+    distinct,
+    exists,
+    func,
+    lambda_stmt,
+    literal,
+    select,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, array, insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql import StatementLambdaElement
 
-from app.constants import ReviewConstants
-from app.models import Course, Major, Review, ReviewTag, Tag
+from app.constants import (
+    CourseStatus,
+    EvalTags,
+    RankingConstants,
+    ReviewConstants,
+    ReviewValidation,
+)
+from app.models import (
+    Course,
+    CourseOffering,
+    CourseRanking,
+    CourseTagCount,
+    Major,
+    Review,
+    Tag,
+    TagType,
+)
 from app.repositories.base import BaseRepository
 
+# Hot statements are built once at import time. Per-call values are bound
+# through lambda_stmt, so each request only looks up the compiled SQL in
+# SQLAlchemy's cache instead of rebuilding and re-keying the whole construct.
+_review_stats = (
+    select(
+        Review.course_id,
+        func.avg(Review.rating_overall).label("avg_rating"),
+        func.avg(Review.difficulty).label("avg_difficulty"),
+        func.avg(Review.workload).label("avg_workload"),
+        func.count(Review.id).label("review_count"),
+        func.max(Review.created_at).label("latest_review"),
+    )
+    .where(Review.is_hidden.is_(False))
+    .group_by(Review.course_id)
+    .subquery("review_stats")
+)
+
+_course_list = (
+    select(
+        Course.id,
+        Course.course_code,
+        Course.name,
+        Major.name.label("major_name"),
+        _review_stats.c.avg_rating,
+        _review_stats.c.avg_difficulty,
+        _review_stats.c.avg_workload,
+        func.coalesce(_review_stats.c.review_count, 0).label("review_count"),
+    )
+    .join(Major, Course.major_id == Major.id)
+    .outerjoin(_review_stats, Course.id == _review_stats.c.course_id)
+    .where(Course.is_archived.is_(False))
+)
+
+_course_stats = select(
+    func.avg(Review.rating_overall).label("avg_rating"),
+    func.avg(Review.difficulty).label("avg_difficulty"),
+    func.avg(Review.workload).label("avg_workload"),
+    func.count(Review.id).label("review_count"),
+).where(Review.is_hidden.is_(False))
+
+_course_search = (
+    select(
+        Course.id,
+        Course.course_code,
+        Course.name,
+        Major.name.label("major_name"),
+    )
+    .join(Major, Course.major_id == Major.id)
+    .where(Course.is_archived.is_(False))
+    .order_by(Course.name)
+)
+
+_offered_course_ids = select(CourseOffering.course_id).where(
+    CourseOffering.status == CourseStatus.ACTIVE
+)
+
+_eval_counts = (
+    select(CourseTagCount.course_id, Tag.name, CourseTagCount.count)
+    .join(Tag, CourseTagCount.tag_id == Tag.id)
+    .where(Tag.type == TagType.EVAL_METHOD)
+)
+
+
+def _histogram_expr():
+    """count() per 1-5 value of rating, difficulty and workload, as one int[15]."""
+    values = range(ReviewValidation.RATING_MIN, ReviewValidation.RATING_MAX + 1)
+    return cast(
+        array(
+            [
+                func.count().filter(column == value)
+                for column in (Review.rating_overall, Review.difficulty, Review.workload)
+                for value in values
+            ]
+        ),
+        ARRAY(Integer),
+    )
+
+
+def ranking_score(rating_sum, difficulty_sum, workload_sum, review_count):
+    """
+    Bayesian "꿀과목" score from a course's review sums.
+    Plain arithmetic, so it works on numbers, NumPy arrays and SQL expressions alike.
+    """
+    prior = RankingConstants.PRIOR_WEIGHT * RankingConstants.PRIOR_MEAN
+    n = review_count + RankingConstants.PRIOR_WEIGHT
+    scale = ReviewValidation.RATING_MIN + ReviewValidation.RATING_MAX
+
+    rating = (rating_sum + prior) / n
+    ease = scale - (difficulty_sum + prior) / n
+    lightness = scale - (workload_sum + prior) / n
+    return (
+        RankingConstants.RATING_WEIGHT * rating
+        + RankingConstants.EASE_WEIGHT * ease
+        + RankingConstants.LIGHTNESS_WEIGHT * lightness
+    )
+
+
+def _contains_pattern(q: str) -> str:
+    """ILIKE pattern matching `q` as a plain substring (its % and _ are literal)."""
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def course_list_stmt(
+    major_id: int | None = None,
+    q: str | None = None,
+    sort: str = "top_rated",
+    limit: int = 20,
+    offset: int = 0,
+    grade: int | None = None,
+    semester: int | None = None,
+    department: str | None = None,
+) -> StatementLambdaElement:
+    stmt = lambda_stmt(lambda: _course_list)
+
+    if major_id:
+        stmt += lambda s: s.where(Course.major_id == major_id)
+    if department:
+        stmt += lambda s: s.where(Major.department == department)
+    if grade and semester:
+        stmt += lambda s: s.where(
+            Course.id.in_(
+                _offered_course_ids.where(
+                    CourseOffering.grade_target == grade, CourseOffering.semester == semester
+                )
+            )
+        )
+    elif grade:
+        stmt += lambda s: s.where(
+            Course.id.in_(_offered_course_ids.where(CourseOffering.grade_target == grade))
+        )
+    elif semester:
+        stmt += lambda s: s.where(
+            Course.id.in_(_offered_course_ids.where(CourseOffering.semester == semester))
+        )
+    if q:
+        pattern = _contains_pattern(q)
+        stmt += lambda s: s.where(Course.name.ilike(pattern, escape="\\"))
+
+    if sort == "top_rated":
+        stmt += lambda s: s.order_by(_review_stats.c.avg_rating.desc().nullslast())
+    elif sort == "most_reviewed":
+        stmt += lambda s: s.order_by(_review_stats.c.review_count.desc().nullslast())
+    elif sort == "latest":
+        stmt += lambda s: s.order_by(_review_stats.c.latest_review.desc().nullslast())
+    elif sort == "recommended":
+        # Same columns as ix_course_rankings_score; course_id is the course's
+        # id wherever a ranking exists, and unranked courses tie on NULL here
+        stmt += lambda s: s.outerjoin(
+            CourseRanking, Course.id == CourseRanking.course_id
+        ).order_by(CourseRanking.score.desc().nullslast(), CourseRanking.course_id)
+    # Ties break on course id, as in the catalog index, so pages are stable
+    stmt += lambda s: s.order_by(Course.id)
+
+    stmt += lambda s: s.offset(offset).limit(limit)
+    return stmt
+
 
 class CourseRepository(BaseRepository[Course]):
     def __init__(self, db: AsyncSession):
@@ -18,52 +202,22 @@ class CourseRepository(BaseRepository[Course]):
         sort: str = "top_rated",
         limit: int = 20,
         offset: int = 0,
+        grade: int | None = None,
+        semester: int | None = None,
+        department: str | None = None,
     ) -> list[dict]:
-        review_stats = (
-            select(
-                Review.course_id,
-                func.avg(Review.rating_overall).label("avg_rating"),
-                func.avg(Review.difficulty).label("avg_difficulty"),
-                func.avg(Review.workload).label("avg_workload"),
-                func.count(Review.id).label("review_count"),
-                func.max(Review.created_at).label("latest_review"),
-            )
-            .where(Review.is_hidden.is_(False))
-            .group_by(Review.course_id)
-            .subquery()
-        )
-
-        query = (
-            select(
-                Course.id,
-                Course.course_code,
-                Course.name,
-                Major.name.label("major_name"),
-                review_stats.c.avg_rating,
-                review_stats.c.avg_difficulty,
-                review_stats.c.avg_workload,
-                func.coalesce(review_stats.c.review_count, 0).label("review_count"),
+        result = await self.db.execute(
+            course_list_stmt(
+                major_id=major_id,
+                q=q,
+                sort=sort,
+                limit=limit,
+                offset=offset,
+                grade=grade,
+                semester=semester,
+                department=department,
             )
-            .join(Major, Course.major_id == Major.id)
-            .outerjoin(review_stats, Course.id == review_stats.c.course_id)
-            .where(Course.is_archived.is_(False))
         )
-
-        if major_id:
-            query = query.where(Course.major_id == major_id)
-        if q:
-            query = query.where(Course.name.ilike(f"%{q}%"))
-
-        if sort == "top_rated":
-            query = query.order_by(review_stats.c.avg_rating.desc().nullslast())
-        elif sort == "most_reviewed":
-            query = query.order_by(review_stats.c.review_count.desc().nullslast())
-        elif sort == "latest":
-            query = query.order_by(review_stats.c.latest_review.desc().nullslast())
-
-        query = query.offset(offset).limit(limit)
-
-        result = await self.db.execute(query)
         return [
             {
                 "id": row.id,
@@ -83,22 +237,21 @@ class CourseRepository(BaseRepository[Course]):
     async def get_detail_with_stats(self, course_id: int) -> dict | None:
         # Get course with major
         result = await self.db.execute(
-            select(Course).options(selectinload(Course.major)).where(Course.id == course_id)
+            lambda_stmt(
+                lambda: select(Course, CourseRanking.histogram)
+                .outerjoin(CourseRanking, Course.id == CourseRanking.course_id)
+                .options(joinedload(Course.major))
+                .where(Course.id == course_id)
+            )
         )
-        course = result.scalar_one_or_none()
-        if not course:
+        row = result.first()
+        if not row:
             return None
+        course, histogram = row
 
         # Get review stats
         stats_result = await self.db.execute(
-            select(
-                func.avg(Review.rating_overall).label("avg_rating"),
-                func.avg(Review.difficulty).label("avg_difficulty"),
-                func.avg(Review.workload).label("avg_workload"),
-                func.count(Review.id).label("review_count"),
-            )
-            .where(Review.course_id == course_id)
-            .where(Review.is_hidden.is_(False))
+            lambda_stmt(lambda: _course_stats.where(Review.course_id == course_id))
         )
         stats = stats_result.one()
 
@@ -110,28 +263,70 @@ class CourseRepository(BaseRepository[Course]):
             ),
             "avg_workload": (round(float(stats.avg_workload), 2) if stats.avg_workload else None),
             "review_count": stats.review_count or 0,
+            "histogram": histogram,
         }
 
+    async def get_many_for_detail(self, course_ids: list[int]) -> dict[int, dict]:
+        """
+        Courses (archived included) with their major and histogram, in one query.
+        Keyed by course id; unknown ids are absent.
+        """
+        if not course_ids:
+            return {}
+        result = await self.db.execute(
+            select(Course, CourseRanking.histogram)
+            .outerjoin(CourseRanking, Course.id == CourseRanking.course_id)
+            .options(joinedload(Course.major))
+            .where(Course.id.in_(course_ids))
+        )
+        return {
+            course.id: {"course": course, "histogram": histogram}
+            for course, histogram in result.all()
+        }
+
+    async def get_stats_many(self, course_ids: list[int]) -> dict[int, dict]:
+        """Review stats for many courses with one grouped IN query."""
+        stats: dict[int, dict[str, float | int | None]] = {
+            course_id: {
+                "avg_rating": None,
+                "avg_difficulty": None,
+                "avg_workload": None,
+                "review_count": 0,
+            }
+            for course_id in course_ids
+        }
+        if not course_ids:
+            return stats
+
+        result = await self.db.execute(
+            lambda_stmt(
+                lambda: _course_stats.add_columns(Review.course_id)
+                .where(Review.course_id.in_(course_ids))
+                .group_by(Review.course_id)
+            )
+        )
+        for row in result.all():
+            stats[row.course_id] = {
+                "avg_rating": round(float(row.avg_rating), 2),
+                "avg_difficulty": round(float(row.avg_difficulty), 2),
+                "avg_workload": round(float(row.avg_workload), 2),
+                "review_count": row.review_count,
+            }
+        return stats
+
     async def search(self, q: str, limit: int = 20) -> list[dict]:
         """
         Simple search for courses by name.
         Returns minimal data for search results.
         """
-        query = (
-            select(
-                Course.id,
-                Course.course_code,
-                Course.name,
-                Major.name.label("major_name"),
+        pattern = _contains_pattern(q)
+        result = await self.db.execute(
+            lambda_stmt(
+                lambda: _course_search.where(Course.name.ilike(pattern, escape="\\")).limit(
+                    limit
+                )
             )
-            .join(Major, Course.major_id == Major.id)
-            .where(Course.is_archived.is_(False))
-            .where(Course.name.ilike(f"%{q}%"))
-            .order_by(Course.name)
-            .limit(limit)
         )
-
-        result = await self.db.execute(query)
         return [
             {
                 "id": row.id,
@@ -142,49 +337,128 @@ class CourseRepository(BaseRepository[Course]):
             for row in result.all()
         ]
 
+    async def get_facets(self) -> dict:
+        """
+        Number of listed (non-archived) courses per grade, semester and department.
+        A course offered in several grades/semesters counts once in each.
+        """
+        facets: dict[str, dict] = {}
+        for name, column in (
+            ("grades", CourseOffering.grade_target),
+            ("semesters", CourseOffering.semester),
+        ):
+            result = await self.db.execute(
+                select(column, func.count(distinct(CourseOffering.course_id)))
+                .join(Course, CourseOffering.course_id == Course.id)
+                .where(
+                    CourseOffering.status == CourseStatus.ACTIVE,
+                    Course.is_archived.is_(False),
+                )
+                .group_by(column)
+                .order_by(column)
+            )
+            facets[name] = dict(result.tuples().all())
+
+        result = await self.db.execute(
+            select(Major.department, func.count(Course.id))
+            .join(Course, Course.major_id == Major.id)
+            .where(Course.is_archived.is_(False))
+            .group_by(Major.department)
+            .order_by(Major.department)
+        )
+        facets["departments"] = dict(result.tuples().all())
+        return facets
+
     async def get_eval_summary(self, course_id: int) -> dict:
         """
         Get aggregated evaluation method summary for a course.
         Returns which final type is dominant and whether midterm/attendance exist.
         """
-        # Count each tag type
-        final_exam_count = func.sum(case((Tag.name == "기말시험", 1), else_=0))
-        final_assignment_count = func.sum(case((Tag.name == "기말과제물", 1), else_=0))
-        midterm_count = func.sum(case((Tag.name == "중간과제물", 1), else_=0))
-        attendance_count = func.sum(case((Tag.name == "출석수업과제", 1), else_=0))
-
-        query = (
-            select(
-                final_exam_count.label("final_exam_count"),
-                final_assignment_count.label("final_assignment_count"),
-                midterm_count.label("midterm_count"),
-                attendance_count.label("attendance_count"),
+        summaries = await self.get_eval_summaries([course_id])
+        return summaries[course_id]
+
+    async def get_eval_summaries(self, course_ids: list[int]) -> dict[int, dict]:
+        """
+        Eval summaries for many courses in one lookup on course_tag_counts.
+        Courses without tagged reviews get an empty summary.
+        """
+        if not course_ids:
+            return {}
+        counts: dict[int, dict[str, int]] = {course_id: {} for course_id in course_ids}
+
+        result = await self.db.execute(
+            lambda_stmt(lambda: _eval_counts.where(CourseTagCount.course_id.in_(course_ids)))
+        )
+        for row in result.all():
+            counts[row.course_id][row.name] = row.count
+
+        return {course_id: _build_eval_summary(c) for course_id, c in counts.items()}
+
+    async def adjust_tag_counts(self, course_id: int, tag_ids: list[int], delta: int) -> None:
+        """Add `delta` to the per-course counters of the given tags (upsert)."""
+        if not tag_ids:
+            return
+
+        stmt = insert(CourseTagCount).values(
+            [
+                {"course_id": course_id, "tag_id": tag_id, "count": max(delta, 0)}
+                for tag_id in set(tag_ids)
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CourseTagCount.course_id, CourseTagCount.tag_id],
+            set_={"count": func.greatest(CourseTagCount.count + delta, 0)},
+        )
+        await self.db.execute(stmt)
+
+    async def refresh_review_aggregates(self, course_id: int) -> None:
+        """
+        Recompute the course's ranking score and histogram from its visible
+        reviews (upsert), or drop its row once none are left.
+        """
+        visible = (Review.course_id == course_id, Review.is_hidden.is_(False))
+        score = ranking_score(
+            func.sum(Review.rating_overall),
+            func.sum(Review.difficulty),
+            func.sum(Review.workload),
+            func.count(Review.id),
+        )
+        stmt = insert(CourseRanking).from_select(
+            ["course_id", "score", "histogram"],
+            select(literal(course_id), score, _histogram_expr())
+            .where(*visible)
+            .having(func.count(Review.id) > 0),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CourseRanking.course_id],
+            set_={"score": stmt.excluded.score, "histogram": stmt.excluded.histogram},
+        )
+        await self.db.execute(stmt)
+        # Unranked like a course never reviewed, so the recommended sort
+        # orders both by id (as the catalog index does)
+        await self.db.execute(
+            delete(CourseRanking).where(
+                CourseRanking.course_id == course_id, ~exists().where(*visible)
             )
-            .select_from(Review)
-            .outerjoin(ReviewTag, Review.id == ReviewTag.review_id)
-            .outerjoin(Tag, ReviewTag.tag_id == Tag.id)
-            .where(Review.course_id == course_id)
-            .where(Review.is_hidden.is_(False))
         )
 
-        result = await self.db.execute(query)
-        row = result.one()
 
-        final_exam = row.final_exam_count or 0
-        final_assignment = row.final_assignment_count or 0
-        midterm = row.midterm_count or 0
-        attendance = row.attendance_count or 0
+def _build_eval_summary(counts: dict[str, int]) -> dict:
+    final_exam = counts.get(EvalTags.FINAL_EXAM, 0)
+    final_assignment = counts.get(EvalTags.FINAL_ASSIGNMENT, 0)
+    midterm = counts.get(EvalTags.MIDTERM, 0)
+    attendance = counts.get(EvalTags.ATTENDANCE, 0)
 
-        # Determine final type (winner between 기말시험 vs 기말과제물)
-        if final_exam > final_assignment:
-            final_type = "기말시험"
-        elif final_assignment > 0:
-            final_type = "기말과제물"
-        else:
-            final_type = None
+    # Determine final type (winner between 기말시험 vs 기말과제물)
+    if final_exam > final_assignment:
+        final_type = EvalTags.FINAL_EXAM
+    elif final_assignment > 0:
+        final_type = EvalTags.FINAL_ASSIGNMENT
+    else:
+        final_type = None
 
-        return {
-            "final_type": final_type,
-            "has_midterm": midterm > ReviewConstants.EVAL_TAG_THRESHOLD,
-            "has_attendance": attendance > ReviewConstants.EVAL_TAG_THRESHOLD,
-        }
+    return {
+        "final_type": final_type,
+        "has_midterm": midterm > ReviewConstants.EVAL_TAG_THRESHOLD,
+        "has_attendance": attendance > ReviewConstants.EVAL_TAG_THRESHOLD,
+    }
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants import OutboxStatus
+from app.models import OutboxEmail
+from app.repositories.base import BaseRepository
+
+
+class EmailOutboxRepository(BaseRepository[OutboxEmail]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(OutboxEmail, db)
+
+    async def claim_due(self, limit: int, lease_seconds: int) -> list[OutboxEmail]:
+        """
+        Claim up to `limit` due pending emails: bump their attempt count and push
+        `next_attempt_at` out by the lease so no other worker picks them up.
+        SKIP LOCKED lets concurrent workers claim disjoint batches.
+        """
+        due = (
+            select(OutboxEmail.id)
+            .where(
+                OutboxEmail.status == OutboxStatus.PENDING,
+                OutboxEmail.next_attempt_at <= func.now(),
+            )
+            .order_by(OutboxEmail.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            update(OutboxEmail)
+            .where(OutboxEmail.id.in_(due.scalar_subquery()))
+            .values(
+                attempts=OutboxEmail.attempts + 1,
+                next_attempt_at=func.now() + timedelta(seconds=lease_seconds),
+            )
+            .returning(OutboxEmail)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
+
+    async def extend_lease(self, claims: list[tuple[int, int]], lease_seconds: int) -> None:
+        """
+        Push the lease of claimed emails out again. Claims are (id, attempts)
+        as returned by claim_due: a row another worker has claimed since has
+        a higher attempt count and is left alone.
+        """
+        if not claims:
+            return
+        await self.db.execute(
+            update(OutboxEmail)
+            .where(
+                tuple_(OutboxEmail.id, OutboxEmail.attempts).in_(claims),
+                OutboxEmail.status == OutboxStatus.PENDING,
+            )
+            .values(next_attempt_at=func.now() + timedelta(seconds=lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+
+    async def mark_sent(self, ids: list[int]) -> None:
+        if not ids:
+            return
+        await self.db.execute(
+            update(OutboxEmail)
+            .where(OutboxEmail.id.in_(ids))
+            .values(status=OutboxStatus.SENT, sent_at=func.now(), last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def reschedule(self, email_id: int, next_attempt_at: datetime, error: str) -> None:
+        await self.db.execute(
+            update(OutboxEmail)
+            .where(OutboxEmail.id == email_id)
+            .values(next_attempt_at=next_attempt_at, last_error=error)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def mark_failed(self, email_id: int, error: str) -> None:
+        await self.db.execute(
+            update(OutboxEmail)
+            .where(OutboxEmail.id == email_id)
+            .values(status=OutboxStatus.FAILED, last_error=error)
+            .execution_options(synchronize_session=False)
+        )
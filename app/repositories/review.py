@@ -1,38 +1,158 @@
-from sqlalchemy import select
+from datetime import datetime
+
+from sqlalchemy import and_, func, lambda_stmt, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models import Review, ReviewTag
 from app.repositories.base import BaseRepository
 
+# Built once; see app/repositories/course.py
+_visible_reviews = (
+    select(Review)
+    .options(selectinload(Review.tags).selectinload(ReviewTag.tag))
+    .where(Review.is_hidden.is_(False))
+)
+
 
 class ReviewRepository(BaseRepository[Review]):
     def __init__(self, db: AsyncSession):
         super().__init__(Review, db)
 
-    async def get_by_course_id(self, course_id: int) -> list[Review]:
+    async def get_page_by_course_id(
+        self,
+        course_id: int,
+        sort: str = "newest",
+        limit: int = 20,
+        after: tuple[int | None, datetime, int] | None = None,
+    ) -> list[Review]:
+        """
+        Keyset-paginated visible reviews for a course.
+        `after` is the (sort value, created_at, id) of the last row on the previous page.
+        Fetches `limit` rows; callers ask for one extra to know if there is a next page.
+        """
+        stmt = lambda_stmt(lambda: _visible_reviews.where(Review.course_id == course_id))
+
+        # Ties always break on (created_at, id) desc
+        if after is not None:
+            sort_value, created_at, review_id = after
+            if sort == "rating":
+                stmt += lambda s: s.where(
+                    or_(
+                        Review.rating_overall < sort_value,
+                        and_(
+                            Review.rating_overall == sort_value,
+                            tuple_(Review.created_at, Review.id) < tuple_(created_at, review_id),
+                        ),
+                    )
+                )
+            elif sort == "difficulty":
+                stmt += lambda s: s.where(
+                    or_(
+                        Review.difficulty > sort_value,
+                        and_(
+                            Review.difficulty == sort_value,
+                            tuple_(Review.created_at, Review.id) < tuple_(created_at, review_id),
+                        ),
+                    )
+                )
+            else:
+                stmt += lambda s: s.where(
+                    tuple_(Review.created_at, Review.id) < tuple_(created_at, review_id)
+                )
+
+        if sort == "rating":
+            stmt += lambda s: s.order_by(Review.rating_overall.desc())
+        elif sort == "difficulty":
+            stmt += lambda s: s.order_by(Review.difficulty.asc())
+        stmt += lambda s: s.order_by(Review.created_at.desc(), Review.id.desc()).limit(limit)
+
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_latest_by_course_ids(
+        self, course_ids: list[int], per_course: int
+    ) -> dict[int, list[Review]]:
+        """
+        Newest `per_course` visible reviews of each course, in one query.
+        Each list is ordered like the first page of get_page_by_course_id("newest").
+        """
+        reviews: dict[int, list[Review]] = {course_id: [] for course_id in course_ids}
+        if not course_ids:
+            return reviews
+
+        ranked = (
+            select(
+                Review.id,
+                func.row_number()
+                .over(
+                    partition_by=Review.course_id,
+                    order_by=(Review.created_at.desc(), Review.id.desc()),
+                )
+                .label("position"),
+            )
+            .where(Review.course_id.in_(course_ids), Review.is_hidden.is_(False))
+            .subquery()
+        )
         result = await self.db.execute(
-            select(Review)
-            .options(selectinload(Review.tags).selectinload(ReviewTag.tag))
-            .where(Review.course_id == course_id)
-            .where(Review.is_hidden.is_(False))
-            .order_by(Review.created_at.desc())
+            _visible_reviews.join(ranked, ranked.c.id == Review.id)
+            .where(ranked.c.position <= per_course)
+            .order_by(Review.course_id, ranked.c.position)
         )
-        return list(result.scalars().all())
+        for review in result.scalars().all():
+            reviews[review.course_id].append(review)
+        return reviews
 
-    async def get_by_user_and_course(
-        self, user_id: int, course_id: int
-    ) -> Review | None:
-        """Check if user already has a review for this course."""
+    async def insert_if_absent(self, **values) -> Review | None:
+        """
+        Insert a review in one round trip, relying on uq_reviews_user_course.
+        Returns None if the user already reviewed the course. Returns a
+        detached Review populated with the generated id and created_at.
+        """
         result = await self.db.execute(
-            select(Review)
-            .where(Review.user_id == user_id)
-            .where(Review.course_id == course_id)
+            insert(Review)
+            .values(**values)
+            .on_conflict_do_nothing(constraint="uq_reviews_user_course")
+            .returning(Review.id, Review.created_at, Review.is_hidden)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        return Review(
+            id=row.id, created_at=row.created_at, is_hidden=row.is_hidden, **values
         )
-        return result.scalar_one_or_none()
+
+    async def hide(self, review_id: int) -> Review | None:
+        """
+        Hide a visible review in one conditional UPDATE, so concurrent calls
+        can't both see it visible. Returns None if it is missing or already
+        hidden, else a detached Review with the fields needed to undo its stats.
+        """
+        result = await self.db.execute(
+            update(Review)
+            .where(Review.id == review_id, Review.is_hidden.is_(False))
+            .values(is_hidden=True)
+            .returning(
+                Review.course_id, Review.rating_overall, Review.difficulty, Review.workload
+            )
+        )
+        row = result.first()
+        if row is None:
+            return None
+        return Review(id=review_id, is_hidden=True, **row._asdict())
+
+    async def get_tag_ids(self, review_id: int) -> list[int]:
+        result = await self.db.execute(
+            select(ReviewTag.tag_id).where(ReviewTag.review_id == review_id)
+        )
+        return list(result.scalars().all())
 
     async def add_tags(self, review_id: int, tag_ids: list[int]) -> None:
-        for tag_id in tag_ids:
-            review_tag = ReviewTag(review_id=review_id, tag_id=tag_id)
-            self.db.add(review_tag)
-        await self.db.flush()
+        if not tag_ids:
+            return
+        await self.db.execute(
+            insert(ReviewTag).values(
+                [{"review_id": review_id, "tag_id": tag_id} for tag_id in tag_ids]
+            )
+        )
@@ -1,4 +1,4 @@
-from sqlalchemy import select
+from sqlalchemy import lambda_stmt, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import User
@@ -9,8 +9,17 @@ class UserRepository(BaseRepository[User]):
     def __init__(self, db: AsyncSession):
         super().__init__(User, db)
 
+    async def get_by_id(self, entity_id: int) -> User | None:
+        # Runs on every authenticated request; cached construct, see course.py
+        result = await self.db.execute(
+            lambda_stmt(lambda: select(User).where(User.id == entity_id))
+        )
+        return result.scalar_one_or_none()
+
     async def get_by_email(self, email: str) -> User | None:
-        result = await self.db.execute(select(User).where(User.email == email))
+        result = await self.db.execute(
+            lambda_stmt(lambda: select(User).where(User.email == email))
+        )
         return result.scalar_one_or_none()
 
     async def get_by_verification_token(self, token: str) -> User | None:
@@ -18,3 +27,13 @@ class UserRepository(BaseRepository[User]):
             select(User).where(User.verification_token == token)
         )
         return result.scalar_one_or_none()
+
+    async def increment_review_count(self, user_id: int, amount: int = 1) -> int:
+        """Atomically bump review_count in the DB (no read-modify-write race)."""
+        result = await self.db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(review_count=User.review_count + amount)
+            .returning(User.review_count)
+        )
+        return result.scalar_one()
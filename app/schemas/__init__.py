@@ -1,3 +1,4 @@
+from app.schemas.admin import ProfileDetail, ProfileSummary, ProfileTokenResponse
 from app.schemas.auth import (
     LoginRequest,
     MessageResponse,
@@ -10,11 +11,13 @@ from app.schemas.auth import (
 from app.schemas.course import (
     CourseDetailResponse,
     CourseEvalSummary,
+    CourseFacetsResponse,
     CourseListResponse,
     CourseResponse,
+    RatingHistogram,
 )
 from app.schemas.major import MajorResponse
-from app.schemas.review import ReviewCreate, ReviewResponse
+from app.schemas.review import ReviewCreate, ReviewPageResponse, ReviewResponse
 from app.schemas.search import SearchResult, TrendingItem
 from app.schemas.tag import TagResponse
 
@@ -24,8 +27,11 @@ __all__ = [
     "CourseListResponse",
     "CourseDetailResponse",
     "CourseEvalSummary",
+    "CourseFacetsResponse",
+    "RatingHistogram",
     "ReviewResponse",
     "ReviewCreate",
+    "ReviewPageResponse",
     "TagResponse",
     "SignupRequest",
     "LoginRequest",
@@ -36,4 +42,7 @@ __all__ = [
     "ResendVerificationRequest",
     "SearchResult",
     "TrendingItem",
+    "ProfileSummary",
+    "ProfileDetail",
+    "ProfileTokenResponse",
 ]
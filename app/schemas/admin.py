@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class ProfileSummary(BaseModel):
+    id: str
+    method: str
+    path: str
+    trigger: str
+    started_at: datetime
+    status: int | None
+    duration_ms: float
+    samples: int
+    timings_ms: dict[str, float]
+
+
+class ProfileDetail(ProfileSummary):
+    # (collapsed stack, sample count), most sampled first
+    stacks: list[tuple[str, int]]
+
+
+class ProfileTokenResponse(BaseModel):
+    header: str
+    value: str
+    expires_in: int
@@ -35,6 +35,20 @@ class CourseListResponse(BaseModel):
     review_count: int = 0
 
 
+class CourseFacetsResponse(BaseModel):
+    """Number of listed courses per filter value of GET /courses."""
+    grades: dict[int, int] = {}
+    semesters: dict[int, int] = {}
+    departments: dict[str, int] = {}
+
+
+class RatingHistogram(BaseModel):
+    """Review counts per value 1-5 (index 0 is 1)."""
+    rating: list[int] = [0] * 5
+    difficulty: list[int] = [0] * 5
+    workload: list[int] = [0] * 5
+
+
 class CourseDetailResponse(BaseModel):
     id: int
     course_code: str
@@ -45,4 +59,6 @@ class CourseDetailResponse(BaseModel):
     avg_difficulty: float | None = None
     avg_workload: float | None = None
     review_count: int = 0
+    histogram: RatingHistogram = RatingHistogram()
     reviews: list[ReviewResponse] = []
+    reviews_next_cursor: str | None = None
@@ -25,3 +25,8 @@ class ReviewResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ReviewPageResponse(BaseModel):
+    items: list[ReviewResponse] = []
+    next_cursor: str | None = None
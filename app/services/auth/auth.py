@@ -1,4 +1,3 @@
-import asyncio
 import logging
 import secrets
 from datetime import UTC, datetime, timedelta
@@ -7,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.constants import AuthConstants
+from app.core.password_hasher import PasswordHasher, PasswordHasherBusyError, password_hasher
 from app.models import User
 from app.repositories import UserRepository
 from app.services.auth.errors import (AccountDeletedError,
@@ -16,14 +16,26 @@ from app.services.auth.errors import (AccountDeletedError,
                                       InvalidEmailDomainError,
                                       InvalidVerificationTokenError,
                                       VerificationTokenExpiredError)
-from app.services.mailer import send_verification_email
+from app.services.auth.principal import PrincipalCache, user_principals
+from app.services.mail_outbox import MailOutbox, mail_outbox
+from app.services.mailer import render_verification_email
 
 logger = logging.getLogger(__name__)
 
 
 class AuthService:
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        principals: PrincipalCache = user_principals,
+        hasher: PasswordHasher = password_hasher,
+        outbox: MailOutbox = mail_outbox,
+    ):
+        self.db = db
         self.user_repo = UserRepository(db)
+        self.principals = principals
+        self.hasher = hasher
+        self.outbox = outbox
 
     def _validate_knou_email(self, email: str) -> None:
         if not email.lower().endswith(AuthConstants.KNOU_EMAIL_DOMAIN):
@@ -31,30 +43,22 @@ class AuthService:
                 f"Email must be a KNOU email address ({AuthConstants.KNOU_EMAIL_DOMAIN})"
             )
 
-    def _hash_password(self, password: str) -> str:
-        import bcrypt
+    async def _hash_password(self, password: str) -> str:
+        return await self.hasher.hash(password)
 
-        return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
-
-    def _verify_password(self, password: str, password_hash: str) -> bool:
-        import bcrypt
-
-        return bcrypt.checkpw(password.encode(), password_hash.encode())
+    async def _verify_password(self, password: str, password_hash: str) -> bool:
+        return await self.hasher.verify(password, password_hash)
 
     def _generate_verification_token(self) -> str:
         return secrets.token_urlsafe(32)
 
     async def signup(self, email: str, password: str) -> User:
         """
-        Register a new user and sends verification email.
-        Returns the user.
+        Register a new user and queue the verification email (sent by the
+        outbox worker once this transaction commits). Returns the user.
         """
         user = await self._create_user(email, password)
-        try:
-            await self._issue_token_and_send(user)
-        except Exception:
-            logger.exception("Failed to send verification email during signup for %s", email)
-
+        await self._issue_token_and_queue_email(user)
         return user
 
     async def _create_user(self, email: str, password: str) -> User:
@@ -73,7 +77,7 @@ class AuthService:
 
         user = await self.user_repo.create(
             email=email,
-            password_hash=self._hash_password(password),
+            password_hash=await self._hash_password(password),
             is_verified=False,
             verification_token=token,
             verification_token_expires=expires,
@@ -88,9 +92,9 @@ class AuthService:
         if user.is_verified:
             return
 
-        await self._issue_token_and_send(user)
+        await self._issue_token_and_queue_email(user)
 
-    async def _issue_token_and_send(self, user: User) -> None:
+    async def _issue_token_and_queue_email(self, user: User) -> None:
         token = self._generate_verification_token()
         expires = datetime.now(UTC) + timedelta(hours=AuthConstants.VERIFICATION_TOKEN_EXPIRY_HOURS)
 
@@ -100,16 +104,12 @@ class AuthService:
             verification_token_expires=expires,
         )
 
-        try:
-            await self._send_verification_email(user.email, token)
-        except Exception:
-            logger.exception("Failed to send verification email to %s", user.email)
+        await self._queue_verification_email(user.email, token)
 
-    async def _send_verification_email(self, email: str, token: str) -> None:
+    async def _queue_verification_email(self, email: str, token: str) -> None:
         verify_url = f"{settings.frontend_url}/#/verify-email?token={token}"
-        await asyncio.to_thread(
-            send_verification_email, to_email=email, verify_url=verify_url
-        )
+        subject, html_body = render_verification_email(verify_url)
+        await self.outbox.enqueue(self.db, email, subject, html_body)
 
     async def verify_email(self, token: str) -> User:
         """Verify user's email with the token."""
@@ -126,6 +126,7 @@ class AuthService:
             verification_token=None,
             verification_token_expires=None,
         )
+        self.principals.invalidate_after_commit(self.db, user.id)
 
         return user
 
@@ -140,18 +141,37 @@ class AuthService:
         if user.is_deleted:
             raise AccountDeletedError("This account has been deleted")
 
-        if not self._verify_password(password, user.password_hash):
+        if not await self._verify_password(password, user.password_hash):
             raise InvalidCredentialsError("Invalid email or password")
 
         if not user.is_verified:
             raise EmailNotVerifiedError("Email not verified. Please check your email.")
 
+        if self.hasher.needs_rehash(user.password_hash):
+            await self._rehash_password(user, password)
+
         return user
 
-    async def delete_account(self, user: User) -> None:
+    async def _rehash_password(self, user: User, password: str) -> None:
+        """Re-hash at the current bcrypt cost; the plaintext is only available at login."""
+        try:
+            password_hash = await self._hash_password(password)
+        except PasswordHasherBusyError:
+            # The login itself succeeded; upgrade on a quieter login instead
+            return
+        await self.user_repo.update(user, password_hash=password_hash)
+
+    async def get_user(self, user_id: int) -> User | None:
+        return await self.user_repo.get_by_id(user_id)
+
+    async def delete_account(self, user_id: int) -> None:
         """Soft delete a user account."""
+        user = await self.user_repo.get_by_id(user_id)
+        if user is None:
+            return
         await self.user_repo.update(
             user,
             is_deleted=True,
             deleted_at=datetime.now(UTC),
         )
+        self.principals.invalidate_after_commit(self.db, user_id)
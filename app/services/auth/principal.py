@@ -0,0 +1,133 @@
+"""
+Cached authentication principal.
+
+Every authenticated request needs the caller's verification/deletion state
+and review count, but almost never the rest of the users row. The principal
+is that subset, cached per user for `CacheTTL.USER_PRINCIPAL` seconds. Writes
+that change it (review creation, verification, account deletion) drop the
+cache entry once their transaction commits, so the TTL only bounds staleness
+for changes made outside the app.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants import AuthConstants, CacheKeys, CacheTTL
+from app.core.metrics import cache_lookups, cache_namespace
+from app.db.database import run_after_commit
+from app.models import User
+from app.repositories import UserRepository
+from app.services.cache import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """The authenticated user as seen by request handlers."""
+
+    id: int
+    is_verified: bool
+    is_deleted: bool
+    review_count: int
+    created_at: datetime
+
+    @property
+    def has_full_access(self) -> bool:
+        return self.review_count >= AuthConstants.REQUIRED_REVIEWS_FOR_FULL_ACCESS
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            is_verified=bool(user.is_verified),
+            is_deleted=bool(user.is_deleted),
+            review_count=user.review_count or 0,
+            created_at=user.created_at,
+        )
+
+    def to_json(self) -> str:
+        return json.dumps({**asdict(self), "created_at": self.created_at.isoformat()})
+
+    @classmethod
+    def from_json(cls, raw: str) -> "UserPrincipal":
+        data = json.loads(raw)
+        data["created_at"] = datetime.fromisoformat(data["created_at"])
+        return cls(**data)
+
+
+async def _shared_backend() -> CacheBackend:
+    # Imported on use: app.deps.cache loads the services package, which loads
+    # this module (app.deps.cache -> services -> auth -> principal)
+    from app.deps.cache import get_cache_backend
+
+    return await get_cache_backend()
+
+
+class PrincipalCache:
+    def __init__(
+        self,
+        backend_factory: Callable[[], Awaitable[CacheBackend]] = _shared_backend,
+        ttl: int = CacheTTL.USER_PRINCIPAL,
+    ):
+        self._backend_factory = backend_factory
+        self._ttl = ttl
+        self._pending: set[asyncio.Task] = set()
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"{CacheKeys.USER_PRINCIPAL_PREFIX}:{user_id}"
+
+    async def get_or_load(self, db: AsyncSession, user_id: int) -> UserPrincipal | None:
+        """Principal from the cache, falling back to the users table. None if no such user."""
+        cache = None
+        try:
+            cache = await self._backend_factory()
+            key = self._key(user_id)
+            cached = await cache.get(key)
+            cache_lookups.labels(cache_namespace(key), "miss" if cached is None else "hit").inc()
+            if cached is not None:
+                return UserPrincipal.from_json(cached)
+        except Exception:
+            logger.warning("Could not read cached principal for user %s", user_id, exc_info=True)
+
+        user = await UserRepository(db).get_by_id(user_id)
+        if user is None:
+            return None
+
+        principal = UserPrincipal.from_user(user)
+        if cache is not None:
+            try:
+                await cache.set(self._key(user_id), principal.to_json(), ex=self._ttl)
+            except Exception:
+                logger.warning("Could not cache principal for user %s", user_id, exc_info=True)
+        return principal
+
+    async def invalidate(self, user_id: int) -> None:
+        try:
+            cache = await self._backend_factory()
+            await cache.delete(self._key(user_id))
+        except Exception:
+            logger.warning("Could not invalidate principal for user %s", user_id, exc_info=True)
+
+    def invalidate_after_commit(self, db: AsyncSession, user_id: int) -> None:
+        """
+        Drop the cached principal once `db` commits. Invalidating earlier would
+        let a concurrent request re-cache the pre-commit row.
+        """
+
+        def schedule() -> None:
+            task = asyncio.get_running_loop().create_task(self.invalidate(user_id))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+        run_after_commit(db, schedule)
+
+
+user_principals = PrincipalCache()
@@ -0,0 +1,72 @@
+"""
+Verified access token cache.
+
+A session presents the same 7-day bearer token on every request, and each
+presentation used to pay for a full HMAC check and claim parse. Once a token
+has verified, its SHA-256 digest maps to `(user_id, exp)` in a bounded
+per-process LRU, and later presentations are answered from there until `exp`.
+Tokens that fail verification are never cached, and every entry is dropped
+when the signing key or algorithm changes.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from app.constants import AuthConstants
+
+
+class VerifiedTokenCache:
+    def __init__(
+        self,
+        maxsize: int = AuthConstants.VERIFIED_TOKEN_CACHE_SIZE,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._maxsize = maxsize
+        self._clock = clock
+        self._entries: OrderedDict[bytes, tuple[int, float]] = OrderedDict()
+        self._signing_key: tuple[str, str] | None = None
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def _use_key(self, signing_key: tuple[str, str]) -> None:
+        # Entries verified under a rotated secret must not outlive it
+        if signing_key != self._signing_key:
+            self._entries.clear()
+            self._signing_key = signing_key
+
+    def get(self, token: str, signing_key: tuple[str, str]) -> int | None:
+        """User id for a previously verified, unexpired token; None on a miss."""
+        self._use_key(signing_key)
+        digest = self._digest(token)
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+
+        user_id, exp = entry
+        if exp <= self._clock():
+            del self._entries[digest]
+            return None
+
+        self._entries.move_to_end(digest)
+        return user_id
+
+    def put(self, token: str, signing_key: tuple[str, str], user_id: int, exp: float) -> None:
+        self._use_key(signing_key)
+        digest = self._digest(token)
+        self._entries[digest] = (user_id, exp)
+        self._entries.move_to_end(digest)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+verified_tokens = VerifiedTokenCache()
@@ -6,12 +6,17 @@ In-memory cache is process-local and cleared on restart.
 """
 
 import json
+import math
 import time
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from typing import Awaitable, Callable, TypeVar
 
 from app.constants import CacheTTL
+from app.core.compression import PrecompressedBody
+from app.core.metrics import cache_lookups, cache_namespace
+from app.core.responses import encode_json
+from app.core.timing import time_public_methods
 
 T = TypeVar("T")
 
@@ -19,6 +24,11 @@ T = TypeVar("T")
 class CacheBackend(ABC):
     """Abstract base class for cache backends."""
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Backend calls show up as the `cache` Server-Timing span
+        time_public_methods(cls, "cache")
+
     @abstractmethod
     async def get(self, key: str) -> str | None:
         """Get a value from cache."""
@@ -61,12 +71,47 @@ class CacheBackend(ABC):
         """Check if cache is available."""
         pass
 
+    @abstractmethod
+    async def reserve_tokens(
+        self,
+        key: str,
+        previous_key: str,
+        limit: int,
+        previous_weight: float,
+        amount: int,
+        ttl: int,
+    ) -> int:
+        """
+        Sliding window counter: atomically add up to `amount` to the counter at
+        `key`, keeping `previous * previous_weight + current` within `limit`.
+        Returns how many were added (0 when the window is full).
+        """
+        pass
+
+
+# KEYS: current window, previous window; ARGV: limit, previous weight, amount, ttl
+_RESERVE_TOKENS_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local left = tonumber(ARGV[1]) - math.ceil(previous * tonumber(ARGV[2])) - current
+local granted = math.min(tonumber(ARGV[3]), left)
+if granted <= 0 then
+    return 0
+end
+redis.call('INCRBY', KEYS[1], granted)
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return granted
+"""
+
 
 class RedisBackend(CacheBackend):
     """Redis-backed cache implementation."""
 
     def __init__(self, client):
         self.client = client
+        # Registered once: the Script keeps its SHA and runs with EVALSHA,
+        # loading itself on the first NOSCRIPT
+        self._reserve_tokens_script = client.register_script(_RESERVE_TOKENS_SCRIPT)
 
     async def get(self, key: str) -> str | None:
         return await self.client.get(key)
@@ -94,6 +139,21 @@ class RedisBackend(CacheBackend):
     async def ping(self) -> bool:
         return await self.client.ping()
 
+    async def reserve_tokens(
+        self,
+        key: str,
+        previous_key: str,
+        limit: int,
+        previous_weight: float,
+        amount: int,
+        ttl: int,
+    ) -> int:
+        # One round trip (EVALSHA, loading the script on first use)
+        granted = await self._reserve_tokens_script(
+            keys=[key, previous_key], args=[limit, previous_weight, amount, ttl]
+        )
+        return int(granted)
+
 
 class InMemoryBackend(CacheBackend):
     """In-memory cache implementation (process-local, non-persistent)."""
@@ -168,6 +228,24 @@ class InMemoryBackend(CacheBackend):
     async def ping(self) -> bool:
         return True
 
+    async def reserve_tokens(
+        self,
+        key: str,
+        previous_key: str,
+        limit: int,
+        previous_weight: float,
+        amount: int,
+        ttl: int,
+    ) -> int:
+        # get/set never suspend, so the read-check-write is atomic on the event loop
+        current = int(await self.get(key) or 0)
+        previous = int(await self.get(previous_key) or 0)
+        granted = min(amount, limit - math.ceil(previous * previous_weight) - current)
+        if granted <= 0:
+            return 0
+        await self.set(key, str(current + granted), ex=ttl)
+        return granted
+
 
 class Cache:
     """Cache service with backend abstraction."""
@@ -183,6 +261,7 @@ class Cache:
     ) -> T:
         """Get from cache or load and cache the value."""
         cached = await self.client.get(key)
+        cache_lookups.labels(cache_namespace(key), "miss" if cached is None else "hit").inc()
         if cached is not None:
             return json.loads(cached)
 
@@ -190,6 +269,25 @@ class Cache:
         await self.client.set(key, json.dumps(value, ensure_ascii=False), ex=ttl)
         return value
 
+    async def get_or_set_body(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[object]],
+        ttl: int = CacheTTL.DEFAULT,
+    ) -> PrecompressedBody:
+        """
+        Like get_or_set_json, but cache the encoded JSON response body along
+        with its compressed variants, so hits skip serialization and compression.
+        """
+        cached = await self.client.get(key)
+        cache_lookups.labels(cache_namespace(key), "miss" if cached is None else "hit").inc()
+        if cached is not None:
+            return PrecompressedBody.from_json(cached)
+
+        body = PrecompressedBody.build(encode_json(await loader()))
+        await self.client.set(key, body.to_json(), ex=ttl)
+        return body
+
     async def delete(self, key: str) -> None:
         """Delete a key from cache."""
         await self.client.delete(key)
@@ -0,0 +1,361 @@
+"""
+In-process columnar read model of the course catalog.
+
+The catalog is small (a few thousand courses), so every worker keeps one
+NumPy array per column and answers `/courses` filtering, sorting and
+pagination with vectorized masks and argsorts. Postgres stays the source of
+truth: the index is fully reloaded every `CacheTTL.CATALOG_INDEX_REFRESH`
+seconds and patched in between from this worker's committed review writes.
+
+Encoded `/courses` responses are cached per index `version` (bumped by every
+patch and by reloads that change the data) together with their compressed
+variants. A patch applied while a reload is querying may be missing from the
+rows it loads, so such a reload is redone on the next request.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, fields
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants import CacheTTL, CompressionConstants, CourseStatus, CourseValidation
+from app.core.compression import PrecompressedBody
+from app.db.database import AsyncSessionLocal, run_after_commit
+from app.models import Course, CourseOffering, Major, Review
+from app.repositories.course import ranking_score
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Columns:
+    ids: np.ndarray  # int64
+    major_ids: np.ndarray  # int64
+    codes: np.ndarray  # str
+    names: np.ndarray  # str
+    names_lower: np.ndarray  # str
+    major_names: np.ndarray  # str
+    departments: np.ndarray  # str
+    offered: np.ndarray  # int64 bitmask of active (semester, grade) offerings
+    rating_sum: np.ndarray  # float64
+    difficulty_sum: np.ndarray  # float64
+    workload_sum: np.ndarray  # float64
+    review_count: np.ndarray  # int64
+    latest_review: np.ndarray  # float64 epoch seconds, NaN if no reviews
+    ranking: np.ndarray  # float64 ranking_score(), NaN if no reviews
+
+    def averages(self, sums: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.review_count > 0, sums / self.review_count, np.nan)
+
+    def equals(self, other: "_Columns") -> bool:
+        for field in fields(self):
+            a, b = getattr(self, field.name), getattr(other, field.name)
+            if not np.array_equal(a, b, equal_nan=a.dtype.kind == "f"):
+                return False
+        return True
+
+
+def _offering_bit(semester: int, grade: int) -> int:
+    return 1 << ((semester - 1) * CourseValidation.GRADE_MAX + grade - 1)
+
+
+def _offering_mask(grade: int | None, semester: int | None) -> int:
+    """Bits of every (semester, grade) offering matching the filter."""
+    semesters = range(CourseValidation.SEMESTER_MIN, CourseValidation.SEMESTER_MAX + 1)
+    grades = range(CourseValidation.GRADE_MIN, CourseValidation.GRADE_MAX + 1)
+    mask = 0
+    for s in [semester] if semester else semesters:
+        for g in [grade] if grade else grades:
+            mask |= _offering_bit(s, g)
+    return mask
+
+
+def _desc_nulls_last(values: np.ndarray) -> np.ndarray:
+    """Sort key for `values DESC NULLS LAST` when sorted ascending."""
+    return -np.where(np.isnan(values), -np.inf, values)
+
+
+class CourseCatalogIndex:
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] | None = None,
+        refresh_interval: float = CacheTTL.CATALOG_INDEX_REFRESH,
+    ):
+        self._session_factory = session_factory or AsyncSessionLocal
+        self._refresh_interval = refresh_interval
+        self._cols: _Columns | None = None
+        self._position: dict[int, int] = {}
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        # Counts apply_review calls, so a reload can tell one raced its queries
+        self._patches = 0
+        # Bumped whenever query results may change
+        self.version = 0
+        self._bodies: OrderedDict[tuple, PrecompressedBody] = OrderedDict()
+        self._bodies_version = 0
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._cols is not None
+
+    async def ensure_fresh(self) -> None:
+        if self._cols is not None and time.monotonic() - self._loaded_at < self._refresh_interval:
+            return
+        if self._lock.locked() and self._cols is not None:
+            # Another request is reloading; keep serving the current snapshot
+            return
+        async with self._lock:
+            if self._cols is None or time.monotonic() - self._loaded_at >= self._refresh_interval:
+                await self.reload()
+
+    async def reload(self) -> None:
+        review_stats = (
+            select(
+                Review.course_id,
+                func.sum(Review.rating_overall).label("rating_sum"),
+                func.sum(Review.difficulty).label("difficulty_sum"),
+                func.sum(Review.workload).label("workload_sum"),
+                func.count(Review.id).label("review_count"),
+                func.max(Review.created_at).label("latest_review"),
+            )
+            .where(Review.is_hidden.is_(False))
+            .group_by(Review.course_id)
+            .subquery()
+        )
+        query = (
+            select(
+                Course.id,
+                Course.major_id,
+                Course.course_code,
+                Course.name,
+                Major.name.label("major_name"),
+                Major.department,
+                review_stats.c.rating_sum,
+                review_stats.c.difficulty_sum,
+                review_stats.c.workload_sum,
+                review_stats.c.review_count,
+                review_stats.c.latest_review,
+            )
+            .join(Major, Course.major_id == Major.id)
+            .outerjoin(review_stats, Course.id == review_stats.c.course_id)
+            .where(Course.is_archived.is_(False))
+            .order_by(Course.id)
+        )
+
+        offerings_query = select(
+            CourseOffering.course_id, CourseOffering.semester, CourseOffering.grade_target
+        ).where(CourseOffering.status == CourseStatus.ACTIVE)
+
+        patches = self._patches
+        async with self._session_factory() as db:
+            rows = (await db.execute(query)).all()
+            offerings = (await db.execute(offerings_query)).all()
+
+        self.load_rows(rows, offerings)
+        if self._patches != patches:
+            # A review committed mid-reload may not be in `rows`; reload again
+            # on the next request rather than guess whether it is
+            self._loaded_at = 0.0
+        logger.info("Course catalog index loaded (%d courses)", len(rows))
+
+    def load_rows(self, rows, offerings=()) -> None:
+        """
+        Build the columns from rows shaped like the reload() query and
+        (course_id, semester, grade_target) active offerings.
+        """
+        offered: dict[int, int] = {}
+        for course_id, semester, grade in offerings:
+            offered[course_id] = offered.get(course_id, 0) | _offering_bit(semester, grade)
+
+        names = [r.name for r in rows]
+        cols = _Columns(
+            ids=np.array([r.id for r in rows], dtype=np.int64),
+            major_ids=np.array([r.major_id for r in rows], dtype=np.int64),
+            codes=np.array([r.course_code for r in rows], dtype=str),
+            names=np.array(names, dtype=str),
+            names_lower=np.array([n.lower() for n in names], dtype=str),
+            major_names=np.array([r.major_name for r in rows], dtype=str),
+            departments=np.array([r.department for r in rows], dtype=str),
+            offered=np.array([offered.get(r.id, 0) for r in rows], dtype=np.int64),
+            rating_sum=np.array([r.rating_sum or 0 for r in rows], dtype=np.float64),
+            difficulty_sum=np.array([r.difficulty_sum or 0 for r in rows], dtype=np.float64),
+            workload_sum=np.array([r.workload_sum or 0 for r in rows], dtype=np.float64),
+            review_count=np.array([r.review_count or 0 for r in rows], dtype=np.int64),
+            latest_review=np.array(
+                [r.latest_review.timestamp() if r.latest_review else np.nan for r in rows],
+                dtype=np.float64,
+            ),
+            ranking=np.empty(len(rows), dtype=np.float64),
+        )
+        self._rerank(cols, slice(None))
+        self._loaded_at = time.monotonic()
+        if self._cols is not None and cols.equals(self._cols):
+            # Unchanged: keep the snapshot and its cached response bodies
+            return
+        self._cols = cols
+        self._position = {int(course_id): i for i, course_id in enumerate(cols.ids)}
+        self.version += 1
+
+    def apply_review(
+        self,
+        course_id: int,
+        rating: int,
+        difficulty: int,
+        workload: int,
+        created_at: datetime | None = None,
+        delta: int = 1,
+    ) -> None:
+        """Add (delta=1) or remove (delta=-1) one review's ratings in place."""
+        cols = self._cols
+        i = self._position.get(course_id)
+        if cols is None or i is None:
+            return
+        cols.rating_sum[i] += delta * rating
+        cols.difficulty_sum[i] += delta * difficulty
+        cols.workload_sum[i] += delta * workload
+        cols.review_count[i] = max(int(cols.review_count[i]) + delta, 0)
+        if delta > 0 and created_at is not None:
+            cols.latest_review[i] = np.fmax(cols.latest_review[i], created_at.timestamp())
+        # Removing a review can't lower the max incrementally; the next reload fixes `latest`
+        self._rerank(cols, i)
+        self._patches += 1
+        self.version += 1
+
+    @staticmethod
+    def _rerank(cols: _Columns, where: int | slice) -> None:
+        count = cols.review_count[where]
+        score = ranking_score(
+            cols.rating_sum[where], cols.difficulty_sum[where], cols.workload_sum[where], count
+        )
+        cols.ranking[where] = np.where(count > 0, score, np.nan)
+
+    def record_review(
+        self,
+        db: AsyncSession,
+        course_id: int,
+        rating: int,
+        difficulty: int,
+        workload: int,
+        created_at: datetime | None = None,
+        delta: int = 1,
+    ) -> None:
+        """Apply a review write once the session's transaction commits."""
+        run_after_commit(
+            db,
+            lambda: self.apply_review(course_id, rating, difficulty, workload, created_at, delta),
+        )
+
+    def cached_body(self, key: tuple, build: Callable[[], bytes]) -> PrecompressedBody:
+        """
+        Response body for `key` at the current version; `build` encodes it and
+        runs at most once per version (least recently used keys are dropped).
+        """
+        if self._bodies_version != self.version:
+            self._bodies.clear()
+            self._bodies_version = self.version
+        body = self._bodies.get(key)
+        if body is not None:
+            self._bodies.move_to_end(key)
+            return body
+
+        body = PrecompressedBody.build(build())
+        self._bodies[key] = body
+        if len(self._bodies) > CompressionConstants.MAX_CACHED_BODIES:
+            self._bodies.popitem(last=False)
+        return body
+
+    def stats(self, course_ids: list[int]) -> dict[int, dict]:
+        """Review stats of the given courses that are in the index (archived ones aren't)."""
+        cols = self._cols
+        if cols is None:
+            return {}
+        stats = {}
+        for course_id in course_ids:
+            i = self._position.get(course_id)
+            if i is None:
+                continue
+            count = int(cols.review_count[i])
+            stats[course_id] = {
+                "avg_rating": _average(cols.rating_sum[i], count),
+                "avg_difficulty": _average(cols.difficulty_sum[i], count),
+                "avg_workload": _average(cols.workload_sum[i], count),
+                "review_count": count,
+            }
+        return stats
+
+    def query(
+        self,
+        major_id: int | None = None,
+        q: str | None = None,
+        sort: str = "top_rated",
+        limit: int = 20,
+        offset: int = 0,
+        grade: int | None = None,
+        semester: int | None = None,
+        department: str | None = None,
+    ) -> list[dict]:
+        """Same rows and order as CourseRepository.get_list_with_stats."""
+        cols = self._cols
+        if cols is None:
+            raise RuntimeError("Catalog index not loaded")
+
+        mask = np.ones(len(cols.ids), dtype=bool)
+        if major_id:
+            mask &= cols.major_ids == major_id
+        if q:
+            mask &= np.char.find(cols.names_lower, q.lower()) >= 0
+        if department:
+            mask &= cols.departments == department
+        if grade or semester:
+            mask &= (cols.offered & _offering_mask(grade, semester)) != 0
+        candidates = np.flatnonzero(mask)
+
+        avg_rating = cols.averages(cols.rating_sum)
+        if sort == "top_rated":
+            key = _desc_nulls_last(avg_rating[candidates])
+        elif sort == "most_reviewed":
+            key = -cols.review_count[candidates]
+        elif sort == "latest":
+            key = _desc_nulls_last(cols.latest_review[candidates])
+        elif sort == "recommended":
+            key = _desc_nulls_last(cols.ranking[candidates])
+        else:
+            key = np.zeros(len(candidates))
+        # Ties break on course id for a stable page order
+        order = np.lexsort((cols.ids[candidates], key))
+        page = candidates[order[offset : offset + limit]]
+
+        avg_difficulty = cols.averages(cols.difficulty_sum)
+        avg_workload = cols.averages(cols.workload_sum)
+        return [
+            {
+                "id": int(cols.ids[i]),
+                "course_code": str(cols.codes[i]),
+                "name": str(cols.names[i]),
+                "major_name": str(cols.major_names[i]),
+                "avg_rating": _round(avg_rating[i]),
+                "avg_difficulty": _round(avg_difficulty[i]),
+                "avg_workload": _round(avg_workload[i]),
+                "review_count": int(cols.review_count[i]),
+            }
+            for i in page
+        ]
+
+
+def _round(value: float) -> float | None:
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+def _average(total: float, count: int) -> float | None:
+    return round(float(total) / count, 2) if count else None
+
+
+course_catalog = CourseCatalogIndex()
@@ -1,21 +1,34 @@
+import logging
+import uuid
 from datetime import UTC, datetime, timedelta
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.constants import AuthConstants, CacheTTL
-from app.models import User
+from app.constants import AuthConstants, CacheKeys, CacheTTL, PaginationDefaults
+from app.core.compression import PrecompressedBody
+from app.core.responses import encode_rows
+from app.models import Course, Review
 from app.repositories import CourseRepository, ReviewRepository
 from app.schemas import (
     CourseDetailResponse,
+    CourseFacetsResponse,
     CourseListResponse,
     MajorResponse,
+    RatingHistogram,
+    ReviewPageResponse,
     ReviewResponse,
     TagResponse,
 )
-from app.services.cache import RedisCache
+from app.services.auth.principal import UserPrincipal
+from app.services.cache import CacheBackend, RedisCache
+from app.services.catalog_index import CourseCatalogIndex, course_catalog
+from app.utils.auth import LazyUser
+from app.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
 
+logger = logging.getLogger(__name__)
 
-def _can_view_reviews(user: User | None) -> bool:
+
+def _can_view_reviews(user: UserPrincipal | None) -> bool:
     """Check if user can view reviews (3+ reviews OR within 3 days of signup)."""
     if user is None:
         return False
@@ -25,21 +38,193 @@ def _can_view_reviews(user: User | None) -> bool:
     return datetime.now(UTC) < user.created_at + grace_period
 
 
+async def _resolve_user(user: UserPrincipal | LazyUser | None) -> UserPrincipal | None:
+    """Resolve a lazily loaded user; call only once the user is actually needed."""
+    if isinstance(user, LazyUser):
+        return await user.get()
+    return user
+
+
+def _to_review_response(review: Review) -> ReviewResponse:
+    return ReviewResponse(
+        id=review.id,
+        course_id=review.course_id,
+        rating_overall=review.rating_overall,
+        difficulty=review.difficulty,
+        workload=review.workload,
+        text=review.text,
+        created_at=review.created_at,
+        tags=[
+            TagResponse(id=rt.tag.id, name=rt.tag.name, type=rt.tag.type)
+            for rt in review.tags
+        ],
+    )
+
+
+async def publish_catalog_version(cache: CacheBackend) -> str:
+    """Mark the course catalog (courses, offerings, majors) as changed."""
+    version = uuid.uuid4().hex
+    await cache.set(CacheKeys.COURSE_CATALOG_VERSION, version)
+    return version
+
+
+def _to_review_page(
+    reviews: list[Review], limit: int, sort: str = "newest"
+) -> ReviewPageResponse:
+    """Page from up to `limit + 1` reviews; the extra row only signals a next page."""
+    next_cursor = None
+    if len(reviews) > limit:
+        reviews = reviews[:limit]
+        last = reviews[-1]
+        sort_value = {"rating": last.rating_overall, "difficulty": last.difficulty}.get(sort)
+        next_cursor = encode_cursor(sort_value, last.created_at, last.id)
+
+    return ReviewPageResponse(
+        items=[_to_review_response(review) for review in reviews],
+        next_cursor=next_cursor,
+    )
+
+
+def _to_histogram(flat: list[int] | None) -> RatingHistogram:
+    """Split the stored int[15] (rating, difficulty, workload) into its three rows."""
+    if not flat:
+        return RatingHistogram()
+    return RatingHistogram(rating=flat[0:5], difficulty=flat[5:10], workload=flat[10:15])
+
+
+def _to_detail_response(
+    course: Course,
+    stats: dict,
+    histogram: list[int] | None,
+    page: ReviewPageResponse | None,
+) -> CourseDetailResponse:
+    """Ratings are always public; `page` is None when the user can't view reviews."""
+    return CourseDetailResponse(
+        id=course.id,
+        course_code=course.course_code,
+        name=course.name,
+        is_archived=course.is_archived,
+        major=MajorResponse(
+            id=course.major.id,
+            name=course.major.name,
+            department=course.major.department,
+        ),
+        review_count=stats["review_count"],
+        avg_rating=stats["avg_rating"],
+        avg_difficulty=stats["avg_difficulty"],
+        avg_workload=stats["avg_workload"],
+        histogram=_to_histogram(histogram),
+        reviews=page.items if page else [],
+        reviews_next_cursor=page.next_cursor if page else None,
+    )
+
+
 class CourseService:
-    def __init__(self, db: AsyncSession, cache: RedisCache):
+    def __init__(
+        self,
+        db: AsyncSession,
+        cache: RedisCache,
+        catalog: CourseCatalogIndex = course_catalog,
+    ):
         self.course_repo = CourseRepository(db)
         self.review_repo = ReviewRepository(db)
         self.cache = cache
+        self.catalog = catalog
 
-    async def get_list(
+    async def get_list_rows(
         self,
-        user: User | None = None,
         major_id: int | None = None,
         q: str | None = None,
         sort: str = "top_rated",
         limit: int = 20,
         offset: int = 0,
-    ) -> list[CourseListResponse]:
+        grade: int | None = None,
+        semester: int | None = None,
+        department: str | None = None,
+    ) -> list[dict]:
+        """Rows with exactly the fields of CourseListResponse (see core/responses.py)."""
+        # Served from the in-process catalog index; Postgres only if it can't load.
+        # Ratings are always public.
+        try:
+            await self.catalog.ensure_fresh()
+            return self.catalog.query(
+                major_id=major_id,
+                q=q,
+                sort=sort,
+                limit=limit,
+                offset=offset,
+                grade=grade,
+                semester=semester,
+                department=department,
+            )
+        except Exception:
+            logger.exception("Course catalog index unavailable, querying Postgres")
+        return await self._get_list_from_postgres(
+            major_id=major_id,
+            q=q,
+            sort=sort,
+            limit=limit,
+            offset=offset,
+            grade=grade,
+            semester=semester,
+            department=department,
+        )
+
+    async def get_list_body(
+        self,
+        major_id: int | None = None,
+        sort: str = "top_rated",
+        limit: int = 20,
+        offset: int = 0,
+        grade: int | None = None,
+        semester: int | None = None,
+        department: str | None = None,
+    ) -> PrecompressedBody:
+        """
+        Encoded `GET /courses` response for a listing without a search query.
+        Bodies from the catalog index are cached per index version, compressed.
+        """
+        try:
+            await self.catalog.ensure_fresh()
+        except Exception:
+            logger.exception("Course catalog index unavailable, querying Postgres")
+            rows = await self._get_list_from_postgres(
+                major_id=major_id,
+                sort=sort,
+                limit=limit,
+                offset=offset,
+                grade=grade,
+                semester=semester,
+                department=department,
+            )
+            return PrecompressedBody(encode_rows(CourseListResponse, rows))
+
+        def build() -> bytes:
+            rows = self.catalog.query(
+                major_id=major_id,
+                sort=sort,
+                limit=limit,
+                offset=offset,
+                grade=grade,
+                semester=semester,
+                department=department,
+            )
+            return encode_rows(CourseListResponse, rows)
+
+        key = (major_id, sort, limit, offset, grade, semester, department)
+        return self.catalog.cached_body(key, build)
+
+    async def _get_list_from_postgres(
+        self,
+        major_id: int | None = None,
+        q: str | None = None,
+        sort: str = "top_rated",
+        limit: int = 20,
+        offset: int = 0,
+        grade: int | None = None,
+        semester: int | None = None,
+        department: str | None = None,
+    ) -> list[dict]:
         should_cache = not q
 
         async def _load_course_list() -> list[dict]:
@@ -49,77 +234,134 @@ class CourseService:
                 sort=sort,
                 limit=limit,
                 offset=offset,
+                grade=grade,
+                semester=semester,
+                department=department,
             )
 
         if not should_cache:
-            rows = await _load_course_list()
-        else:
-            try:
-                major_key = major_id if major_id is not None else "all"
-                key = f"courses:list:v1:major={major_key}:sort={sort}:limit={limit}:offset={offset}"
-                rows = await self.cache.get_or_set_json(
-                    key=key,
-                    ttl=CacheTTL.DEFAULT,
-                    loader=_load_course_list,
-                )
-            except Exception:
-                rows = await _load_course_list()
-
-        # Always show ratings publicly
-        return [CourseListResponse(**row) for row in rows]
+            return await _load_course_list()
+        try:
+            major_key = major_id if major_id is not None else "all"
+            key = (
+                f"courses:list:v2:major={major_key}:dept={department or 'all'}"
+                f":grade={grade or 'all'}:semester={semester or 'all'}"
+                f":sort={sort}:limit={limit}:offset={offset}"
+            )
+            return await self.cache.get_or_set_json(
+                key=key,
+                ttl=CacheTTL.DEFAULT,
+                loader=_load_course_list,
+            )
+        except Exception:
+            return await _load_course_list()
+
+    async def get_facets(self) -> CourseFacetsResponse:
+        """Facet counts, computed once per catalog version and shared via the cache."""
+        try:
+            version = await self.cache.client.get(CacheKeys.COURSE_CATALOG_VERSION)
+            facets = await self.cache.get_or_set_json(
+                key=f"{CacheKeys.COURSE_FACETS_PREFIX}:{version or 'initial'}",
+                ttl=CacheTTL.COURSE_FACETS,
+                loader=self.course_repo.get_facets,
+            )
+        except Exception:
+            facets = await self.course_repo.get_facets()
+        return CourseFacetsResponse(**facets)
 
     async def get_detail(
-        self, course_id: int, user: User | None = None
+        self, course_id: int, user: UserPrincipal | LazyUser | None = None
     ) -> CourseDetailResponse | None:
         data = await self.course_repo.get_detail_with_stats(course_id)
         if not data:
             return None
 
-        course = data["course"]
-
-        # Always show ratings publicly
-        base_response = {
-            "id": course.id,
-            "course_code": course.course_code,
-            "name": course.name,
-            "is_archived": course.is_archived,
-            "major": MajorResponse(
-                id=course.major.id,
-                name=course.major.name,
-                department=course.major.department,
-            ),
-            "review_count": data["review_count"],
-            "avg_rating": data["avg_rating"],
-            "avg_difficulty": data["avg_difficulty"],
-            "avg_workload": data["avg_workload"],
-        }
-
         # Only show reviews if user can view them (3+ reviews OR grace period)
-        if not _can_view_reviews(user):
-            return CourseDetailResponse(
-                **base_response,
-                reviews=[],
-            )
+        page = None
+        if _can_view_reviews(await _resolve_user(user)):
+            page = await self._load_review_page(course_id)
+
+        return _to_detail_response(data["course"], data, data["histogram"], page)
+
+    async def get_batch(
+        self, course_ids: list[int], user: UserPrincipal | LazyUser | None = None
+    ) -> list[CourseDetailResponse]:
+        """
+        Several courses for side-by-side comparison, in the requested order.
+        Unknown ids are skipped. Each course carries a short review preview;
+        the rest is paged through GET /courses/{id}/reviews.
+        """
+        courses = await self.course_repo.get_many_for_detail(course_ids)
+        found = [course_id for course_id in course_ids if course_id in courses]
+        if not found:
+            return []
+
+        # Stats of listed courses are already in memory; archived ones go to Postgres
+        try:
+            await self.catalog.ensure_fresh()
+            stats = self.catalog.stats(found)
+        except Exception:
+            logger.exception("Course catalog index unavailable, querying Postgres")
+            stats = {}
+        missing = [course_id for course_id in found if course_id not in stats]
+        if missing:
+            stats.update(await self.course_repo.get_stats_many(missing))
 
-        reviews = await self.review_repo.get_by_course_id(course_id)
-        reviews_data = [
-            ReviewResponse(
-                id=review.id,
-                course_id=review.course_id,
-                rating_overall=review.rating_overall,
-                difficulty=review.difficulty,
-                workload=review.workload,
-                text=review.text,
-                created_at=review.created_at,
-                tags=[
-                    TagResponse(id=rt.tag.id, name=rt.tag.name, type=rt.tag.type)
-                    for rt in review.tags
-                ],
+        pages: dict[int, ReviewPageResponse] = {}
+        if _can_view_reviews(await _resolve_user(user)):
+            limit = PaginationDefaults.COURSE_BATCH_REVIEW_PREVIEW
+            latest = await self.review_repo.get_latest_by_course_ids(found, limit + 1)
+            pages = {
+                course_id: _to_review_page(reviews, limit) for course_id, reviews in latest.items()
+            }
+
+        return [
+            _to_detail_response(
+                courses[course_id]["course"],
+                stats[course_id],
+                courses[course_id]["histogram"],
+                pages.get(course_id),
             )
-            for review in reviews
+            for course_id in found
         ]
 
-        return CourseDetailResponse(
-            **base_response,
-            reviews=reviews_data,
+    async def get_reviews_page(
+        self,
+        course_id: int,
+        user: UserPrincipal | LazyUser | None = None,
+        sort: str = "newest",
+        limit: int = PaginationDefaults.REVIEW_PAGE_DEFAULT_LIMIT,
+        cursor: str | None = None,
+    ) -> ReviewPageResponse | None:
+        """
+        Keyset-paginated reviews for a course.
+        Returns None if the course does not exist.
+        Raises InvalidCursorError if the cursor is malformed.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        if after is not None and (after[0] is None) != (sort == "newest"):
+            raise InvalidCursorError("Cursor does not match the requested sort")
+
+        if not _can_view_reviews(await _resolve_user(user)):
+            page = ReviewPageResponse()
+        else:
+            page = await self._load_review_page(course_id, sort=sort, limit=limit, after=after)
+
+        # An empty first page is the only case where the course may not exist
+        if not page.items and after is None:
+            if not await self.course_repo.get_by_id(course_id):
+                return None
+
+        return page
+
+    async def _load_review_page(
+        self,
+        course_id: int,
+        sort: str = "newest",
+        limit: int = PaginationDefaults.REVIEW_PAGE_DEFAULT_LIMIT,
+        after: tuple | None = None,
+    ) -> ReviewPageResponse:
+        reviews = await self.review_repo.get_page_by_course_id(
+            course_id, sort=sort, limit=limit + 1, after=after
         )
+        return _to_review_page(reviews, limit, sort)
@@ -0,0 +1,238 @@
+"""
+Dependency health behind the readiness probe.
+
+A background task per process checks Postgres and Redis latency, DB pool
+saturation and whether the in-process caches are warm every
+`HealthConstants.CHECK_INTERVAL_SECONDS`, and keeps the last report.
+`GET /health/ready` only reads that report, so load balancer probes never
+add DB load, however often they come. Any check that is down (or a report
+gone stale because the checker stopped running) fails readiness, so a
+degraded node sheds traffic before requests start timing out on it.
+Liveness (`GET /health/live`) checks none of this: restarting a worker
+doesn't fix a database outage.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from typing import Any, Protocol
+
+from prometheus_client import Gauge
+
+from app.constants import HealthConstants, HealthStatus
+from app.db.database import ping_database, pool_stats
+from app.db.redis import get_redis, is_redis_configured
+from app.services.catalog_index import course_catalog
+from app.services.tag_registry import tag_registry
+
+logger = logging.getLogger(__name__)
+
+# Across workers: down if any worker's check is down, and the slowest ping
+health_check_up = Gauge(
+    "health_check_up",
+    "1 unless the readiness check is down.",
+    ("check",),
+    multiprocess_mode="livemin",
+)
+health_check_latency = Gauge(
+    "health_check_latency_seconds",
+    "Latency of the last dependency ping.",
+    ("check",),
+    multiprocess_mode="livemax",
+)
+
+
+@dataclass
+class CheckResult:
+    status: HealthStatus
+    latency_ms: float | None = None
+    error: str | None = None
+    detail: dict = field(default_factory=dict)
+
+
+@dataclass
+class HealthReport:
+    status: HealthStatus
+    checks: dict[str, CheckResult]
+    checked_at: datetime
+    checked_at_monotonic: float
+
+
+def _worst(statuses) -> HealthStatus:
+    statuses = set(statuses)
+    for status in (HealthStatus.DOWN, HealthStatus.DEGRADED):
+        if status in statuses:
+            return status
+    return HealthStatus.OK
+
+
+def _latency_status(latency_ms: float, slow_ms: float) -> HealthStatus:
+    return HealthStatus.DEGRADED if latency_ms > slow_ms else HealthStatus.OK
+
+
+class RedisClient(Protocol):
+    """What the Redis check needs of a client (`ping()` is awaited)."""
+
+    def ping(self) -> Any: ...
+
+
+class HealthChecker:
+    def __init__(
+        self,
+        ping_db: Callable[[], Awaitable[None]] = ping_database,
+        redis_factory: Callable[[], Awaitable[RedisClient | None]] = get_redis,
+        redis_configured: Callable[[], bool] = is_redis_configured,
+        pool_stats: Callable[[], dict[str, int] | None] = pool_stats,
+        warm_caches: dict[str, Callable[[], bool]] | None = None,
+        interval: float = HealthConstants.CHECK_INTERVAL_SECONDS,
+        timeout: float = HealthConstants.CHECK_TIMEOUT_SECONDS,
+    ):
+        self._ping_db = ping_db
+        self._redis_factory = redis_factory
+        self._redis_configured = redis_configured
+        self._pool_stats = pool_stats
+        self._warm_caches = warm_caches or {
+            "course_catalog": lambda: course_catalog.is_loaded,
+            "tag_registry": lambda: tag_registry.is_loaded,
+        }
+        self._interval = interval
+        self._timeout = timeout
+        self._report: HealthReport | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Health check round failed")
+            await asyncio.sleep(self._interval)
+
+    async def _timed(self, ping: Callable[[], Awaitable[object]]) -> tuple[float, str | None]:
+        """Milliseconds `ping` took, and the error if it failed or timed out."""
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(ping(), self._timeout)
+            error = None
+        except TimeoutError:
+            error = f"timed out after {self._timeout:g} s"
+        except Exception as exc:
+            # The class name only: messages may carry connection strings
+            error = type(exc).__name__
+        return round((time.perf_counter() - started) * 1000, 2), error
+
+    async def _check_database(self) -> CheckResult:
+        latency_ms, error = await self._timed(self._ping_db)
+        if error is not None:
+            return CheckResult(HealthStatus.DOWN, latency_ms, error)
+        return CheckResult(_latency_status(latency_ms, HealthConstants.DB_SLOW_MS), latency_ms)
+
+    async def _check_redis(self) -> CheckResult:
+        if not self._redis_configured():
+            return CheckResult(HealthStatus.OK, detail={"backend": "memory"})
+        client: RedisClient | None = None
+
+        async def ping() -> None:
+            nonlocal client
+            client = await self._redis_factory()
+            if client is not None:
+                await client.ping()
+
+        latency_ms, error = await self._timed(ping)
+        if error is not None:
+            return CheckResult(HealthStatus.DOWN, latency_ms, error)
+        if client is None:
+            # Connecting failed at startup: this worker runs on its own
+            # in-memory cache and rate limits, which works but isn't shared
+            return CheckResult(
+                HealthStatus.DEGRADED, error="unreachable at startup", detail={"backend": "memory"}
+            )
+        return CheckResult(
+            _latency_status(latency_ms, HealthConstants.REDIS_SLOW_MS),
+            latency_ms,
+            detail={"backend": "redis"},
+        )
+
+    def _check_pool(self) -> CheckResult:
+        stats = self._pool_stats()
+        capacity = stats["size"] + stats["max_overflow"] if stats else 0
+        if stats is None or stats["max_overflow"] < 0 or capacity <= 0:
+            return CheckResult(HealthStatus.OK, detail=stats or {})
+        saturation = stats["checked_out"] / capacity
+        if saturation >= HealthConstants.POOL_DOWN_SATURATION:
+            status = HealthStatus.DOWN
+        elif saturation >= HealthConstants.POOL_DEGRADED_SATURATION:
+            status = HealthStatus.DEGRADED
+        else:
+            status = HealthStatus.OK
+        return CheckResult(status, detail={**stats, "saturation": round(saturation, 3)})
+
+    def _check_caches(self) -> CheckResult:
+        warm = {name: is_warm() for name, is_warm in self._warm_caches.items()}
+        # A cold cache falls back to Postgres: slower, not broken
+        status = HealthStatus.OK if all(warm.values()) else HealthStatus.DEGRADED
+        return CheckResult(status, detail=warm)
+
+    async def check(self) -> HealthReport:
+        """Run every check now and keep the result as the current report."""
+        database, redis = await asyncio.gather(self._check_database(), self._check_redis())
+        checks = {
+            "database": database,
+            "redis": redis,
+            "db_pool": self._check_pool(),
+            "caches": self._check_caches(),
+        }
+        previous = self._report.checks if self._report is not None else {}
+        for name, result in checks.items():
+            health_check_up.labels(name).set(result.status != HealthStatus.DOWN)
+            if result.latency_ms is not None:
+                health_check_latency.labels(name).set(result.latency_ms / 1000)
+            before = previous.get(name)
+            if result.status != (before.status if before else HealthStatus.OK):
+                # Transitions only; a check stays degraded for a while
+                logger.warning("Health check %s is %s (%s)", name, result.status, result.error)
+
+        self._report = HealthReport(
+            status=_worst(result.status for result in checks.values()),
+            checks=checks,
+            checked_at=datetime.now(UTC),
+            checked_at_monotonic=time.monotonic(),
+        )
+        return self._report
+
+    def readiness(self) -> tuple[bool, dict]:
+        """Whether to take traffic, and the last report (never runs a check)."""
+        report = self._report
+        if report is None:
+            return False, {"status": HealthStatus.DOWN, "reason": "no health check has run yet"}
+
+        age = time.monotonic() - report.checked_at_monotonic
+        body = {
+            "status": report.status,
+            "checked_at": report.checked_at.isoformat(),
+            "age_seconds": round(age, 1),
+            "checks": {name: asdict(result) for name, result in report.checks.items()},
+        }
+        if age > self._interval * HealthConstants.STALE_AFTER_INTERVALS:
+            body["status"] = HealthStatus.DOWN
+            body["reason"] = "health checks are not running"
+        return body["status"] != HealthStatus.DOWN, body
+
+
+health_checker = HealthChecker()
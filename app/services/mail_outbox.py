@@ -0,0 +1,205 @@
+"""
+Transactional email outbox.
+
+`enqueue` writes the email into the `email_outbox` table inside the caller's
+transaction, so a signup and its verification email commit (or roll back)
+together and the request never waits on the mail provider. A background
+worker per process drains the table:
+
+- claims due rows in batches with SKIP LOCKED and a lease, so several app
+  processes can run workers without double-sending; the lease is renewed
+  while the batch is in flight, and a crashed worker's claims become due
+  again once it expires
+- sends through one long-lived transport (pooled HTTP client / SMTP
+  connection), paced to `MAIL_SEND_RATE_PER_SECOND` and pausing when the
+  provider answers 429
+- retries transient failures with exponential backoff and gives up after
+  `MailConstants.MAX_ATTEMPTS`
+
+Committed enqueues wake the worker immediately; otherwise it polls every
+`MailConstants.POLL_INTERVAL_SECONDS`.
+"""
+
+import asyncio
+import logging
+import random
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.constants import MailConstants
+from app.db.database import AsyncSessionLocal, run_after_commit
+from app.models import OutboxEmail
+from app.repositories import EmailOutboxRepository
+from app.services.mailer import MailMessage, MailSendError, MailTransport, build_transport
+
+logger = logging.getLogger(__name__)
+
+
+class SendPacer:
+    """Spaces sends `1 / rate` seconds apart; `pause` pushes the next slot out."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def wait(self) -> None:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def pause(self, seconds: float) -> None:
+        now = asyncio.get_running_loop().time()
+        self._next_slot = max(self._next_slot, now + seconds)
+
+
+def retry_delay(attempts: int) -> float:
+    """Backoff before retry number `attempts` (1-based), with jitter."""
+    base = MailConstants.RETRY_BASE_SECONDS
+    delay = min(MailConstants.RETRY_MAX_SECONDS, base * 2 ** (attempts - 1))
+    return delay + random.uniform(0, base)
+
+
+class MailOutbox:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        transport_factory: Callable[[], MailTransport] = build_transport,
+        rate: float = settings.mail_send_rate_per_second,
+    ):
+        self._session_factory = session_factory
+        self._transport_factory = transport_factory
+        self._transport: MailTransport | None = None
+        self._pacer = SendPacer(rate)
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def enqueue(self, db: AsyncSession, to_email: str, subject: str, html_body: str) -> None:
+        """Queue an email in `db`'s transaction; it is sent after the commit."""
+        await EmailOutboxRepository(db).create(
+            to_email=to_email, subject=subject, html_body=html_body
+        )
+        run_after_commit(db, self.wake)
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._transport is not None:
+            await self._transport.close()
+            self._transport = None
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("Email outbox worker round failed")
+                processed = 0
+            if processed < MailConstants.BATCH_SIZE:
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), MailConstants.POLL_INTERVAL_SECONDS
+                    )
+                except TimeoutError:
+                    pass
+
+    async def run_once(self) -> int:
+        """Claim and deliver one batch of due emails. Returns the batch size."""
+        async with self._session_factory() as db:
+            batch = await EmailOutboxRepository(db).claim_due(
+                MailConstants.BATCH_SIZE, MailConstants.CLAIM_LEASE_SECONDS
+            )
+            await db.commit()
+        if not batch:
+            return 0
+
+        if self._transport is None:
+            self._transport = self._transport_factory()
+        transport = self._transport
+        # Pacing and provider pauses can outlast the lease; keep it alive
+        # until the results are recorded, or another worker re-sends them
+        heartbeat = asyncio.get_running_loop().create_task(self._renew_lease(batch))
+        try:
+            errors = await asyncio.gather(*(self._deliver(transport, email) for email in batch))
+        finally:
+            heartbeat.cancel()
+            try:
+                await heartbeat
+            except asyncio.CancelledError:
+                pass
+
+        async with self._session_factory() as db:
+            repo = EmailOutboxRepository(db)
+            await repo.mark_sent([email.id for email, error in zip(batch, errors) if error is None])
+            for email, error in zip(batch, errors):
+                if error is not None:
+                    await self._record_failure(repo, email, error)
+            await db.commit()
+        return len(batch)
+
+    async def _renew_lease(self, batch: list[OutboxEmail]) -> None:
+        claims = [(email.id, email.attempts) for email in batch]
+        while True:
+            await asyncio.sleep(MailConstants.LEASE_RENEW_INTERVAL_SECONDS)
+            try:
+                async with self._session_factory() as db:
+                    await EmailOutboxRepository(db).extend_lease(
+                        claims, MailConstants.CLAIM_LEASE_SECONDS
+                    )
+                    await db.commit()
+            except Exception:
+                logger.exception("Could not extend the outbox lease of %d emails", len(claims))
+
+    async def _deliver(self, transport: MailTransport, email: OutboxEmail) -> MailSendError | None:
+        await self._pacer.wait()
+        try:
+            await transport.send(
+                MailMessage(email.to_email, email.subject, email.html_body)
+            )
+        except MailSendError as e:
+            if e.retry_after is not None:
+                self._pacer.pause(min(e.retry_after, MailConstants.MAX_PROVIDER_PAUSE_SECONDS))
+            return e
+        except Exception as e:
+            logger.exception("Unexpected error sending outbox email %s", email.id)
+            return MailSendError(repr(e))
+        return None
+
+    async def _record_failure(
+        self, repo: EmailOutboxRepository, email: OutboxEmail, error: MailSendError
+    ) -> None:
+        if error.permanent or email.attempts >= MailConstants.MAX_ATTEMPTS:
+            logger.error(
+                "Giving up on email %s to %s after %d attempt(s): %s",
+                email.id, email.to_email, email.attempts, error,
+            )
+            await repo.mark_failed(email.id, str(error))
+            return
+
+        delay = max(retry_delay(email.attempts), error.retry_after or 0)
+        logger.warning(
+            "Email %s to %s failed (attempt %d), retrying in %.0fs: %s",
+            email.id, email.to_email, email.attempts, delay, error,
+        )
+        await repo.reschedule(email.id, datetime.now(UTC) + timedelta(seconds=delay), str(error))
+
+
+mail_outbox = MailOutbox()
@@ -1,45 +1,59 @@
 """
-Email sending service using SendGrid.
+Email rendering and delivery transports.
 
-Sends verification emails to users during signup.
-If SENDGRID_API_KEY is not configured, emails are logged but not sent.
+Request handlers never send mail directly: they queue it in the outbox
+(services/mail_outbox.py) and the outbox worker delivers it through one of
+the transports below, chosen from settings:
+
+- `SmtpTransport` when SMTP_HOST is set (a local fake mail server in dev/tests)
+- `SendGridTransport` when SENDGRID_API_KEY is set, over one pooled HTTP client
+- `LogTransport` otherwise: the message is logged, not sent
 """
 
+import asyncio
 import logging
+import smtplib
+import threading
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import Protocol
 
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
+import httpx
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 
-def send_verification_email(to_email: str, verify_url: str) -> bool:
-    """
-    Send a verification email to the specified email address.
+@dataclass(frozen=True)
+class MailMessage:
+    to_email: str
+    subject: str
+    html_body: str
 
-    Returns True if sent successfully, False if SendGrid is not configured.
-    Raises exception if SendGrid is configured but sending fails.
+
+class MailSendError(Exception):
     """
-    if not settings.sendgrid_api_key:
-        logger.warning(
-            "SendGrid not configured. Verification email not sent to %s. "
-            "Verify URL: %s",
-            to_email,
-            verify_url,
-        )
-        return False
+    Delivery failed. `permanent` errors are not retried; `retry_after` is the
+    provider's request to pause all sending for that many seconds.
+    """
+
+    def __init__(self, message: str, permanent: bool = False, retry_after: float | None = None):
+        super().__init__(message)
+        self.permanent = permanent
+        self.retry_after = retry_after
+
 
-    if not settings.from_email:
-        logger.error("FROM_EMAIL not configured. Cannot send verification email.")
-        return False
+class MailTransport(Protocol):
+    async def send(self, message: MailMessage) -> None: ...
 
-    message = Mail(
-        from_email=settings.from_email,
-        to_emails=to_email,
-        subject="[방통대 꿀과목] 이메일 인증",
-        html_content=f"""
+    async def close(self) -> None: ...
+
+
+def render_verification_email(verify_url: str) -> tuple[str, str]:
+    """Subject and HTML body of the signup verification email."""
+    subject = "[방통대 꿀과목] 이메일 인증"
+    html_body = f"""
         <div style="font-family: sans-serif; max-width: 600px; margin: 0 auto;">
             <h2>방통대 꿀과목 DB</h2>
             <p>안녕하세요! 가입해 주셔서 감사합니다.</p>
@@ -60,19 +74,142 @@ def send_verification_email(to_email: str, verify_url: str) -> bool:
                 본 메일은 방통대 꿀과목 DB 서비스에서 발송되었습니다.
             </p>
         </div>
-        """,
-    )
+        """
+    return subject, html_body
 
-    sg = SendGridAPIClient(settings.sendgrid_api_key)
-    response = sg.send(message)
 
-    if response.status_code >= 400:
-        logger.error(
-            "SendGrid returned error status %d for %s",
-            response.status_code,
-            to_email,
+class SendGridTransport:
+    API_URL = "https://api.sendgrid.com/v3/mail/send"
+
+    def __init__(self, api_key: str, from_email: str, client: httpx.AsyncClient | None = None):
+        self._from_email = from_email
+        # One client for the worker's lifetime: connections are kept alive
+        # across messages instead of a TLS handshake per email
+        self._client = client or httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
         )
-        raise Exception(f"SendGrid error: {response.status_code}")
 
-    logger.info("Verification email sent to %s", to_email)
-    return True
+    async def send(self, message: MailMessage) -> None:
+        payload = {
+            "personalizations": [{"to": [{"email": message.to_email}]}],
+            "from": {"email": self._from_email},
+            "subject": message.subject,
+            "content": [{"type": "text/html", "value": message.html_body}],
+        }
+        try:
+            response = await self._client.post(self.API_URL, json=payload)
+        except httpx.HTTPError as e:
+            raise MailSendError(f"SendGrid request failed: {e!r}") from e
+
+        if response.status_code < 400:
+            return
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After")
+            raise MailSendError(
+                "SendGrid rate limit",
+                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else 1.0,
+            )
+        if response.status_code in (401, 403):
+            # A revoked key or unverified sender fails every email until an
+            # operator fixes it; keep them queued instead of dropping them
+            logger.critical(
+                "SendGrid rejected the API key or sender (%d): %s. "
+                "Check SENDGRID_API_KEY and FROM_EMAIL; emails stay queued for retry.",
+                response.status_code,
+                response.text,
+            )
+            raise MailSendError(f"SendGrid auth error: {response.status_code}")
+        if response.status_code >= 500:
+            raise MailSendError(f"SendGrid error: {response.status_code}")
+        # Anything else is about this message (bad address, payload): retrying won't help
+        raise MailSendError(f"SendGrid error: {response.status_code}", permanent=True)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class SmtpTransport:
+    """Plain SMTP over one reused connection (smtplib, run in a thread)."""
+
+    def __init__(self, host: str, port: int, from_email: str):
+        self._host = host
+        self._port = port
+        self._from_email = from_email
+        self._smtp: smtplib.SMTP | None = None
+        self._lock = threading.Lock()
+
+    def _send_sync(self, message: MailMessage) -> None:
+        email = EmailMessage()
+        email["From"] = self._from_email
+        email["To"] = message.to_email
+        email["Subject"] = message.subject
+        email.set_content(message.html_body, subtype="html")
+
+        with self._lock:
+            for attempt in range(2):
+                if self._smtp is None:
+                    self._smtp = smtplib.SMTP(self._host, self._port, timeout=10)
+                try:
+                    self._smtp.send_message(email)
+                    return
+                except smtplib.SMTPServerDisconnected:
+                    # Idle connection dropped by the server: reconnect once
+                    self._smtp = None
+                    if attempt:
+                        raise
+
+    async def send(self, message: MailMessage) -> None:
+        try:
+            await asyncio.to_thread(self._send_sync, message)
+        except smtplib.SMTPResponseException as e:
+            raise MailSendError(
+                f"SMTP {e.smtp_code}: {e.smtp_error!r}", permanent=e.smtp_code >= 500
+            ) from e
+        except smtplib.SMTPRecipientsRefused as e:
+            codes = [code for code, _ in e.recipients.values()]
+            raise MailSendError(
+                f"SMTP recipient refused: {e.recipients}", permanent=min(codes) >= 500
+            ) from e
+        except (smtplib.SMTPException, OSError) as e:
+            raise MailSendError(f"SMTP connection failed: {e!r}") from e
+
+    def _close_sync(self) -> None:
+        with self._lock:
+            if self._smtp is not None:
+                try:
+                    self._smtp.quit()
+                except (smtplib.SMTPException, OSError):
+                    pass
+                self._smtp = None
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._close_sync)
+
+
+class LogTransport:
+    async def send(self, message: MailMessage) -> None:
+        logger.warning(
+            "No mail transport configured (SMTP_HOST/SENDGRID_API_KEY). "
+            "Email '%s' to %s not sent:\n%s",
+            message.subject,
+            message.to_email,
+            message.html_body,
+        )
+
+    async def close(self) -> None:
+        pass
+
+
+def build_transport() -> MailTransport:
+    if settings.smtp_host:
+        return SmtpTransport(
+            settings.smtp_host, settings.smtp_port, settings.from_email or "no-reply@localhost"
+        )
+    if settings.sendgrid_api_key:
+        if not settings.from_email:
+            logger.error("FROM_EMAIL not configured. Emails will only be logged.")
+            return LogTransport()
+        return SendGridTransport(settings.sendgrid_api_key, settings.from_email)
+    return LogTransport()
@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.compression import PrecompressedBody
 from app.repositories import MajorRepository
 from app.schemas import MajorResponse
 from app.services.cache import RedisCache
@@ -10,9 +11,10 @@ class MajorService:
         self.repo = MajorRepository(db)
         self.cache = cache
 
-    async def get_all(self) -> list[dict]:
-        return await self.cache.get_or_set_json(
-            key="majors:all:v1",
+    async def get_all_body(self) -> PrecompressedBody:
+        """The encoded (and precompressed) `GET /majors` response body."""
+        return await self.cache.get_or_set_body(
+            key="majors:all:v2",
             ttl=3600,
             loader=self._load_majors,
         )
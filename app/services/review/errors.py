@@ -16,3 +16,7 @@ class TagNotFoundError(ReviewServiceError):
 
 class DuplicateReviewError(ReviewServiceError):
     pass
+
+
+class ReviewNotFoundError(ReviewServiceError):
+    pass
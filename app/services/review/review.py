@@ -1,65 +1,90 @@
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.profanity_filter import ProfanityFilter
-from app.models import User
-from app.repositories import CourseRepository, ReviewRepository, TagRepository, UserRepository
+from app.core.timing import span
+from app.repositories import CourseRepository, ReviewRepository, UserRepository
 from app.schemas import ReviewCreate, ReviewResponse
+from app.services.auth.principal import PrincipalCache, UserPrincipal, user_principals
+from app.services.catalog_index import CourseCatalogIndex, course_catalog
 from app.services.review.errors import (
     CourseNotFoundError,
     DuplicateReviewError,
     InvalidReviewTextError,
+    ReviewNotFoundError,
     TagNotFoundError,
 )
+from app.services.tag_registry import TagRegistry, tag_registry
+
+FOREIGN_KEY_VIOLATION = "23503"
 
 
 class ReviewService:
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        tags: TagRegistry = tag_registry,
+        catalog: CourseCatalogIndex = course_catalog,
+        principals: PrincipalCache = user_principals,
+    ):
+        self.db = db
         self.review_repo = ReviewRepository(db)
         self.course_repo = CourseRepository(db)
-        self.tag_repo = TagRepository(db)
+        self.tags = tags
+        self.catalog = catalog
+        self.principals = principals
         self.user_repo = UserRepository(db)
         self.profanity_filter = ProfanityFilter()
 
     async def create_review(
-        self, course_id: int, user: User, data: ReviewCreate
+        self, course_id: int, user: UserPrincipal, data: ReviewCreate
     ) -> ReviewResponse:
-        result = self.profanity_filter.check(data.text)
+        with span("profanity"):
+            result = self.profanity_filter.check(data.text)
         if result.has_profanity:
             raise InvalidReviewTextError("Review text contains inappropriate language")
-        course = await self.course_repo.get_by_id(course_id)
 
-        if not course:
-            raise CourseNotFoundError("Course not found")
+        tag_ids = list(dict.fromkeys(data.tag_ids))
+        tags = self.tags.get_many(tag_ids)
+        if tags is None:
+            raise TagNotFoundError("One or more tags not found")
 
-        existing = await self.review_repo.get_by_user_and_course(user.id, course_id)
+        # Course existence and duplicates are enforced by the FK and
+        # uq_reviews_user_course instead of separate pre-check queries
+        try:
+            review = await self.review_repo.insert_if_absent(
+                course_id=course_id,
+                user_id=user.id,
+                rating_overall=data.rating_overall,
+                difficulty=data.difficulty,
+                workload=data.workload,
+                text=data.text,
+            )
+        except IntegrityError as e:
+            if getattr(e.orig, "sqlstate", None) == FOREIGN_KEY_VIOLATION:
+                raise CourseNotFoundError("Course not found") from e
+            raise
 
-        if existing:
+        if review is None:
             raise DuplicateReviewError("You have already reviewed this course")
 
-        if data.tag_ids:
-            tags = await self.tag_repo.get_by_ids(data.tag_ids)
-            if len(tags) != len(data.tag_ids):
-                raise TagNotFoundError("One or more tags not found")
-
-        review = await self.review_repo.create(
-            course_id=course_id,
-            user_id=user.id,
-            rating_overall=data.rating_overall,
-            difficulty=data.difficulty,
-            workload=data.workload,
-            text=data.text,
-        )
+        await self.user_repo.increment_review_count(user.id)
+        # review_count gates full access, so the next request must see it
+        self.principals.invalidate_after_commit(self.db, user.id)
 
-        await self.user_repo.update(user, review_count=user.review_count + 1)
+        if tag_ids:
+            await self.review_repo.add_tags(review.id, tag_ids)
+            await self.course_repo.adjust_tag_counts(course_id, tag_ids, 1)
+        await self.course_repo.refresh_review_aggregates(course_id)
 
-        if data.tag_ids:
-            await self.review_repo.add_tags(review.id, data.tag_ids)
-            tags_data = [
-                {"id": t.id, "name": t.name, "type": t.type}
-                for t in await self.tag_repo.get_by_ids(data.tag_ids)
-            ]
-        else:
-            tags_data = []
+        self.catalog.record_review(
+            self.db,
+            course_id,
+            review.rating_overall,
+            review.difficulty,
+            review.workload,
+            review.created_at,
+        )
 
         return ReviewResponse(
             id=review.id,
@@ -69,5 +94,27 @@ class ReviewService:
             workload=review.workload,
             text=review.text,
             created_at=review.created_at,
-            tags=tags_data,
+            tags=tags,
+        )
+
+    async def hide_review(self, review_id: int) -> None:
+        """Hide a review and remove its tags from the course's eval counters."""
+        review = await self.review_repo.hide(review_id)
+        if review is None:
+            # Already hidden (possibly by a concurrent call) or missing
+            if not await self.review_repo.get_by_id(review_id):
+                raise ReviewNotFoundError("Review not found")
+            return
+
+        tag_ids = await self.review_repo.get_tag_ids(review_id)
+        await self.course_repo.adjust_tag_counts(review.course_id, tag_ids, -1)
+        await self.course_repo.refresh_review_aggregates(review.course_id)
+
+        self.catalog.record_review(
+            self.db,
+            review.course_id,
+            review.rating_overall,
+            review.difficulty,
+            review.workload,
+            delta=-1,
         )
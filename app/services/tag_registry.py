@@ -0,0 +1,99 @@
+"""
+Process-wide in-memory copy of the tag catalog.
+
+The tag table is tiny and almost never changes, so every worker keeps it in
+memory and serves tag lookups without touching the DB. Whoever changes the
+tags calls `publish_version()`; workers compare the shared version key at most
+once per `CacheTTL.TAG_VERSION_CHECK` and reload when it differs.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants import CacheKeys, CacheTTL
+from app.db.database import AsyncSessionLocal
+from app.schemas import TagResponse
+from app.services.cache import CacheBackend
+from app.services.tag import TagService
+
+logger = logging.getLogger(__name__)
+
+
+class TagRegistry:
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] | None = None,
+        check_interval: float = CacheTTL.TAG_VERSION_CHECK,
+    ):
+        self._session_factory = session_factory or AsyncSessionLocal
+        self._check_interval = check_interval
+        self._by_id: dict[int, TagResponse] = {}
+        self._ordered: list[TagResponse] = []
+        self._version: str | None = None
+        self._loaded = False
+        self._last_check = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    async def ensure_fresh(self, cache: CacheBackend | None = None) -> None:
+        """Load on first use, then reload when the shared catalog version changes."""
+        if not self._loaded:
+            version = await self._read_version(cache)
+            await self.reload(version)
+            return
+
+        if cache is None or time.monotonic() - self._last_check < self._check_interval:
+            return
+
+        self._last_check = time.monotonic()
+        version = await self._read_version(cache)
+        if version != self._version:
+            logger.info("Tag catalog version changed (%s -> %s)", self._version, version)
+            await self.reload(version)
+
+    async def reload(self, version: str | None = None) -> None:
+        async with self._lock:
+            async with self._session_factory() as db:
+                tags = await TagService(db).get_all()
+
+            self._ordered = [TagResponse.model_validate(t) for t in tags]
+            self._by_id = {t.id: t for t in self._ordered}
+            self._version = version
+            self._loaded = True
+            self._last_check = time.monotonic()
+
+    def all(self) -> list[TagResponse]:
+        return list(self._ordered)
+
+    def get_many(self, tag_ids: list[int]) -> list[TagResponse] | None:
+        """Tags for the given ids in request order, or None if any id is unknown."""
+        try:
+            return [self._by_id[tag_id] for tag_id in tag_ids]
+        except KeyError:
+            return None
+
+    async def publish_version(self, cache: CacheBackend) -> str:
+        """Mark the tag catalog as changed so every worker reloads it."""
+        version = uuid.uuid4().hex
+        await cache.set(CacheKeys.TAG_CATALOG_VERSION, version)
+        return version
+
+    async def _read_version(self, cache: CacheBackend | None) -> str | None:
+        if cache is None:
+            return None
+        try:
+            return await cache.get(CacheKeys.TAG_CATALOG_VERSION)
+        except Exception:
+            logger.warning("Could not read tag catalog version", exc_info=True)
+            return self._version
+
+
+tag_registry = TagRegistry()
@@ -2,22 +2,32 @@ from app.utils.auth import (
                             CurrentUser,
                             CurrentUserWithFullAccess,
                             InsufficientReviewsError,
+                            LazyCurrentUser,
+                            LazyUser,
                             OptionalCurrentUser,
                             create_access_token,
                             decode_access_token,
                             get_current_user,
                             get_current_user_with_full_access,
+                            get_lazy_current_user,
                             get_optional_current_user,
 )
+from app.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
 
 __all__ = [
     "CurrentUser",
     "CurrentUserWithFullAccess",
     "InsufficientReviewsError",
+    "InvalidCursorError",
+    "LazyCurrentUser",
+    "LazyUser",
     "OptionalCurrentUser",
     "create_access_token",
     "decode_access_token",
+    "decode_cursor",
+    "encode_cursor",
     "get_current_user",
     "get_current_user_with_full_access",
+    "get_lazy_current_user",
     "get_optional_current_user",
 ]
@@ -7,9 +7,10 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.core.timing import timed
 from app.db import get_db
-from app.models import User
-from app.repositories import UserRepository
+from app.services.auth.principal import UserPrincipal, user_principals
+from app.services.auth.token_cache import verified_tokens
 
 security = HTTPBearer()
 optional_security = HTTPBearer(auto_error=False)
@@ -29,19 +30,29 @@ def create_access_token(user_id: int) -> str:
 
 
 def decode_access_token(token: str) -> int | None:
+    signing_key = (settings.jwt_secret_key, settings.jwt_algorithm)
+    user_id = verified_tokens.get(token, signing_key)
+    if user_id is not None:
+        return user_id
+
     try:
         payload = jwt.decode(
             token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm]
         )
-        return int(payload.get("sub"))
     except jwt.PyJWTError:
         return None
 
+    user_id = int(payload.get("sub"))
+    if "exp" in payload:
+        verified_tokens.put(token, signing_key, user_id, payload["exp"])
+    return user_id
+
 
+@timed("auth")
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
+) -> UserPrincipal:
     token = credentials.credentials
     user_id = decode_access_token(token)
 
@@ -51,10 +62,9 @@ async def get_current_user(
             detail="Invalid or expired token",
         )
 
-    user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(user_id)
+    user = await user_principals.get_or_load(db, user_id)
 
-    if user is None:
+    if user is None or user.is_deleted:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
@@ -69,14 +79,13 @@ async def get_current_user(
     return user
 
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[UserPrincipal, Depends(get_current_user)]
 
 
-async def get_optional_current_user(
-    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(optional_security)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> User | None:
-    """Get current user if authenticated, otherwise return None."""
+@timed("auth")
+async def _resolve_optional_user(
+    credentials: HTTPAuthorizationCredentials | None, db: AsyncSession
+) -> UserPrincipal | None:
     if credentials is None:
         return None
 
@@ -86,16 +95,53 @@ async def get_optional_current_user(
     if user_id is None:
         return None
 
-    user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(user_id)
+    user = await user_principals.get_or_load(db, user_id)
 
-    if user is None or not user.is_verified:
+    if user is None or user.is_deleted or not user.is_verified:
         return None
 
     return user
 
 
-OptionalCurrentUser = Annotated[User | None, Depends(get_optional_current_user)]
+async def get_optional_current_user(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(optional_security)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> UserPrincipal | None:
+    """Get current user if authenticated, otherwise return None."""
+    return await _resolve_optional_user(credentials, db)
+
+
+OptionalCurrentUser = Annotated[UserPrincipal | None, Depends(get_optional_current_user)]
+
+
+class LazyUser:
+    """
+    Optional current user, resolved only when `get()` is awaited.
+    Handlers that may not need the user (e.g. 404s, public data) skip the
+    token decode and principal lookup entirely. The result is memoized.
+    """
+
+    def __init__(self, credentials: HTTPAuthorizationCredentials | None, db: AsyncSession):
+        self._credentials = credentials
+        self._db = db
+        self._resolved = False
+        self._user: UserPrincipal | None = None
+
+    async def get(self) -> UserPrincipal | None:
+        if not self._resolved:
+            self._user = await _resolve_optional_user(self._credentials, self._db)
+            self._resolved = True
+        return self._user
+
+
+def get_lazy_current_user(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(optional_security)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> LazyUser:
+    return LazyUser(credentials, db)
+
+
+LazyCurrentUser = Annotated[LazyUser, Depends(get_lazy_current_user)]
 
 
 class InsufficientReviewsError(Exception):
@@ -107,7 +153,7 @@ class InsufficientReviewsError(Exception):
 async def get_current_user_with_full_access(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
+) -> UserPrincipal:
     """Get current user and verify they have full access (3+ reviews)."""
     user = await get_current_user(credentials, db)
     if not user.has_full_access:
@@ -118,4 +164,4 @@ async def get_current_user_with_full_access(
     return user
 
 
-CurrentUserWithFullAccess = Annotated[User, Depends(get_current_user_with_full_access)]
+CurrentUserWithFullAccess = Annotated[UserPrincipal, Depends(get_current_user_with_full_access)]
@@ -0,0 +1,40 @@
+"""
+Opaque keyset cursors for paginated listings.
+
+A cursor carries the sort key values of the last row on a page, so the next
+page can continue with a `WHERE (key, ...) < (...)` seek instead of OFFSET.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    pass
+
+
+def encode_cursor(sort_value: int | None, created_at: datetime, review_id: int) -> str:
+    payload = json.dumps([sort_value, created_at.isoformat(), review_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _is_int(value: object) -> bool:
+    # bool is an int subclass, but never a valid sort key
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def decode_cursor(cursor: str) -> tuple[int | None, datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, created_at, review_id = json.loads(base64.urlsafe_b64decode(padded))
+        created = datetime.fromisoformat(created_at)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+    # Values end up as bind parameters of the seek: a wrong type would be a
+    # database error (500) rather than a bad request
+    if (sort_value is not None and not _is_int(sort_value)) or not _is_int(review_id):
+        raise InvalidCursorError("Invalid pagination cursor")
+    return sort_value, created, review_id
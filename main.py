@@ -4,16 +4,27 @@ from contextlib import asynccontextmanager
 import sentry_sdk
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_PLAIN_0_0_4
 
 from app.api import api_router
 from app.config import settings
-from app.core.middleware import SecurityHeadersMiddleware
-from app.core.rate_limit import limiter
+from app.core.metrics import loop_lag_monitor, metrics
+from app.core.middleware import (
+    CompressionMiddleware,
+    MetricsMiddleware,
+    SecurityHeadersMiddleware,
+    ServerTimingMiddleware,
+)
+from app.core.password_hasher import password_hasher
 from app.db import engine
 from app.db.redis import close_redis
+from app.deps.cache import get_cache_backend
 from app.models import Base
+from app.services.catalog_index import course_catalog
+from app.services.health import health_checker
+from app.services.mail_outbox import mail_outbox
+from app.services.tag_registry import tag_registry
 
 logger = logging.getLogger(__name__)
 
@@ -34,9 +45,29 @@ async def lifespan(app: FastAPI):
     if settings.debug:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+    try:
+        await tag_registry.ensure_fresh(await get_cache_backend())
+    except Exception:
+        # Not fatal: the registry loads lazily on first use
+        logger.exception("Failed to preload tag catalog")
+    try:
+        await course_catalog.ensure_fresh()
+    except Exception:
+        # Not fatal: GET /courses falls back to Postgres until it loads
+        logger.exception("Failed to preload course catalog index")
+    await password_hasher.calibrate(settings.password_hash_target_ms / 1000)
+    mail_outbox.start()
+    loop_lag_monitor.start()
+    metrics.start()
+    health_checker.start()
     yield
     # Cleanup
+    await health_checker.stop()
+    await metrics.stop()
+    await loop_lag_monitor.stop()
+    await mail_outbox.stop()
     await close_redis()
+    password_hasher.shutdown()
 
 
 app = FastAPI(
@@ -67,14 +98,12 @@ KNOU 학생들이 수강신청 시 **꿀과목**을 빠르게 찾을 수 있도
         {"name": "courses", "description": "과목 조회 및 검색"},
         {"name": "reviews", "description": "후기 작성 (인증 필요)"},
         {"name": "tags", "description": "태그 목록 조회"},
+        {"name": "admin", "description": "운영자 전용 (ADMIN_TOKEN 필요)"},
     ],
     docs_url="/docs",
     redoc_url="/redoc",
 )
 
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # TODO: restrict in production
@@ -83,20 +112,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli for JSON and text bodies; cached responses arrive precompressed
+app.add_middleware(CompressionMiddleware)
+
 # Security headers middleware
 app.add_middleware(SecurityHeadersMiddleware, debug=settings.debug)
 
+# Per-request phase and SQL timings (Server-Timing header, N+1 warnings, profiling)
+app.add_middleware(ServerTimingMiddleware, warn_threshold=settings.query_count_warn_threshold)
+
+# Request counts and latency per route for /metrics (outermost: times everything)
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(api_router)
 
 
 @app.get("/health")
-async def health_check():
+@app.get("/health/live")
+async def liveness():
+    """
+    Liveness: the process is up and its event loop answers. Checks no
+    dependencies, so a database outage doesn't get every worker restarted.
+    """
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def readiness():
+    """
+    Readiness: the last report of the background dependency checks
+    (DB and Redis latency, pool saturation, warm caches); 503 when a check
+    is down. Reads the cached report only, so probing costs nothing.
+    """
+    ready, report = health_checker.readiness()
+    return JSONResponse(report, status_code=200 if ready else 503)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
     """
-    Health check endpoint.
-    Returns 200 if all healthy,
+    Prometheus metrics; with PROMETHEUS_MULTIPROC_DIR set, summed over all
+    workers on this host. Serve it on the internal network only.
     """
-    health = {
-        "status": "ok",
-    }
+    return Response(metrics.render(), media_type=CONTENT_TYPE_PLAIN_0_0_4)
 
-    return health
@@ -0,0 +1,115 @@
+"""
+Benchmark: GET /courses latency on one worker during a login storm.
+
+A batch of concurrent password checks (the CPU-heavy part of POST
+/auth/login) runs while a client keeps requesting GET /courses through the
+ASGI app. The storm runs twice: once with bcrypt called inline on the event
+loop (the old AuthService behaviour) and once through the bounded
+password_hasher pool. The course list is served from a synthetic in-memory
+catalog, so no database is needed.
+
+Run with: python -m scripts.bench_login_storm [--logins 24] [--rounds 12]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+
+import bcrypt
+from httpx import ASGITransport, AsyncClient
+
+from app.core.password_hasher import PasswordHasher
+from app.services.catalog_index import course_catalog
+from main import app
+
+PASSWORD = "password123"
+
+
+def load_synthetic_catalog(size: int = 3000) -> None:
+    course_catalog.load_rows(
+        [
+            SimpleNamespace(
+                id=i,
+                major_id=i % 40,
+                course_code=f"C{i:05d}",
+                name=f"Course {i}",
+                major_name=f"Major {i % 40}",
+                department=f"Dept {i % 6}",
+                rating_sum=(i % 5 + 1) * (i % 7),
+                difficulty_sum=(i % 3 + 1) * (i % 7),
+                workload_sum=(i % 4 + 1) * (i % 7),
+                review_count=i % 7,
+                latest_review=None,
+            )
+            for i in range(1, size + 1)
+        ]
+    )
+
+
+async def probe(client: AsyncClient, stop: asyncio.Event) -> list[float]:
+    """Sequential GET /courses until `stop`, returning per-request latency in ms."""
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/api/v1/courses", params={"sort": "recommended"})
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.005)
+    return latencies
+
+
+async def run(label: str, storm, client: AsyncClient) -> None:
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(client, stop))
+    started = time.perf_counter()
+    await storm()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    latencies = sorted(await probe_task)
+
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{label:<22} storm {elapsed:6.2f}s  /courses n={len(latencies):4d}  "
+        f"p50 {p50:7.1f} ms  p99 {p99:7.1f} ms  max {latencies[-1]:7.1f} ms"
+    )
+
+
+async def main(logins: int, rounds: int, workers: int) -> None:
+    load_synthetic_catalog()
+    password_hash = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds)).decode()
+    hasher = PasswordHasher(workers=workers, max_queue=logins)
+
+    async def idle():
+        await asyncio.sleep(1.0)
+
+    async def inline_login():
+        bcrypt.checkpw(PASSWORD.encode(), password_hash.encode())
+
+    async def inline_storm():
+        await asyncio.gather(*(inline_login() for _ in range(logins)))
+
+    async def pooled_storm():
+        await asyncio.gather(*(hasher.verify(PASSWORD, password_hash) for _ in range(logins)))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        await client.get("/api/v1/courses")  # warm-up
+
+        print(f"{logins} concurrent logins, bcrypt cost {rounds}, pool of {workers}\n")
+        await run("no storm (1s)", idle, client)
+        await run("inline bcrypt", inline_storm, client)
+        await run("password_hasher pool", pooled_storm, client)
+        print(f"\npool stats: {hasher.stats()}")
+
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--logins", type=int, default=24)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.rounds, args.workers))
@@ -0,0 +1,133 @@
+"""
+Benchmark: requests/second through the middleware stack (CORS + security
+headers + rate limit) around a trivial endpoint.
+
+Compares the BaseHTTPMiddleware SecurityHeadersMiddleware (copied below) with
+the current plain-ASGI one. Requests are fed straight into the ASGI app, so
+no HTTP client or server cost is included.
+
+Run with: python -m scripts.bench_middleware [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.middleware import SecurityHeadersMiddleware
+from app.core.rate_limit import SharedRateLimiter
+from app.services.cache import InMemoryBackend
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """The pre-ASGI implementation, kept here for comparison."""
+
+    def __init__(self, app, debug: bool = False):
+        super().__init__(app)
+        self.debug = debug
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        response.headers["Permissions-Policy"] = (
+            "accelerometer=(), camera=(), geolocation=(), gyroscope=(), "
+            "magnetometer=(), microphone=(), payment=(), usb=()"
+        )
+        if "/api/" in request.url.path:
+            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate"
+            response.headers["Pragma"] = "no-cache"
+        if not self.debug:
+            response.headers["Strict-Transport-Security"] = (
+                "max-age=31536000; includeSubDomains"
+            )
+        return response
+
+
+def build_app(security_middleware) -> FastAPI:
+    backend = InMemoryBackend()
+
+    async def shared_backend():
+        return backend
+
+    limiter = SharedRateLimiter(backend_factory=shared_backend)
+    app = FastAPI()
+
+    @app.get("/api/v1/ping")
+    @limiter.limit("1000000/minute")
+    async def ping(request: Request) -> dict:
+        return {"ok": True}
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(security_middleware)
+    return app
+
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/api/v1/ping",
+    "raw_path": b"/api/v1/ping",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"bench"), (b"origin", b"http://localhost:3000")],
+    "client": ("127.0.0.1", 50000),
+    "server": ("bench", 80),
+}
+
+
+async def run(app, requests: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    status = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    for _ in range(200):  # warm-up
+        await app(dict(SCOPE), receive, send)
+    status.clear()
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(SCOPE), receive, send)
+    elapsed = time.perf_counter() - started
+
+    assert set(status) == {200}, set(status)
+    return elapsed
+
+
+async def main(requests: int) -> None:
+    print(f"{requests} sequential GET /api/v1/ping\n")
+    for label, middleware in (
+        ("BaseHTTPMiddleware", LegacySecurityHeadersMiddleware),
+        ("pure ASGI", SecurityHeadersMiddleware),
+    ):
+        elapsed = await run(build_app(middleware), requests)
+        print(
+            f"{label:<20} {requests / elapsed:8.0f} req/s  "
+            f"{elapsed / requests * 1e6:7.1f} us/request"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,104 @@
+"""
+Microbenchmark: Python-side build + compile-cache lookup for the course list query.
+
+Compares rebuilding the select() construct on every call (the old
+get_list_with_stats) with the module-level construct + lambda_stmt used now.
+Both go through SQLAlchemy's compiled cache the same way the engine does:
+generate the cache key, look it up, compile on a miss.
+
+Run with: python -m scripts.bench_query_build
+"""
+
+import itertools
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+
+from app.models import Course, Major, Review
+from app.repositories.course import course_list_stmt
+
+ITERATIONS = 20_000
+
+VARIANTS = [
+    {"major_id": major_id, "q": q, "sort": sort, "limit": 20, "offset": offset}
+    for major_id, q, sort, offset in itertools.product(
+        [None, 3, 17],
+        [None, "통계"],
+        ["top_rated", "most_reviewed", "latest"],
+        [0, 40],
+    )
+]
+
+
+def legacy_course_list_stmt(major_id, q, sort, limit, offset):
+    """The pre-caching construction, kept here for comparison."""
+    review_stats = (
+        select(
+            Review.course_id,
+            func.avg(Review.rating_overall).label("avg_rating"),
+            func.avg(Review.difficulty).label("avg_difficulty"),
+            func.avg(Review.workload).label("avg_workload"),
+            func.count(Review.id).label("review_count"),
+            func.max(Review.created_at).label("latest_review"),
+        )
+        .where(Review.is_hidden.is_(False))
+        .group_by(Review.course_id)
+        .subquery()
+    )
+    query = (
+        select(
+            Course.id,
+            Course.course_code,
+            Course.name,
+            Major.name.label("major_name"),
+            review_stats.c.avg_rating,
+            review_stats.c.avg_difficulty,
+            review_stats.c.avg_workload,
+            func.coalesce(review_stats.c.review_count, 0).label("review_count"),
+        )
+        .join(Major, Course.major_id == Major.id)
+        .outerjoin(review_stats, Course.id == review_stats.c.course_id)
+        .where(Course.is_archived.is_(False))
+    )
+    if major_id:
+        query = query.where(Course.major_id == major_id)
+    if q:
+        query = query.where(Course.name.ilike(f"%{q}%"))
+    if sort == "top_rated":
+        query = query.order_by(review_stats.c.avg_rating.desc().nullslast())
+    elif sort == "most_reviewed":
+        query = query.order_by(review_stats.c.review_count.desc().nullslast())
+    elif sort == "latest":
+        query = query.order_by(review_stats.c.latest_review.desc().nullslast())
+    return query.offset(offset).limit(limit)
+
+
+def run(build) -> tuple[float, int]:
+    dialect = postgresql.asyncpg.dialect()
+    compiled_cache: dict = {}
+    misses = 0
+
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        stmt = build(**VARIANTS[i % len(VARIANTS)])
+        key = stmt._generate_cache_key().key
+        if key not in compiled_cache:
+            misses += 1
+            compiled_cache[key] = stmt.compile(dialect=dialect)
+    elapsed = time.perf_counter() - start
+    return elapsed / ITERATIONS * 1_000_000, misses
+
+
+def main() -> None:
+    print(f"{ITERATIONS} calls over {len(VARIANTS)} major/q/sort/offset variants\n")
+    for label, build in [
+        ("before (select rebuilt per call)", legacy_course_list_stmt),
+        ("after  (cached construct + lambda_stmt)", course_list_stmt),
+    ]:
+        per_call_us, misses = run(build)
+        print(f"{label:42s} {per_call_us:8.1f} us/call  ({misses} compiles)")
+
+
+if __name__ == "__main__":
+    main()
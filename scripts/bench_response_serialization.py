@@ -0,0 +1,94 @@
+"""
+Benchmark: serialization cost of one 100-row GET /courses page.
+
+Compares, per page of catalog index rows:
+- validated: `CourseListResponse(**row)` in the handler, then FastAPI's
+  response_model validation and pydantic-core JSON dump (the old path)
+- validated + JSONResponse: the same with FastAPI's older dict + json.dumps
+  rendering, i.e. what any custom response_class falls back to
+- model_construct: no validation, models dumped with one TypeAdapter
+- RowsJSONResponse: rows encoded as they are (orjson if installed)
+
+Run with: python -m scripts.bench_response_serialization [--iterations 5000]
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse
+
+from app.core import responses
+from app.core.responses import RowsJSONResponse
+from app.schemas import CourseListResponse
+
+ROWS = [
+    {
+        "id": i,
+        "course_code": f"C{i:05d}",
+        "name": f"자료구조와 알고리즘 {i}",
+        "major_name": "컴퓨터과학과",
+        "avg_rating": 4.25,
+        "avg_difficulty": 2.5,
+        "avg_workload": 3.0,
+        "review_count": 17,
+    }
+    for i in range(100)
+]
+
+FIELD = create_model_field("Response_get_courses", list[CourseListResponse], mode="serialization")
+ADAPTER = TypeAdapter(list[CourseListResponse])
+
+
+async def validated() -> bytes:
+    items = [CourseListResponse(**row) for row in ROWS]
+    return await serialize_response(field=FIELD, response_content=items, dump_json=True)
+
+
+async def validated_json_response() -> bytes:
+    items = [CourseListResponse(**row) for row in ROWS]
+    content = await serialize_response(field=FIELD, response_content=items)
+    return JSONResponse(content).body
+
+
+async def constructed() -> bytes:
+    return ADAPTER.dump_json([CourseListResponse.model_construct(**row) for row in ROWS])
+
+
+async def rows_response() -> bytes:
+    return RowsJSONResponse(CourseListResponse, ROWS).body
+
+
+async def time_page(encode, iterations: int) -> tuple[float, bytes]:
+    for _ in range(iterations // 10):
+        await encode()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        body = await encode()
+    return (time.perf_counter() - started) / iterations * 1e6, body
+
+
+async def main(iterations: int) -> None:
+    print(f"{len(ROWS)} rows per page, {iterations} iterations")
+    print(f"orjson installed: {responses.orjson is not None}\n")
+
+    baseline_us, expected = await time_page(validated, iterations)
+    for label, encode in [
+        ("validated (old)", validated),
+        ("validated + JSONResponse", validated_json_response),
+        ("model_construct", constructed),
+        ("RowsJSONResponse", rows_response),
+    ]:
+        us, body = await time_page(encode, iterations)
+        assert body == expected, f"{label} produced different JSON"
+        print(f"{label:<26} {us:>8.1f} us/page  ({baseline_us / us:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=5_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,69 @@
+"""
+Benchmark: per-request cost of the get_current_user dependency.
+
+Runs the dependency in a loop for one bearer token with the principal
+already cached in memory, so what remains is token verification plus the
+principal lookup. The first pass verifies the JWT on every call, the way
+decode_access_token used to; the second answers repeat presentations from
+the verified token cache.
+
+Run with: python -m scripts.bench_token_cache [--iterations 50000]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import UTC, datetime
+from unittest.mock import patch
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.services.auth.principal import UserPrincipal, user_principals
+from app.services.auth.token_cache import VerifiedTokenCache
+from app.utils import create_access_token, decode_access_token, get_current_user
+
+USER_ID = 1
+
+
+async def time_dependency(credentials: HTTPAuthorizationCredentials, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await get_current_user(credentials, db=None)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def time_decode(token: str, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        decode_access_token(token)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def main(iterations: int) -> None:
+    principal = UserPrincipal(
+        id=USER_ID, is_verified=True, is_deleted=False, review_count=5,
+        created_at=datetime.now(UTC),
+    )
+    cache = await user_principals._backend_factory()
+    await cache.set(user_principals._key(USER_ID), principal.to_json())
+
+    token = create_access_token(USER_ID)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    print(f"{iterations} iterations, one token\n")
+    print(f"{'':<20} {'decode_access_token':>20} {'get_current_user':>18}")
+    with patch("app.utils.auth.verified_tokens", VerifiedTokenCache(maxsize=0)):
+        decode_us = time_decode(token, iterations)
+        dependency_us = await time_dependency(credentials, iterations)
+    print(f"{'verify every call':<20} {decode_us:>17.2f} us {dependency_us:>15.2f} us")
+
+    decode_us = time_decode(token, iterations)
+    dependency_us = await time_dependency(credentials, iterations)
+    print(f"{'verified cache':<20} {decode_us:>17.2f} us {dependency_us:>15.2f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
@@ -3,6 +3,7 @@
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from app.services.health import health_checker
 from main import app
 
 
@@ -34,3 +35,40 @@ async def test_health_check_response_structure(simple_client: AsyncClient):
     assert response.status_code == 200
     data = response.json()
     assert "status" in data
+
+
+@pytest.mark.asyncio
+async def test_liveness(simple_client: AsyncClient):
+    response = await simple_client.get("/health/live")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_readiness_reports_last_check(simple_client: AsyncClient, monkeypatch):
+    """Readiness serves the background checker's report, 503 when a check is down."""
+
+    async def broken_db():
+        raise ConnectionRefusedError
+
+    monkeypatch.setattr(health_checker, "_ping_db", broken_db)
+    monkeypatch.setattr(health_checker, "_report", None)
+    await health_checker.check()
+    response = await simple_client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["checks"]["database"]["status"] == "down"
+
+
+@pytest.mark.asyncio
+async def test_metrics_exposition(simple_client: AsyncClient):
+    """Prometheus metrics include the requests served so far."""
+    await simple_client.get("/health")
+    response = await simple_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in response.text
+    assert "# TYPE event_loop_lag_seconds histogram" in response.text
+    assert "# TYPE password_hash_operations gauge" in response.text
@@ -0,0 +1,105 @@
+"""Unit tests for admin endpoints."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.config import settings
+from app.core.profiling import RequestProfiler, verify_profile_token
+from app.services.review.errors import ReviewNotFoundError
+from main import app
+
+TOKEN = "test-admin-token"
+
+
+@pytest.fixture
+async def client():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture
+def profiler():
+    profiler = RequestProfiler(sample_rate=0, interval=0.001, secret=TOKEN)
+    with (
+        patch.object(settings, "admin_token", TOKEN),
+        patch("app.api.v1.admin.request_profiler", profiler),
+    ):
+        yield profiler
+
+
+class TestAdminAccess:
+    @pytest.mark.asyncio
+    async def test_disabled_without_admin_token(self, client):
+        with patch.object(settings, "admin_token", ""):
+            response = await client.get("/api/v1/admin/profiles")
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_wrong_token(self, client, profiler):
+        response = await client.get(
+            "/api/v1/admin/profiles", headers={"Authorization": "Bearer nope"}
+        )
+
+        assert response.status_code == 401
+
+
+class TestProfiles:
+    @pytest.mark.asyncio
+    async def test_token_and_profiles(self, client, profiler):
+        auth = {"Authorization": f"Bearer {TOKEN}"}
+
+        response = await client.post("/api/v1/admin/profile-token?ttl=60", headers=auth)
+        assert response.status_code == 200
+        assert verify_profile_token(response.json()["value"], TOKEN)
+
+        profiler.begin("GET", "/api/v1/courses", "header").finish(200, {"db": 1.5})
+        [summary] = (await client.get("/api/v1/admin/profiles", headers=auth)).json()
+        assert summary["path"] == "/api/v1/courses"
+        assert "stacks" not in summary
+
+        detail = await client.get(f"/api/v1/admin/profiles/{summary['id']}", headers=auth)
+        assert detail.json()["timings_ms"] == {"db": 1.5}
+        collapsed = await client.get(
+            f"/api/v1/admin/profiles/{summary['id']}/collapsed", headers=auth
+        )
+        assert collapsed.headers["content-type"].startswith("text/plain")
+
+        missing = await client.get("/api/v1/admin/profiles/nope", headers=auth)
+        assert missing.status_code == 404
+
+
+class TestHideReview:
+    @pytest.mark.asyncio
+    async def test_hides_review(self, client, profiler):
+        with patch("app.api.v1.admin.ReviewService") as MockService:
+            MockService.return_value.hide_review = AsyncMock()
+
+            response = await client.post(
+                "/api/v1/admin/reviews/7/hide", headers={"Authorization": f"Bearer {TOKEN}"}
+            )
+
+        assert response.status_code == 204
+        MockService.return_value.hide_review.assert_awaited_once_with(7)
+
+    @pytest.mark.asyncio
+    async def test_unknown_review(self, client, profiler):
+        with patch("app.api.v1.admin.ReviewService") as MockService:
+            MockService.return_value.hide_review = AsyncMock(
+                side_effect=ReviewNotFoundError("Review not found")
+            )
+
+            response = await client.post(
+                "/api/v1/admin/reviews/999/hide", headers={"Authorization": f"Bearer {TOKEN}"}
+            )
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_requires_admin_token(self, client, profiler):
+        response = await client.post("/api/v1/admin/reviews/7/hide")
+
+        assert response.status_code == 401
+
@@ -0,0 +1,62 @@
+"""Unit tests for course API endpoints."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.compression import PrecompressedBody
+from app.utils import LazyUser, create_access_token
+from main import app
+
+
+@pytest.fixture
+async def client():
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {create_access_token(1)}"},
+    ) as ac:
+        yield ac
+
+
+@pytest.fixture
+def get_or_load():
+    with patch("app.utils.auth.user_principals.get_or_load", new=AsyncMock()) as mock:
+        yield mock
+
+
+class TestPrincipalResolution:
+    @pytest.mark.asyncio
+    async def test_course_list_skips_user_lookup(self, client, get_or_load):
+        with patch("app.api.v1.courses.CourseService") as MockService:
+            MockService.return_value.get_list_body = AsyncMock(
+                return_value=PrecompressedBody(b"[]")
+            )
+
+            response = await client.get("/api/v1/courses")
+
+        assert response.status_code == 200
+        get_or_load.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_detail_passes_unresolved_user(self, client, get_or_load):
+        with patch("app.api.v1.courses.CourseService") as MockService:
+            MockService.return_value.get_detail = AsyncMock(return_value=None)
+
+            response = await client.get("/api/v1/courses/1")
+
+        assert response.status_code == 404
+        _, user = MockService.return_value.get_detail.call_args.args
+        assert isinstance(user, LazyUser)
+        get_or_load.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_lazy_user_resolves_once(self, get_or_load):
+        credentials = AsyncMock(credentials=create_access_token(1))
+        get_or_load.return_value = None
+        user = LazyUser(credentials, AsyncMock())
+
+        assert await user.get() is None
+        assert await user.get() is None
+        get_or_load.assert_called_once()
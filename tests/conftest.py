@@ -10,6 +10,7 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.config import settings
+from app.core.query_stats import assert_query_budget, install_query_hooks
 from app.db import get_db
 from app.models import Base
 from main import app
@@ -31,6 +32,7 @@ def event_loop():
 async def test_engine():
     """Create test database engine."""
     engine = create_async_engine(settings.database_url, echo=False)
+    install_query_hooks(engine.sync_engine)
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -71,3 +73,14 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield ac
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Assert a route's SQL query budget against the test DB.
+
+        with query_budget(3):
+            await client.get("/api/v1/courses/1")
+    """
+    return assert_query_budget
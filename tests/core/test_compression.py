@@ -0,0 +1,133 @@
+"""Unit tests for response compression."""
+
+import gzip
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core.compression import PrecompressedBody, choose_encoding
+from app.core.middleware import CompressionMiddleware
+from app.core.responses import encode_json
+from app.services.cache import Cache, InMemoryBackend
+
+ITEMS = [{"id": i, "name": f"과목 {i}", "avg_rating": 4.5} for i in range(100)]
+
+
+async def large(request):
+    return JSONResponse(ITEMS)
+
+
+async def small(request):
+    return PlainTextResponse("ok")
+
+
+async def streamed(request):
+    return StreamingResponse(iter([b"x" * 2048]), media_type="text/plain")
+
+
+async def precompressed(request):
+    body = PrecompressedBody.build(encode_json(ITEMS))
+    return body.response(request.headers.get("accept-encoding", ""))
+
+
+def _client() -> AsyncClient:
+    app = Starlette(
+        routes=[
+            Route("/large", large),
+            Route("/small", small),
+            Route("/streamed", streamed),
+            Route("/precompressed", precompressed),
+        ]
+    )
+    app.add_middleware(CompressionMiddleware)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+class TestChooseEncoding:
+    def test_gzip_accepted(self):
+        assert choose_encoding("gzip, deflate") == "gzip"
+
+    def test_brotli_preferred(self):
+        assert choose_encoding("gzip, deflate, br") == "br"
+
+    def test_q_zero_refuses(self):
+        assert choose_encoding("gzip;q=0, identity") is None
+
+    def test_wildcard(self):
+        assert choose_encoding("*") is not None
+
+    def test_none_supported(self):
+        assert choose_encoding("deflate") is None
+        assert choose_encoding("") is None
+
+
+class TestCompressionMiddleware:
+    @pytest.mark.asyncio
+    async def test_large_json_is_compressed(self):
+        async with _client() as client:
+            response = await client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < len(encode_json(ITEMS))
+        assert response.json() == ITEMS
+
+    @pytest.mark.asyncio
+    async def test_identity_client_gets_raw_body(self):
+        async with _client() as client:
+            response = await client.get("/large", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.json() == ITEMS
+
+    @pytest.mark.asyncio
+    async def test_small_and_streamed_bodies_pass_through(self):
+        async with _client() as client:
+            small_response = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+            streamed_response = await client.get("/streamed", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in small_response.headers
+        assert "content-encoding" not in streamed_response.headers
+        assert streamed_response.text == "x" * 2048
+
+    @pytest.mark.asyncio
+    async def test_precompressed_body_is_not_compressed_twice(self):
+        async with _client() as client:
+            response = await client.get("/precompressed", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == ITEMS
+
+
+class TestPrecompressedBody:
+    def test_small_body_has_no_variants(self):
+        assert PrecompressedBody.build(b"[]").variants == {}
+
+    def test_round_trips_through_cache_format(self):
+        body = PrecompressedBody.build(encode_json(ITEMS))
+
+        restored = PrecompressedBody.from_json(body.to_json())
+
+        assert restored == body
+        assert json.loads(gzip.decompress(restored.variants["gzip"])) == ITEMS
+
+    @pytest.mark.asyncio
+    async def test_get_or_set_body_loads_once(self):
+        cache = Cache(InMemoryBackend())
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return ITEMS
+
+        first = await cache.get_or_set_body("items", loader)
+        second = await cache.get_or_set_body("items", loader)
+
+        assert first == second
+        assert "gzip" in second.variants
+        assert len(calls) == 1
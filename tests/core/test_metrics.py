@@ -0,0 +1,132 @@
+"""Unit tests for the Prometheus metrics exporter and middleware."""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    multiprocess,
+)
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.metrics import LoopLagMonitor, MetricsExporter
+from app.core.middleware import MetricsMiddleware
+
+WORKER = """
+import os, sys
+from prometheus_client import Counter, Gauge
+
+Counter("requests_total", "Requests.").inc(int(sys.argv[1]))
+Gauge("pool_size", "Pool size.", multiprocess_mode="livesum").set(int(sys.argv[1]))
+print(os.getpid())
+"""
+
+
+class TestMetricsExporter:
+    def test_collectors_run_before_render(self):
+        registry = CollectorRegistry()
+        queued = Gauge("queued", "Queued.", registry=registry)
+        exporter = MetricsExporter(registry, multiproc_dir=None)
+        exporter.add_collector(lambda: queued.set(3))
+
+        assert b"queued 3.0" in exporter.render()
+
+    def test_failing_collector_is_skipped(self):
+        registry = CollectorRegistry()
+        Counter("ok_total", "Ok.", registry=registry).inc()
+        exporter = MetricsExporter(registry, multiproc_dir=None)
+        exporter.add_collector(lambda: 1 / 0)
+
+        assert b"ok_total 1.0" in exporter.render()
+
+    def test_multiprocess_dir_sums_workers(self, tmp_path):
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+        pids = []
+        for amount in ("2", "3"):
+            worker = subprocess.run(
+                [sys.executable, "-c", WORKER, amount], env=env, capture_output=True, text=True
+            )
+            pids.append(int(worker.stdout))
+        # What the first worker's MetricsExporter.stop does on shutdown
+        multiprocess.mark_process_dead(pids[0], str(tmp_path))
+
+        text = MetricsExporter(CollectorRegistry(), multiproc_dir=str(tmp_path)).render()
+
+        # Counters keep exited workers' totals; live gauges drop them
+        assert b"requests_total 5.0" in text
+        assert b"pool_size 3.0" in text
+
+
+class TestLoopLagMonitor:
+    @pytest.mark.asyncio
+    async def test_observes_blocked_loop(self):
+        registry = CollectorRegistry()
+        lag = Histogram("lag_seconds", "Lag.", buckets=(0.01, 0.1), registry=registry)
+        monitor = LoopLagMonitor(lag, interval=0.01)
+
+        monitor.start()
+        await asyncio.sleep(0.02)
+        time.sleep(0.05)  # block the loop
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+        assert registry.get_sample_value("lag_seconds_count") >= 1
+        assert registry.get_sample_value("lag_seconds_sum") >= 0.03
+
+
+class TestMetricsMiddleware:
+    @pytest.fixture
+    def app(self):
+        async def course(request):
+            return PlainTextResponse("ok")
+
+        async def boom(request):
+            raise RuntimeError("boom")
+
+        app = Starlette(
+            routes=[
+                Route("/courses/{course_id}", course),
+                Route("/boom", boom),
+            ]
+        )
+        app.add_middleware(MetricsMiddleware)
+        return app
+
+    @staticmethod
+    def requests_count(method: str, route: str, status: int) -> float:
+        labels = {"method": method, "route": route, "status": str(status)}
+        return REGISTRY.get_sample_value("http_requests_total", labels) or 0.0
+
+    @pytest.mark.asyncio
+    async def test_labels_by_route_template(self, app):
+        before = self.requests_count("GET", "/courses/{course_id}", 200)
+        unmatched = self.requests_count("GET", "unmatched", 404)
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            await client.get("/courses/1")
+            await client.get("/courses/2")
+            await client.get("/nope")
+
+        assert self.requests_count("GET", "/courses/{course_id}", 200) == before + 2
+        assert self.requests_count("GET", "unmatched", 404) == unmatched + 1
+
+    @pytest.mark.asyncio
+    async def test_counts_unhandled_errors_as_500(self, app):
+        before = self.requests_count("GET", "/boom", 500)
+        transport = ASGITransport(app=app, raise_app_exceptions=False)
+
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get("/boom")
+
+        assert self.requests_count("GET", "/boom", 500) == before + 1
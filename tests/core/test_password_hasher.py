@@ -0,0 +1,104 @@
+"""Unit tests for the bcrypt thread pool."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.password_hasher import (
+    PasswordHasher,
+    PasswordHasherBusyError,
+    hash_rounds,
+    rounds_for_target,
+)
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(workers=1, max_queue=1)
+    yield hasher
+    hasher.shutdown()
+
+
+class TestPasswordHasher:
+    @pytest.mark.asyncio
+    async def test_hash_and_verify(self, hasher):
+        hashed = await hasher.hash("password123", rounds=4)
+
+        assert await hasher.verify("password123", hashed)
+        assert not await hasher.verify("wrong", hashed)
+        assert hasher.stats()["completed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_is_full(self, hasher):
+        release = threading.Event()
+        running = hasher._run(release.wait)
+        queued = hasher._run(release.wait)
+        tasks = [asyncio.ensure_future(running), asyncio.ensure_future(queued)]
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(PasswordHasherBusyError):
+            await hasher._run(release.wait)
+
+        stats = hasher.stats()
+        assert stats["in_flight"] == 1
+        assert stats["queued"] == 1
+        assert stats["rejected"] == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert hasher.stats()["max_queued"] == 1
+
+    @pytest.mark.asyncio
+    async def test_event_loop_keeps_running_while_hashing(self, hasher):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        task = asyncio.ensure_future(ticker())
+        await hasher.hash("password123", rounds=10)
+        task.cancel()
+
+        assert ticks > 5
+
+
+class TestCostCalibration:
+    def test_rounds_for_target(self):
+        # 10 ms at cost 8 -> 20, 40, 80, 160 ms at 9-12; 320 ms at 13 is over
+        assert rounds_for_target(0.010, 8, target_seconds=0.25) == 12
+        assert rounds_for_target(0.010, 8, target_seconds=0.001) == 10
+        assert rounds_for_target(0.0001, 8, target_seconds=10) == 15
+
+    @pytest.mark.asyncio
+    async def test_calibrate_stays_within_bounds(self, hasher):
+        rounds = await hasher.calibrate(target_seconds=0.001)
+
+        assert rounds == hasher.rounds == 10
+        assert hash_rounds(await hasher.hash("password123")) == 10
+
+    @pytest.mark.asyncio
+    async def test_pinned_rounds_skip_calibration(self):
+        hasher = PasswordHasher(workers=1, max_queue=1, rounds=4)
+        try:
+            assert await hasher.calibrate(target_seconds=10) == 4
+        finally:
+            hasher.shutdown()
+
+    def test_calibrated_cost_only_upgrades(self, hasher):
+        hasher.rounds = 12
+
+        assert hasher.needs_rehash("$2b$10$" + "x" * 53)
+        assert not hasher.needs_rehash("$2b$12$" + "x" * 53)
+        assert not hasher.needs_rehash("$2b$14$" + "x" * 53)
+        assert hasher.needs_rehash("not-a-bcrypt-hash")
+
+    def test_pinned_cost_also_downgrades(self):
+        hasher = PasswordHasher(workers=1, max_queue=1, rounds=12)
+
+        assert hasher.needs_rehash("$2b$14$" + "x" * 53)
+        assert not hasher.needs_rehash("$2b$12$" + "x" * 53)
+        hasher.shutdown()
@@ -0,0 +1,135 @@
+"""Unit tests for on-demand request profiling."""
+
+import threading
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.middleware import ServerTimingMiddleware
+from app.core.profiling import (
+    RequestProfiler,
+    StackSampler,
+    sign_profile_token,
+    verify_profile_token,
+)
+
+SECRET = "test-admin-token"
+
+
+def busy_wait(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def slow(request):
+    busy_wait(0.05)
+    return PlainTextResponse("ok")
+
+
+async def boom(request):
+    raise RuntimeError("boom")
+
+
+def _client(profiler: RequestProfiler) -> AsyncClient:
+    app = Starlette(routes=[Route("/slow", slow), Route("/boom", boom)])
+    app.add_middleware(ServerTimingMiddleware, profiler=profiler)
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    return AsyncClient(transport=transport, base_url="http://test")
+
+
+class TestProfileToken:
+    def test_valid_token(self):
+        assert verify_profile_token(sign_profile_token(60, SECRET), SECRET)
+
+    def test_wrong_secret_or_expired(self):
+        assert not verify_profile_token(sign_profile_token(60, SECRET), "other")
+        assert not verify_profile_token(sign_profile_token(-1, SECRET), SECRET)
+        assert not verify_profile_token("garbage", SECRET)
+
+    def test_no_secret_disables_tokens(self):
+        assert not verify_profile_token(sign_profile_token(60, ""), "")
+
+
+class TestStackSampler:
+    def test_stop_freezes_counts_without_joining(self):
+        sampler = StackSampler(threading.get_ident(), 0.001)
+        sampler._thread.join = None  # stop() runs on the event loop and must not block on it
+        sampler.start()
+        busy_wait(0.02)
+
+        sampler.stop()
+        samples, stacks = sampler.samples, dict(sampler.stacks)
+        busy_wait(0.02)
+
+        assert samples > 0
+        assert sampler.samples == samples
+        assert dict(sampler.stacks) == stacks
+
+
+class TestRequestProfiler:
+    @pytest.mark.asyncio
+    async def test_signed_header_profiles_request(self):
+        profiler = RequestProfiler(buffer_size=2, sample_rate=0, interval=0.001, secret=SECRET)
+
+        async with _client(profiler) as client:
+            response = await client.get(
+                "/slow", headers={"X-Profile": sign_profile_token(60, SECRET)}
+            )
+
+        [profile] = profiler.list()
+        assert response.headers["x-profile-id"] == profile.id
+        assert profile.trigger == "header"
+        assert profile.status == 200
+        assert profile.samples > 0
+        assert any("busy_wait" in stack for stack, _ in profile.stacks)
+        assert "total" in profile.timings_ms
+        assert "busy_wait" in profile.collapsed()
+
+    @pytest.mark.asyncio
+    async def test_ring_buffer_keeps_last_profiles(self):
+        profiler = RequestProfiler(buffer_size=2, sample_rate=1.0, interval=0.01, secret=SECRET)
+
+        async with _client(profiler) as client:
+            ids = [(await client.get("/slow")).headers["x-profile-id"] for _ in range(3)]
+
+        assert [p.id for p in profiler.list()] == ids[:0:-1]
+        assert profiler.get(ids[0]) is None
+
+    @pytest.mark.asyncio
+    async def test_failed_request_is_recorded_without_status(self):
+        profiler = RequestProfiler(sample_rate=1.0, interval=0.01, secret=SECRET)
+
+        async with _client(profiler) as client:
+            response = await client.get("/boom")
+
+        [profile] = profiler.list()
+        assert response.status_code == 500
+        assert profile.status is None
+        # The next request can be profiled again
+        async with _client(profiler) as client:
+            await client.get("/slow")
+        assert len(profiler.list()) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_header_is_not_profiled(self):
+        profiler = RequestProfiler(sample_rate=0, secret=SECRET)
+
+        async with _client(profiler) as client:
+            response = await client.get("/slow", headers={"X-Profile": "1.bad"})
+
+        assert "x-profile-id" not in response.headers
+        assert profiler.list() == []
+
+    def test_one_profile_at_a_time(self):
+        profiler = RequestProfiler(secret=SECRET)
+        session = profiler.begin("GET", "/a", "sample")
+
+        assert profiler.begin("GET", "/b", "sample") is None
+        session.finish(200, {})
+        profiler.begin("GET", "/c", "sample").finish(200, {})
+        assert len(profiler.list()) == 2
@@ -0,0 +1,91 @@
+"""Unit tests for per-request SQL instrumentation."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.middleware import ServerTimingMiddleware
+from app.core.query_stats import assert_query_budget, install_query_hooks, track_queries
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    install_query_hooks(engine)
+    yield engine
+    engine.dispose()
+
+
+def run_queries(engine, n: int) -> None:
+    with engine.connect() as conn:
+        for i in range(n):
+            conn.execute(text(f"SELECT {i}"))
+
+
+class TestTrackQueries:
+    def test_counts_statements(self, engine):
+        with track_queries() as stats:
+            run_queries(engine, 3)
+
+        assert stats.count == 3
+        assert stats.total_time > 0
+        assert stats.slowest_statement.startswith("SELECT")
+
+    def test_untracked_outside_block(self, engine):
+        with track_queries() as stats:
+            pass
+        run_queries(engine, 2)
+
+        assert stats.count == 0
+
+    def test_failed_statement_is_recorded_once(self, engine):
+        with track_queries(record_statements=True) as stats:
+            with engine.connect() as conn:
+                with pytest.raises(OperationalError):
+                    conn.execute(text("SELECT * FROM missing"))
+                conn.rollback()
+                conn.execute(text("SELECT 1"))
+                assert "query_start" not in conn.info
+
+        assert stats.statements == ["SELECT * FROM missing", "SELECT 1"]
+
+    def test_install_is_idempotent(self, engine):
+        install_query_hooks(engine)
+
+        with track_queries() as stats:
+            run_queries(engine, 1)
+
+        assert stats.count == 1
+
+
+class TestAssertQueryBudget:
+    def test_within_budget(self, engine):
+        with assert_query_budget(2):
+            run_queries(engine, 2)
+
+    def test_over_budget_lists_statements(self, engine):
+        with pytest.raises(AssertionError, match="at most 1 queries, got 2"):
+            with assert_query_budget(1):
+                run_queries(engine, 2)
+
+
+class TestServerTimingMiddleware:
+    @pytest.mark.asyncio
+    async def test_server_timing_header_and_warning(self, engine, caplog):
+        async def endpoint(request):
+            run_queries(engine, 3)
+            return PlainTextResponse("ok")
+
+        app = Starlette(routes=[Route("/items", endpoint)])
+        app.add_middleware(ServerTimingMiddleware, warn_threshold=2)
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.get("/items")
+
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+        assert 'desc="3 queries"' in response.headers["Server-Timing"]
+        assert "ran 3 queries" in caplog.text
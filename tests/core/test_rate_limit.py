@@ -0,0 +1,178 @@
+"""Unit tests for the shared rate limiter."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.rate_limit import (
+    RateLimit,
+    RateLimitExceeded,
+    SharedRateLimiter,
+    client_ip_key,
+    user_or_ip_key,
+)
+from app.services.cache import InMemoryBackend, RedisBackend
+
+PER_MINUTE_30 = RateLimit.parse("30/minute")
+
+
+class CountingBackend(InMemoryBackend):
+    """The shared store; counts round trips."""
+
+    def __init__(self):
+        super().__init__()
+        self.reservations = 0
+
+    async def reserve_tokens(self, *args, **kwargs) -> int:
+        self.reservations += 1
+        return await super().reserve_tokens(*args, **kwargs)
+
+
+class SlowBackend(CountingBackend):
+    """A shared store with a round trip long enough for requests to overlap."""
+
+    async def reserve_tokens(self, *args, **kwargs) -> int:
+        await asyncio.sleep(0.01)
+        return await super().reserve_tokens(*args, **kwargs)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 60_000.0  # start of a minute window
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def backend():
+    return CountingBackend()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _worker(backend, clock) -> SharedRateLimiter:
+    return SharedRateLimiter(backend_factory=AsyncMock(return_value=backend), clock=clock)
+
+
+async def _hits(limiter: SharedRateLimiter, n: int, key: str = "ip:1.2.3.4") -> int:
+    allowed = 0
+    for _ in range(n):
+        try:
+            await limiter.hit("search", PER_MINUTE_30, key)
+            allowed += 1
+        except RateLimitExceeded:
+            pass
+    return allowed
+
+
+class TestRateLimit:
+    def test_parse_and_batch(self):
+        assert PER_MINUTE_30 == RateLimit(30, 60)
+        assert PER_MINUTE_30.batch == 3
+        assert RateLimit.parse("5/minute").batch == 1
+        assert RateLimit.parse("1000/hour").batch == 5
+
+
+class TestSharedRateLimiter:
+    @pytest.mark.asyncio
+    async def test_reserves_tokens_in_batches(self, backend, clock):
+        limiter = _worker(backend, clock)
+
+        assert await _hits(limiter, 30) == 30
+        assert backend.reservations == 10
+
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            await limiter.hit("search", PER_MINUTE_30, "ip:1.2.3.4")
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.headers["Retry-After"] == "60"
+
+    @pytest.mark.asyncio
+    async def test_limit_is_shared_across_workers(self, backend, clock):
+        workers = [_worker(backend, clock) for _ in range(4)]
+
+        allowed = 0
+        for _ in range(20):
+            for worker in workers:
+                allowed += await _hits(worker, 1)
+
+        # Never more than the limit; unspent local batches only make it stricter
+        assert 30 - 3 * len(workers) <= allowed <= 30
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_reservation(self, clock):
+        backend = SlowBackend()
+        limiter = _worker(backend, clock)
+
+        concurrent = await asyncio.gather(*(_hits(limiter, 1) for _ in range(10)))
+
+        # No batch is reserved and then dropped: the whole limit is usable
+        assert sum(concurrent) + await _hits(limiter, 40) == 30
+        # Ten batches of 3, then one finding the limit spent (that denial is cached)
+        assert backend.reservations == 11
+
+    @pytest.mark.asyncio
+    async def test_keys_are_independent(self, backend, clock):
+        limiter = _worker(backend, clock)
+
+        assert await _hits(limiter, 31, key="user:1") == 30
+        assert await _hits(limiter, 1, key="user:2") == 1
+
+    @pytest.mark.asyncio
+    async def test_previous_window_still_counts(self, backend, clock):
+        limiter = _worker(backend, clock)
+        assert await _hits(limiter, 30) == 30
+
+        # A quarter into the next window, 3/4 of the previous 30 still count
+        clock.now += 75
+        assert await _hits(limiter, 30) == 7
+
+    @pytest.mark.asyncio
+    async def test_denial_is_cached_locally(self, backend, clock):
+        limiter = _worker(backend, clock)
+        await _hits(limiter, 31)
+        reservations = backend.reservations
+
+        assert await _hits(limiter, 10) == 0
+        assert backend.reservations == reservations
+
+    @pytest.mark.asyncio
+    async def test_backend_failure_counts_per_process(self, clock):
+        limiter = SharedRateLimiter(
+            backend_factory=AsyncMock(side_effect=ConnectionError()), clock=clock
+        )
+
+        assert await _hits(limiter, 31) == 30
+
+
+class TestRedisBackend:
+    @pytest.mark.asyncio
+    async def test_script_is_registered_once(self):
+        client = MagicMock()
+        client.register_script.return_value = AsyncMock(return_value=5)
+        backend = RedisBackend(client)
+
+        for _ in range(3):
+            granted = await backend.reserve_tokens(
+                key="k:2", previous_key="k:1", limit=30, previous_weight=0.5, amount=5, ttl=120
+            )
+
+        assert granted == 5
+        client.register_script.assert_called_once()
+        client.register_script.return_value.assert_called_with(
+            keys=["k:2", "k:1"], args=[30, 0.5, 5, 120]
+        )
+
+
+class TestKeyFunctions:
+    def test_user_key_when_authenticated(self):
+        request = SimpleNamespace(client=SimpleNamespace(host="1.2.3.4"))
+
+        assert user_or_ip_key(request, {"current_user": SimpleNamespace(id=7)}) == "user:7"
+        assert user_or_ip_key(request, {}) == "ip:1.2.3.4"
+        assert client_ip_key(request, {"current_user": SimpleNamespace(id=7)}) == "ip:1.2.3.4"
@@ -0,0 +1,53 @@
+"""Unit tests for the hot list response encoding."""
+
+from pydantic import TypeAdapter
+
+from app.core.responses import RowsJSONResponse, encode_json, encode_rows
+from app.schemas import CourseListResponse
+from main import app
+
+ROWS = [
+    {
+        "id": i,
+        "course_code": f"C{i:03d}",
+        "name": f"자료구조 {i}",
+        "major_name": "컴퓨터과학과",
+        "avg_rating": 4.25 if i % 2 else None,
+        "avg_difficulty": 2.5 if i % 2 else None,
+        "avg_workload": 3.0 if i % 2 else None,
+        "review_count": i % 2,
+    }
+    for i in range(10)
+]
+
+
+def _validated_json(rows: list[dict]) -> bytes:
+    """What FastAPI sends for `[CourseListResponse(**row) ...]` with a response_model."""
+    adapter = TypeAdapter(list[CourseListResponse])
+    return adapter.dump_json([CourseListResponse(**row) for row in rows])
+
+
+class TestEncodeRows:
+    def test_matches_validated_serialization(self):
+        assert encode_rows(CourseListResponse, ROWS) == _validated_json(ROWS)
+
+    def test_encode_json(self):
+        assert encode_json({1: "한"}) == '{"1":"한"}'.encode()
+
+    def test_response(self):
+        response = RowsJSONResponse(CourseListResponse, ROWS)
+
+        assert response.media_type == "application/json"
+        assert response.body == _validated_json(ROWS)
+
+
+class TestOpenApi:
+    def test_list_endpoints_keep_their_response_schema(self):
+        paths = app.openapi()["paths"]
+
+        for path, model in [
+            ("/api/v1/courses", "CourseListResponse"),
+            ("/api/v1/search", "SearchResult"),
+        ]:
+            schema = paths[path]["get"]["responses"]["200"]["content"]["application/json"]
+            assert schema["schema"]["items"]["$ref"] == f"#/components/schemas/{model}"
@@ -0,0 +1,46 @@
+"""Unit tests for SecurityHeadersMiddleware."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.middleware import SecurityHeadersMiddleware
+
+
+async def plain(request):
+    return PlainTextResponse("ok")
+
+
+async def cached(request):
+    return PlainTextResponse("ok", headers={"Cache-Control": "max-age=60"})
+
+
+def _client(debug: bool) -> AsyncClient:
+    app = Starlette(routes=[Route("/health", plain), Route("/api/v1/cached", cached)])
+    app.add_middleware(SecurityHeadersMiddleware, debug=debug)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+class TestSecurityHeadersMiddleware:
+    @pytest.mark.asyncio
+    async def test_non_api_path(self):
+        async with _client(debug=False) as client:
+            response = await client.get("/health")
+
+        assert response.headers["x-content-type-options"] == "nosniff"
+        assert response.headers["x-frame-options"] == "DENY"
+        assert response.headers["strict-transport-security"].startswith("max-age=")
+        assert "cache-control" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_api_path_replaces_cache_control(self):
+        async with _client(debug=True) as client:
+            response = await client.get("/api/v1/cached")
+
+        assert response.headers.get_list("cache-control") == [
+            "no-store, no-cache, must-revalidate"
+        ]
+        assert response.headers["pragma"] == "no-cache"
+        assert "strict-transport-security" not in response.headers
@@ -0,0 +1,59 @@
+"""Unit tests for Server-Timing spans."""
+
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.middleware import ServerTimingMiddleware
+from app.core.timing import span, timed, track_timings
+
+
+@timed("cache")
+async def cache_call():
+    with span("cache"):  # nested span of the same name counts once
+        time.sleep(0.002)
+
+
+class TestSpans:
+    @pytest.mark.asyncio
+    async def test_spans_add_up_per_name(self):
+        with track_timings() as timings:
+            await cache_call()
+            await cache_call()
+            with span("profanity"):
+                pass
+
+        assert timings.counts == {"cache": 2, "profanity": 1}
+        assert timings.totals["cache"] >= 0.004
+        assert 'cache;dur=' in timings.server_timing()
+        assert 'desc="2x"' in timings.server_timing()
+
+    @pytest.mark.asyncio
+    async def test_untracked_outside_block(self):
+        with track_timings() as timings:
+            pass
+        await cache_call()
+
+        assert timings.totals == {}
+
+
+class TestServerTimingMiddleware:
+    @pytest.mark.asyncio
+    async def test_spans_and_total_in_header(self):
+        async def endpoint(request):
+            await cache_call()
+            return PlainTextResponse("ok")
+
+        app = Starlette(routes=[Route("/items", endpoint)])
+        app.add_middleware(ServerTimingMiddleware)
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.get("/items")
+
+        entries = [e.split(";")[0] for e in response.headers["Server-Timing"].split(", ")]
+        assert entries == ["cache", "total"]
+        assert "x-profile-id" not in response.headers
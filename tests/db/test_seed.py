@@ -0,0 +1,69 @@
+"""Unit tests for catalog parsing and sync diffing."""
+
+from app.constants import CourseStatus
+from app.db.seed import diff_catalog, parse_catalog
+
+MAJOR_IDS = {"컴퓨터과학과": 1, "경영학과": 2}
+
+
+def course(name: str, major: str = "컴퓨터과학과", semester: int = 1, grade: int = 1) -> dict:
+    return {"name": name, "major": major, "semester": semester, "grade": grade}
+
+
+class TestParseCatalog:
+    def test_skips_duplicates_and_unknown_majors(self):
+        data = {
+            "majors": ["컴퓨터과학과", {"name": "경영학과", "department": "사회과학대학"}],
+            "courses": [
+                {"course_code": "1", "name": "자료구조", "major": "컴퓨터과학과", "grade": 2},
+                {"course_code": "1", "name": "자료구조", "major": "경영학과"},
+                {"course_code": "2", "name": "미술사", "major": "미술학과"},
+            ],
+        }
+
+        majors, courses = parse_catalog(data)
+
+        assert majors == {"컴퓨터과학과": "자연과학대학", "경영학과": "사회과학대학"}
+        assert courses == {"1": course("자료구조", grade=2)}
+
+
+class TestDiffCatalog:
+    def test_no_changes(self):
+        diff = diff_catalog(
+            {"1": course("자료구조")},
+            MAJOR_IDS,
+            {"1": {"id": 10, "name": "자료구조", "major_id": 1, "is_archived": False}},
+            {10: {(1, 1): (100, CourseStatus.ACTIVE)}},
+        )
+
+        assert diff.is_empty
+
+    def test_insert_update_archive(self):
+        diff = diff_catalog(
+            {"1": course("자료구조론"), "3": course("회계원리", major="경영학과")},
+            MAJOR_IDS,
+            {
+                "1": {"id": 10, "name": "자료구조", "major_id": 1, "is_archived": False},
+                "2": {"id": 11, "name": "폐강과목", "major_id": 1, "is_archived": False},
+            },
+            {10: {(1, 1): (100, CourseStatus.ACTIVE)}},
+        )
+
+        assert diff.insert == [{"course_code": "3", "name": "회계원리", "major_id": 2}]
+        assert diff.update == [
+            {"id": 10, "name": "자료구조론", "major_id": 1, "is_archived": False}
+        ]
+        assert diff.archive == [11]
+
+    def test_offering_moved_to_other_semester(self):
+        diff = diff_catalog(
+            {"1": course("자료구조", semester=2)},
+            MAJOR_IDS,
+            {"1": {"id": 10, "name": "자료구조", "major_id": 1, "is_archived": False}},
+            {10: {(1, 1): (100, CourseStatus.ACTIVE)}},
+        )
+
+        assert diff.offerings_insert == [
+            {"course_id": 10, "semester": 2, "grade_target": 1, "status": CourseStatus.ACTIVE}
+        ]
+        assert diff.offerings_status == [{"id": 100, "status": CourseStatus.DEPRECATED}]
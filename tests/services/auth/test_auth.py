@@ -1,6 +1,6 @@
 """Unit tests for AuthService."""
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -23,6 +23,8 @@ def mock_db():
 def auth_service(mock_db):
     service = AuthService(mock_db)
     service.user_repo = AsyncMock()
+    service.principals = MagicMock()
+    service.outbox = AsyncMock()
     return service
 
 
@@ -39,18 +41,21 @@ class TestValidateKnouEmail:
 
 
 class TestPasswordHashing:
-    def test_hash_password(self, auth_service):
-        hashed = auth_service._hash_password("password123")
+    @pytest.mark.asyncio
+    async def test_hash_password(self, auth_service):
+        hashed = await auth_service._hash_password("password123")
         assert hashed != "password123"
         assert hashed.startswith("$2b$")
 
-    def test_verify_password_correct(self, auth_service):
-        hashed = auth_service._hash_password("password123")
-        assert auth_service._verify_password("password123", hashed) is True
+    @pytest.mark.asyncio
+    async def test_verify_password_correct(self, auth_service):
+        hashed = await auth_service._hash_password("password123")
+        assert await auth_service._verify_password("password123", hashed) is True
 
-    def test_verify_password_incorrect(self, auth_service):
-        hashed = auth_service._hash_password("password123")
-        assert auth_service._verify_password("wrongpassword", hashed) is False
+    @pytest.mark.asyncio
+    async def test_verify_password_incorrect(self, auth_service):
+        hashed = await auth_service._hash_password("password123")
+        assert await auth_service._verify_password("wrongpassword", hashed) is False
 
 
 class TestSignup:
@@ -64,11 +69,14 @@ class TestSignup:
             is_verified=False,
         )
 
-        with patch.object(auth_service, "_send_verification_email", new_callable=AsyncMock):
-            user = await auth_service.signup("test@knou.ac.kr", "password123")
+        user = await auth_service.signup("test@knou.ac.kr", "password123")
 
         assert user.email == "test@knou.ac.kr"
         auth_service.user_repo.create.assert_called_once()
+        db, to_email, subject, html_body = auth_service.outbox.enqueue.call_args.args
+        assert db is auth_service.db
+        assert to_email == "test@knou.ac.kr"
+        assert "/#/verify-email?token=" in html_body
 
     @pytest.mark.asyncio
     async def test_signup_invalid_domain(self, auth_service):
@@ -88,7 +96,7 @@ class TestSignup:
 class TestLogin:
     @pytest.mark.asyncio
     async def test_login_success(self, auth_service):
-        password_hash = auth_service._hash_password("password123")
+        password_hash = await auth_service._hash_password("password123")
         auth_service.user_repo.get_by_email.return_value = User(
             id=1,
             email="test@knou.ac.kr",
@@ -98,6 +106,24 @@ class TestLogin:
 
         user = await auth_service.login("test@knou.ac.kr", "password123")
         assert user.email == "test@knou.ac.kr"
+        auth_service.user_repo.update.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_login_rehashes_outdated_cost(self, auth_service):
+        password_hash = await auth_service.hasher.hash("password123", rounds=4)
+        user = User(
+            id=1,
+            email="test@knou.ac.kr",
+            password_hash=password_hash,
+            is_verified=True,
+        )
+        auth_service.user_repo.get_by_email.return_value = user
+
+        await auth_service.login("test@knou.ac.kr", "password123")
+
+        new_hash = auth_service.user_repo.update.call_args.kwargs["password_hash"]
+        assert new_hash.startswith(f"$2b${auth_service.hasher.rounds:02d}$")
+        assert await auth_service._verify_password("password123", new_hash)
 
     @pytest.mark.asyncio
     async def test_login_user_not_found(self, auth_service):
@@ -108,7 +134,7 @@ class TestLogin:
 
     @pytest.mark.asyncio
     async def test_login_wrong_password(self, auth_service):
-        password_hash = auth_service._hash_password("password123")
+        password_hash = await auth_service._hash_password("password123")
         auth_service.user_repo.get_by_email.return_value = User(
             id=1,
             email="test@knou.ac.kr",
@@ -121,7 +147,7 @@ class TestLogin:
 
     @pytest.mark.asyncio
     async def test_login_email_not_verified(self, auth_service):
-        password_hash = auth_service._hash_password("password123")
+        password_hash = await auth_service._hash_password("password123")
         auth_service.user_repo.get_by_email.return_value = User(
             id=1,
             email="test@knou.ac.kr",
@@ -0,0 +1,101 @@
+"""Unit tests for the cached auth principal."""
+
+import asyncio
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models import User
+from app.services.auth.principal import PrincipalCache, UserPrincipal
+from app.services.cache import InMemoryBackend
+
+USER = User(
+    id=7,
+    email="test@knou.ac.kr",
+    password_hash="x",
+    is_verified=True,
+    is_deleted=False,
+    review_count=2,
+    created_at=datetime(2026, 3, 1, tzinfo=UTC),
+)
+
+
+@pytest.fixture
+def backend():
+    return InMemoryBackend()
+
+
+@pytest.fixture
+def principals(backend):
+    return PrincipalCache(backend_factory=AsyncMock(return_value=backend))
+
+
+@pytest.fixture
+def user_repo():
+    with patch("app.services.auth.principal.UserRepository") as MockRepo:
+        MockRepo.return_value.get_by_id = AsyncMock(return_value=USER)
+        yield MockRepo.return_value
+
+
+class TestUserPrincipal:
+    def test_json_round_trip(self):
+        principal = UserPrincipal.from_user(USER)
+
+        assert UserPrincipal.from_json(principal.to_json()) == principal
+        assert not principal.has_full_access
+
+
+class TestPrincipalCache:
+    @pytest.mark.asyncio
+    async def test_second_lookup_skips_db(self, principals, user_repo):
+        first = await principals.get_or_load(AsyncMock(), 7)
+        second = await principals.get_or_load(AsyncMock(), 7)
+
+        assert first == second == UserPrincipal.from_user(USER)
+        user_repo.get_by_id.assert_called_once_with(7)
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_is_not_cached(self, principals, user_repo, backend):
+        user_repo.get_by_id.return_value = None
+
+        assert await principals.get_or_load(AsyncMock(), 7) is None
+        assert await backend.get("users:principal:7") is None
+
+    @pytest.mark.asyncio
+    async def test_cache_failure_falls_back_to_db(self, user_repo):
+        principals = PrincipalCache(backend_factory=AsyncMock(side_effect=ConnectionError()))
+
+        principal = await principals.get_or_load(AsyncMock(), 7)
+
+        assert principal.id == 7
+
+    @pytest.mark.asyncio
+    async def test_invalidated_only_after_commit(self, principals, user_repo, backend):
+        await principals.get_or_load(AsyncMock(), 7)
+        session = Session()
+        db = SimpleNamespace(sync_session=session)
+
+        principals.invalidate_after_commit(db, 7)
+        await asyncio.sleep(0)
+        assert await backend.get("users:principal:7") is not None
+
+        session.commit()
+        await asyncio.sleep(0)
+        assert await backend.get("users:principal:7") is None
+
+    @pytest.mark.asyncio
+    async def test_rollback_keeps_entry(self, principals, user_repo, backend):
+        await principals.get_or_load(AsyncMock(), 7)
+        session = Session()
+        db = SimpleNamespace(sync_session=session)
+
+        principals.invalidate_after_commit(db, 7)
+        session.begin()
+        session.rollback()
+        session.commit()
+        await asyncio.sleep(0)
+
+        assert await backend.get("users:principal:7") is not None
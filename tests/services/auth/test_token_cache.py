@@ -0,0 +1,78 @@
+"""Unit tests for the verified access token cache."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.config import settings
+from app.services.auth.token_cache import VerifiedTokenCache
+from app.utils import create_access_token, decode_access_token
+
+KEY = ("secret", "HS256")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return VerifiedTokenCache(maxsize=2, clock=clock)
+
+
+class TestVerifiedTokenCache:
+    def test_hit_until_exp(self, cache, clock):
+        cache.put("token", KEY, 7, exp=1_060)
+
+        assert cache.get("token", KEY) == 7
+        clock.now = 1_060
+        assert cache.get("token", KEY) is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self, cache):
+        cache.put("a", KEY, 1, exp=2_000)
+        cache.put("b", KEY, 2, exp=2_000)
+        cache.get("a", KEY)
+        cache.put("c", KEY, 3, exp=2_000)
+
+        assert cache.get("a", KEY) == 1
+        assert cache.get("b", KEY) is None
+        assert cache.get("c", KEY) == 3
+
+    def test_key_rotation_clears_entries(self, cache):
+        cache.put("token", KEY, 7, exp=2_000)
+
+        assert cache.get("token", ("rotated", "HS256")) is None
+        assert cache.get("token", KEY) is None
+
+
+class TestDecodeAccessToken:
+    def test_second_decode_skips_verification(self):
+        token = create_access_token(42)
+
+        assert decode_access_token(token) == 42
+        with patch("app.utils.auth.jwt.decode") as decode:
+            assert decode_access_token(token) == 42
+        decode.assert_not_called()
+
+    def test_rotated_secret_rejects_cached_token(self):
+        token = create_access_token(42)
+        assert decode_access_token(token) == 42
+
+        with patch.object(settings, "jwt_secret_key", "another-secret-of-sufficient-length"):
+            assert decode_access_token(token) is None
+
+    def test_invalid_token_is_not_cached(self):
+        with patch("app.utils.auth.verified_tokens") as tokens:
+            tokens.get.return_value = None
+            assert decode_access_token("not-a-jwt") is None
+        tokens.put.assert_not_called()
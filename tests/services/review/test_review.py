@@ -1,18 +1,23 @@
 """Unit tests for ReviewService."""
 
-from datetime import datetime
-from unittest.mock import AsyncMock
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy.exc import IntegrityError
 
-from app.models import Course, Review, User
+from app.models import Course, Review
 from app.schemas import ReviewCreate
+from app.services.auth.principal import UserPrincipal
 from app.services.review.errors import (
     CourseNotFoundError,
     DuplicateReviewError,
     InvalidReviewTextError,
+    ReviewNotFoundError,
+    TagNotFoundError,
 )
 from app.services.review.review import ReviewService
+from app.services.tag_registry import TagRegistry
 
 
 @pytest.fixture
@@ -25,19 +30,21 @@ def review_service(mock_db):
     service = ReviewService(mock_db)
     service.review_repo = AsyncMock()
     service.course_repo = AsyncMock()
-    service.tag_repo = AsyncMock()
+    service.tags = TagRegistry()
+    service.catalog = MagicMock()
+    service.principals = MagicMock()
     service.user_repo = AsyncMock()
     return service
 
 
 @pytest.fixture
 def sample_user():
-    return User(
+    return UserPrincipal(
         id=1,
-        email="test@knou.ac.kr",
-        password_hash="x",
         is_verified=True,
+        is_deleted=False,
         review_count=0,
+        created_at=datetime.now(UTC),
     )
 
 
@@ -68,9 +75,7 @@ class TestCreateReview:
     async def test_create_review_success(
         self, review_service, sample_user, sample_course, sample_review_data
     ):
-        review_service.course_repo.get_by_id.return_value = sample_course
-        review_service.review_repo.get_by_user_and_course.return_value = None
-        review_service.review_repo.create.return_value = Review(
+        review_service.review_repo.insert_if_absent.return_value = Review(
             id=1,
             course_id=1,
             user_id=1,
@@ -81,7 +86,6 @@ class TestCreateReview:
             tags=[],
             created_at=datetime.now(),
         )
-        review_service.user_repo.increment_review_count = AsyncMock()
 
         result = await review_service.create_review(
             course_id=1,
@@ -90,13 +94,22 @@ class TestCreateReview:
         )
 
         assert result.rating_overall == 5
-        review_service.review_repo.create.assert_called_once()
+        review_service.review_repo.insert_if_absent.assert_called_once()
+        review_service.user_repo.increment_review_count.assert_called_once_with(1)
+        review_service.principals.invalidate_after_commit.assert_called_once_with(
+            review_service.db, 1
+        )
+        review_service.review_repo.add_tags.assert_not_called()
+        review_service.course_repo.refresh_review_aggregates.assert_called_once_with(1)
 
     @pytest.mark.asyncio
     async def test_create_review_course_not_found(
         self, review_service, sample_user, sample_review_data
     ):
-        review_service.course_repo.get_by_id.return_value = None
+        fk_error = MagicMock(sqlstate="23503")
+        review_service.review_repo.insert_if_absent.side_effect = IntegrityError(
+            "INSERT INTO reviews", {}, fk_error
+        )
 
         with pytest.raises(CourseNotFoundError):
             await review_service.create_review(
@@ -109,16 +122,7 @@ class TestCreateReview:
     async def test_create_review_duplicate(
         self, review_service, sample_user, sample_course, sample_review_data
     ):
-        review_service.course_repo.get_by_id.return_value = sample_course
-        review_service.review_repo.get_by_user_and_course.return_value = Review(
-            id=1,
-            course_id=1,
-            user_id=1,
-            rating_overall=4,
-            difficulty=3,
-            workload=3,
-            text="기존 리뷰",
-        )
+        review_service.review_repo.insert_if_absent.return_value = None
 
         with pytest.raises(DuplicateReviewError):
             await review_service.create_review(
@@ -127,13 +131,12 @@ class TestCreateReview:
                 data=sample_review_data,
             )
 
+        review_service.user_repo.increment_review_count.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_create_review_profanity_rejected(
         self, review_service, sample_user, sample_course
     ):
-        review_service.course_repo.get_by_id.return_value = sample_course
-        review_service.review_repo.get_by_user_and_course.return_value = None
-
         bad_review = ReviewCreate(
             rating_overall=1,
             difficulty=5,
@@ -148,3 +151,59 @@ class TestCreateReview:
                 user=sample_user,
                 data=bad_review,
             )
+
+    @pytest.mark.asyncio
+    async def test_create_review_unknown_tag(
+        self, review_service, sample_user, sample_course
+    ):
+        data = ReviewCreate(
+            rating_overall=4,
+            difficulty=2,
+            workload=2,
+            text="좋은 강의입니다. 추천합니다!",
+            tag_ids=[999],
+        )
+
+        with pytest.raises(TagNotFoundError):
+            await review_service.create_review(course_id=1, user=sample_user, data=data)
+
+        review_service.review_repo.insert_if_absent.assert_not_called()
+
+
+class TestHideReview:
+    @pytest.mark.asyncio
+    async def test_hide_review_decrements_tag_counts(self, review_service):
+        review_service.review_repo.hide.return_value = Review(
+            id=1, course_id=7, rating_overall=4, difficulty=3, workload=2, is_hidden=True
+        )
+        review_service.review_repo.get_tag_ids.return_value = [1, 3]
+
+        await review_service.hide_review(1)
+
+        review_service.review_repo.hide.assert_called_once_with(1)
+        review_service.review_repo.get_by_id.assert_not_called()
+        review_service.course_repo.adjust_tag_counts.assert_called_once_with(7, [1, 3], -1)
+        review_service.course_repo.refresh_review_aggregates.assert_called_once_with(7)
+        review_service.catalog.record_review.assert_called_once_with(
+            review_service.db, 7, 4, 3, 2, delta=-1
+        )
+
+    @pytest.mark.asyncio
+    async def test_hide_review_already_hidden(self, review_service):
+        review_service.review_repo.hide.return_value = None
+        review_service.review_repo.get_by_id.return_value = Review(
+            id=1, course_id=7, user_id=1, is_hidden=True
+        )
+
+        await review_service.hide_review(1)
+
+        review_service.course_repo.adjust_tag_counts.assert_not_called()
+        review_service.course_repo.refresh_review_aggregates.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_hide_review_not_found(self, review_service):
+        review_service.review_repo.hide.return_value = None
+        review_service.review_repo.get_by_id.return_value = None
+
+        with pytest.raises(ReviewNotFoundError):
+            await review_service.hide_review(999)
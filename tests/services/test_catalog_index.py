@@ -0,0 +1,327 @@
+"""Unit tests for the in-memory course catalog index."""
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models import Course, Major, Review, User
+from app.repositories.course import course_list_stmt
+from app.schemas import CourseListResponse
+from app.services.catalog_index import CourseCatalogIndex
+
+
+def _row(id, major_id, name, reviews=(), latest=None):
+    return SimpleNamespace(
+        id=id,
+        major_id=major_id,
+        course_code=f"C{id:03d}",
+        name=name,
+        major_name=f"Major {major_id}",
+        department="공학" if major_id == 10 else "자연과학",
+        rating_sum=sum(r[0] for r in reviews) or None,
+        difficulty_sum=sum(r[1] for r in reviews) or None,
+        workload_sum=sum(r[2] for r in reviews) or None,
+        review_count=len(reviews) or None,
+        latest_review=latest,
+    )
+
+
+@pytest.fixture
+def index():
+    index = CourseCatalogIndex()
+    index.load_rows(
+        [
+            _row(1, 10, "Data Structures", [(4, 3, 3), (5, 2, 2)], datetime(2025, 3, 1, tzinfo=UTC)),
+            _row(2, 10, "Databases", [(3, 3, 3)], datetime(2025, 5, 1, tzinfo=UTC)),
+            _row(3, 20, "Statistics"),
+            _row(4, 20, "Linear Algebra", [(5, 4, 4)], datetime(2025, 1, 1, tzinfo=UTC)),
+        ],
+        # (course_id, semester, grade_target)
+        [(1, 1, 2), (1, 2, 2), (2, 2, 3), (3, 1, 1), (4, 1, 2)],
+    )
+    return index
+
+
+class TestQuery:
+    def test_top_rated_puts_unreviewed_last(self, index):
+        rows = index.query(sort="top_rated")
+
+        assert [r["id"] for r in rows] == [4, 1, 2, 3]
+        assert rows[1]["avg_rating"] == 4.5
+        assert rows[-1]["avg_rating"] is None
+        assert rows[-1]["review_count"] == 0
+
+    def test_most_reviewed(self, index):
+        rows = index.query(sort="most_reviewed")
+
+        assert [r["id"] for r in rows] == [1, 2, 4, 3]
+
+    def test_latest(self, index):
+        rows = index.query(sort="latest")
+
+        assert [r["id"] for r in rows] == [2, 1, 4, 3]
+
+    def test_filters_by_major_and_name(self, index):
+        assert [r["id"] for r in index.query(major_id=20)] == [4, 3]
+        assert [r["id"] for r in index.query(q="data")] == [1, 2]
+        assert index.query(major_id=20, q="data") == []
+
+    def test_filters_by_offering(self, index):
+        assert [r["id"] for r in index.query(grade=2, semester=1)] == [4, 1]
+        assert [r["id"] for r in index.query(grade=2)] == [4, 1]
+        assert [r["id"] for r in index.query(semester=2)] == [1, 2]
+        assert index.query(grade=4) == []
+
+    def test_filters_by_department(self, index):
+        assert [r["id"] for r in index.query(department="자연과학")] == [4, 3]
+        assert [r["id"] for r in index.query(department="공학", semester=1)] == [1]
+
+    def test_paginates(self, index):
+        first = index.query(limit=2)
+        second = index.query(limit=2, offset=2)
+
+        assert [r["id"] for r in first + second] == [4, 1, 2, 3]
+
+    def test_stats_for_known_courses(self, index):
+        stats = index.stats([1, 3, 999])
+
+        assert stats[1] == {
+            "avg_rating": 4.5,
+            "avg_difficulty": 2.5,
+            "avg_workload": 2.5,
+            "review_count": 2,
+        }
+        assert stats[3]["avg_rating"] is None
+        assert 999 not in stats
+
+    def test_unloaded_index_raises(self):
+        with pytest.raises(RuntimeError):
+            CourseCatalogIndex().query()
+
+    def test_rows_have_exactly_the_response_fields(self, index):
+        # RowsJSONResponse encodes these rows without going through the model
+        assert list(index.query()[0]) == list(CourseListResponse.model_fields)
+
+
+class TestRecommendedSort:
+    def test_many_good_reviews_beat_a_single_perfect_one(self):
+        index = CourseCatalogIndex()
+        index.load_rows(
+            [
+                _row(1, 10, "One Review", [(5, 3, 3)]),
+                _row(2, 10, "Popular", [(5, 3, 3)] * 160 + [(4, 3, 3)] * 40),
+                _row(3, 10, "Unreviewed"),
+            ]
+        )
+
+        rows = index.query(sort="recommended")
+
+        assert [r["id"] for r in rows] == [2, 1, 3]
+
+    def test_easier_course_ranks_higher_at_equal_rating(self, index):
+        index.load_rows(
+            [
+                _row(1, 10, "Hard", [(4, 5, 5)] * 10),
+                _row(2, 10, "Easy", [(4, 1, 1)] * 10),
+            ]
+        )
+
+        assert [r["id"] for r in index.query(sort="recommended")] == [2, 1]
+
+    def test_new_review_reranks(self, index):
+        for _ in range(20):
+            index.apply_review(3, 5, 1, 1)
+
+        assert index.query(sort="recommended")[0]["id"] == 3
+
+
+class TestApplyReview:
+    def test_new_review_updates_stats_and_order(self, index):
+        index.apply_review(3, 5, 1, 1, datetime(2025, 6, 1, tzinfo=UTC))
+
+        rows = index.query(sort="latest")
+        assert rows[0]["id"] == 3
+        assert rows[0]["avg_rating"] == 5.0
+        assert rows[0]["review_count"] == 1
+
+    def test_removed_review_reverts_stats(self, index):
+        index.apply_review(1, 5, 2, 2, delta=-1)
+
+        row = next(r for r in index.query() if r["id"] == 1)
+        assert row["avg_rating"] == 4.0
+        assert row["review_count"] == 1
+
+    def test_unknown_course_is_ignored(self, index):
+        index.apply_review(999, 5, 1, 1)
+
+        assert len(index.query()) == 4
+
+
+class TestReload:
+    def test_unchanged_reload_keeps_version(self, index):
+        rows = [_row(1, 10, "Data Structures", [(4, 3, 3)], datetime(2025, 3, 1, tzinfo=UTC))]
+        index.load_rows(rows)
+        version = index.version
+
+        index.load_rows(rows)
+        assert index.version == version
+
+        index.load_rows([*rows, _row(2, 10, "Databases")])
+        assert index.version == version + 1
+
+    @pytest.mark.asyncio
+    async def test_patch_during_reload_forces_another(self, index):
+        reloads = []
+
+        class Session:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return None
+
+            async def execute(self, stmt):
+                if len(reloads) == 1:
+                    # A review committed by a concurrent request mid-reload
+                    index.apply_review(3, 5, 1, 1)
+                return SimpleNamespace(all=lambda: [])
+
+        def session_factory():
+            reloads.append(1)
+            return Session()
+
+        index._session_factory = session_factory
+        index._loaded_at = 0.0
+        await index.ensure_fresh()
+        await index.ensure_fresh()
+        await index.ensure_fresh()
+
+        assert len(reloads) == 2
+
+
+class TestCachedBody:
+    def test_built_once_per_version(self, index):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return b"[]"
+
+        first = index.cached_body(("top_rated",), build)
+        assert index.cached_body(("top_rated",), build) is first
+        assert len(calls) == 1
+
+        index.apply_review(3, 5, 1, 1)
+        index.cached_body(("top_rated",), build)
+        assert len(calls) == 2
+
+
+class TestMatchesSql:
+    """The index and the Postgres fallback must page through ties identically."""
+
+    REVIEWED_AT = datetime(2025, 3, 1, tzinfo=UTC)
+    # Inserted out of id order; every reviewed course has the same stats
+    COURSES = [(5, True), (2, False), (4, True), (1, True), (3, False)]
+
+    @pytest.fixture
+    def session(self):
+        engine = create_engine("sqlite://")
+        tables = [model.__table__ for model in (Major, Course, User, Review)]
+        Major.metadata.create_all(engine, tables=tables)
+        with Session(engine) as session:
+            session.add(
+                Major(id=10, name="Major 10", department="공학", slug="m10", is_active=True)
+            )
+            session.add(User(id=1, email="a@knou.ac.kr", password_hash="x"))
+            for course_id, reviewed in self.COURSES:
+                session.add(
+                    Course(id=course_id, major_id=10, course_code=f"C{course_id:03d}", name="C")
+                )
+                if reviewed:
+                    session.add(
+                        Review(
+                            course_id=course_id,
+                            user_id=1,
+                            rating_overall=4,
+                            difficulty=3,
+                            workload=3,
+                            text="x",
+                            created_at=self.REVIEWED_AT,
+                        )
+                    )
+            session.commit()
+            yield session
+        engine.dispose()
+
+    @pytest.fixture
+    def tied_index(self):
+        index = CourseCatalogIndex()
+        index.load_rows(
+            [
+                _row(course_id, 10, "C", [(4, 3, 3)], self.REVIEWED_AT)
+                if reviewed
+                else _row(course_id, 10, "C")
+                for course_id, reviewed in sorted(self.COURSES)
+            ]
+        )
+        return index
+
+    @pytest.mark.parametrize("sort", ["top_rated", "most_reviewed", "latest"])
+    @pytest.mark.parametrize("offset", [0, 1, 3])
+    def test_same_order_on_ties(self, session, tied_index, sort, offset):
+        stmt = course_list_stmt(sort=sort, limit=2, offset=offset)
+        sql_ids = [row.id for row in session.execute(stmt)]
+
+        index_ids = [row["id"] for row in tied_index.query(sort=sort, limit=2, offset=offset)]
+
+        assert index_ids == sql_ids
+
+    @pytest.mark.parametrize("sort", ["top_rated", "most_reviewed", "latest", "recommended"])
+    def test_sql_breaks_ties_on_course_id(self, sort):
+        sql = str(course_list_stmt(sort=sort).compile())
+
+        assert sql.split("ORDER BY")[1].split("\n")[0].strip().endswith("courses.id")
+
+
+
+class TestNameSearchMatchesSql:
+    """`q` is a plain substring in both paths; LIKE wildcards in it match literally."""
+
+    NAMES = ["출석 100%", "출석 100점", "a_b", "axb", "a\\b", "Data Structures"]
+
+    @pytest.fixture
+    def session(self):
+        engine = create_engine("sqlite://")
+        tables = [model.__table__ for model in (Major, Course, User, Review)]
+        Major.metadata.create_all(engine, tables=tables)
+        with Session(engine) as session:
+            session.add(
+                Major(id=10, name="Major 10", department="공학", slug="m10", is_active=True)
+            )
+            for course_id, name in enumerate(self.NAMES, start=1):
+                session.add(
+                    Course(id=course_id, major_id=10, course_code=f"C{course_id:03d}", name=name)
+                )
+            session.commit()
+            yield session
+        engine.dispose()
+
+    @pytest.fixture
+    def named_index(self):
+        index = CourseCatalogIndex()
+        index.load_rows(
+            [_row(course_id, 10, name) for course_id, name in enumerate(self.NAMES, start=1)]
+        )
+        return index
+
+    @pytest.mark.parametrize("q", ["100%", "%", "a_b", "_", "a\\b", "\\", "data"])
+    def test_same_matches(self, session, named_index, q):
+        sql_ids = [row.id for row in session.execute(course_list_stmt(q=q, limit=100))]
+
+        index_ids = [row["id"] for row in named_index.query(q=q, limit=100)]
+
+        assert index_ids == sql_ids
+        assert sql_ids
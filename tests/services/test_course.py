@@ -0,0 +1,243 @@
+"""Unit tests for CourseService."""
+
+import base64
+import json
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models import Course, Major, Review, User
+from app.services.cache import Cache, InMemoryBackend
+from app.services.course import CourseService, publish_catalog_version
+from app.utils.auth import LazyUser
+from app.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def course_service():
+    service = CourseService(AsyncMock(), AsyncMock())
+    service.course_repo = AsyncMock()
+    service.review_repo = AsyncMock()
+    return service
+
+
+@pytest.fixture
+def full_access_user():
+    return User(
+        id=1,
+        email="test@knou.ac.kr",
+        password_hash="x",
+        is_verified=True,
+        review_count=3,
+        created_at=datetime.now(UTC) - timedelta(days=30),
+    )
+
+
+def make_reviews(count: int) -> list[Review]:
+    now = datetime.now(UTC)
+    return [
+        Review(
+            id=count - i,
+            course_id=1,
+            user_id=i + 10,
+            rating_overall=5,
+            difficulty=2,
+            workload=2,
+            text="좋은 강의입니다. 추천합니다!",
+            created_at=now - timedelta(minutes=i),
+            tags=[],
+        )
+        for i in range(count)
+    ]
+
+
+class TestCursor:
+    def test_round_trip(self):
+        created_at = datetime(2026, 3, 1, 12, 0, tzinfo=UTC)
+        assert decode_cursor(encode_cursor(4, created_at, 42)) == (4, created_at, 42)
+
+    def test_invalid_cursor(self):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor("not-a-cursor")
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            ["5", "2026-03-01T12:00:00+00:00", 42],
+            [4.5, "2026-03-01T12:00:00+00:00", 42],
+            [True, "2026-03-01T12:00:00+00:00", 42],
+            [4, "2026-03-01T12:00:00+00:00", "42"],
+        ],
+    )
+    def test_tampered_value_types(self, payload):
+        cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+
+    def test_null_sort_value(self):
+        created_at = datetime(2026, 3, 1, 12, 0, tzinfo=UTC)
+        assert decode_cursor(encode_cursor(None, created_at, 42)) == (None, created_at, 42)
+
+
+class TestGetReviewsPage:
+    @pytest.mark.asyncio
+    async def test_returns_next_cursor_when_more_rows(self, course_service, full_access_user):
+        reviews = make_reviews(3)
+        course_service.review_repo.get_page_by_course_id.return_value = reviews
+
+        page = await course_service.get_reviews_page(1, full_access_user, limit=2)
+
+        assert [r.id for r in page.items] == [3, 2]
+        assert decode_cursor(page.next_cursor) == (None, reviews[1].created_at, 2)
+        course_service.review_repo.get_page_by_course_id.assert_called_once_with(
+            1, sort="newest", limit=3, after=None
+        )
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self, course_service, full_access_user):
+        course_service.review_repo.get_page_by_course_id.return_value = make_reviews(2)
+
+        page = await course_service.get_reviews_page(1, full_access_user, limit=2)
+
+        assert len(page.items) == 2
+        assert page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_hidden_without_access(self, course_service):
+        course_service.course_repo.get_by_id.return_value = Course(id=1)
+
+        page = await course_service.get_reviews_page(1, None)
+
+        assert page.items == []
+        course_service.review_repo.get_page_by_course_id.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_course_not_found(self, course_service, full_access_user):
+        course_service.review_repo.get_page_by_course_id.return_value = []
+        course_service.course_repo.get_by_id.return_value = None
+
+        assert await course_service.get_reviews_page(999, full_access_user) is None
+
+    @pytest.mark.asyncio
+    async def test_cursor_sort_mismatch(self, course_service, full_access_user):
+        cursor = encode_cursor(None, datetime.now(UTC), 1)
+
+        with pytest.raises(InvalidCursorError):
+            await course_service.get_reviews_page(
+                1, full_access_user, sort="rating", cursor=cursor
+            )
+
+
+def make_course(course_id: int) -> Course:
+    major = Major(id=1, name="컴퓨터과학과", department="자연과학대학")
+    return Course(
+        id=course_id,
+        course_code=f"C{course_id}",
+        name=f"Course {course_id}",
+        is_archived=False,
+        major=major,
+    )
+
+
+def stats(rating: float | None = None, count: int = 0) -> dict:
+    return {
+        "avg_rating": rating,
+        "avg_difficulty": rating,
+        "avg_workload": rating,
+        "review_count": count,
+    }
+
+
+class TestGetDetail:
+    @pytest.mark.asyncio
+    async def test_missing_course_does_not_resolve_user(self, course_service):
+        course_service.course_repo.get_detail_with_stats.return_value = None
+        user = MagicMock(spec=LazyUser)
+
+        assert await course_service.get_detail(1, user) is None
+        user.get.assert_not_called()
+
+
+class TestGetBatch:
+    @pytest.fixture(autouse=True)
+    def catalog(self, course_service):
+        course_service.catalog = MagicMock()
+        course_service.catalog.ensure_fresh = AsyncMock()
+        course_service.catalog.stats.return_value = {}
+        return course_service.catalog
+
+    @pytest.mark.asyncio
+    async def test_keeps_requested_order_and_skips_unknown(self, course_service):
+        course_service.course_repo.get_many_for_detail.return_value = {
+            1: {"course": make_course(1), "histogram": None},
+            2: {"course": make_course(2), "histogram": None},
+        }
+        course_service.course_repo.get_stats_many.return_value = {1: stats(), 2: stats()}
+
+        result = await course_service.get_batch([2, 99, 1])
+
+        assert [c.id for c in result] == [2, 1]
+        assert all(c.reviews == [] for c in result)
+        course_service.review_repo.get_latest_by_course_ids.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_uses_warm_stats_and_queries_the_rest(self, course_service, catalog):
+        course_service.course_repo.get_many_for_detail.return_value = {
+            1: {"course": make_course(1), "histogram": None},
+            2: {"course": make_course(2), "histogram": None},
+        }
+        catalog.stats.return_value = {1: stats(4.5, 2)}
+        course_service.course_repo.get_stats_many.return_value = {2: stats(3.0, 1)}
+
+        result = await course_service.get_batch([1, 2])
+
+        assert [c.avg_rating for c in result] == [4.5, 3.0]
+        course_service.course_repo.get_stats_many.assert_called_once_with([2])
+
+    @pytest.mark.asyncio
+    async def test_review_preview_for_full_access(self, course_service, full_access_user):
+        course_service.course_repo.get_many_for_detail.return_value = {
+            1: {"course": make_course(1), "histogram": [0, 0, 0, 1, 4] + [0] * 10},
+        }
+        course_service.course_repo.get_stats_many.return_value = {1: stats(5.0, 5)}
+        course_service.review_repo.get_latest_by_course_ids.return_value = {1: make_reviews(4)}
+
+        [course] = await course_service.get_batch([1], full_access_user)
+
+        assert course.histogram.rating == [0, 0, 0, 1, 4]
+        assert course.histogram.workload == [0] * 5
+        assert [r.id for r in course.reviews] == [4, 3, 2]
+        assert course.reviews_next_cursor is not None
+        course_service.review_repo.get_latest_by_course_ids.assert_called_once_with([1], 4)
+
+
+class TestGetFacets:
+    FACETS = {"grades": {1: 10, 2: 8}, "semesters": {1: 12, 2: 9}, "departments": {"공학": 5}}
+
+    @pytest.mark.asyncio
+    async def test_computed_once_per_catalog_version(self, course_service):
+        course_service.cache = Cache(InMemoryBackend())
+        course_service.course_repo.get_facets.return_value = self.FACETS
+
+        first = await course_service.get_facets()
+        second = await course_service.get_facets()
+
+        assert first == second
+        assert first.grades == {1: 10, 2: 8}
+        course_service.course_repo.get_facets.assert_called_once()
+
+        await publish_catalog_version(course_service.cache.client)
+        await course_service.get_facets()
+
+        assert course_service.course_repo.get_facets.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_db_when_cache_fails(self, course_service):
+        course_service.cache.client.get.side_effect = ConnectionError()
+        course_service.course_repo.get_facets.return_value = self.FACETS
+
+        result = await course_service.get_facets()
+
+        assert result.departments == {"공학": 5}
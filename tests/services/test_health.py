@@ -0,0 +1,184 @@
+"""Unit tests for the background dependency health checker."""
+
+import asyncio
+
+import pytest
+
+from app.constants import HealthStatus
+from app.services.health import HealthChecker
+
+
+class FakeRedis:
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+
+    async def ping(self):
+        if self.error is not None:
+            raise self.error
+        return True
+
+
+def make_checker(
+    ping_db=None,
+    redis=None,
+    redis_configured=True,
+    pool=None,
+    warm=True,
+    interval=5,
+    timeout=0.5,
+) -> HealthChecker:
+    async def healthy_db():
+        return None
+
+    async def redis_factory():
+        return redis if redis is not None else FakeRedis()
+
+    return HealthChecker(
+        ping_db=ping_db or healthy_db,
+        redis_factory=redis_factory,
+        redis_configured=lambda: redis_configured,
+        pool_stats=lambda: pool
+        if pool is not None
+        else {"size": 5, "max_overflow": 10, "checked_out": 1, "idle": 2, "overflow": 0},
+        warm_caches={"course_catalog": lambda: warm},
+        interval=interval,
+        timeout=timeout,
+    )
+
+
+class TestChecks:
+    @pytest.mark.asyncio
+    async def test_all_healthy(self):
+        checker = make_checker()
+
+        report = await checker.check()
+        ready, body = checker.readiness()
+
+        assert report.status == HealthStatus.OK
+        assert ready
+        assert body["checks"]["database"]["status"] == "ok"
+        assert body["checks"]["database"]["latency_ms"] is not None
+        assert body["checks"]["redis"]["detail"] == {"backend": "redis"}
+        assert body["checks"]["db_pool"]["detail"]["saturation"] == round(1 / 15, 3)
+
+    @pytest.mark.asyncio
+    async def test_database_error_fails_readiness(self):
+        async def broken_db():
+            raise ConnectionRefusedError("postgresql://user:secret@db")
+
+        checker = make_checker(ping_db=broken_db)
+
+        await checker.check()
+        ready, body = checker.readiness()
+
+        assert not ready
+        assert body["status"] == "down"
+        # No connection string in the probe response
+        assert body["checks"]["database"]["error"] == "ConnectionRefusedError"
+
+    @pytest.mark.asyncio
+    async def test_database_timeout_fails_readiness(self):
+        async def hanging_db():
+            await asyncio.sleep(10)
+
+        checker = make_checker(ping_db=hanging_db, timeout=0.01)
+
+        await checker.check()
+        ready, body = checker.readiness()
+
+        assert not ready
+        assert "timed out" in body["checks"]["database"]["error"]
+
+    @pytest.mark.asyncio
+    async def test_redis_down(self):
+        checker = make_checker(redis=FakeRedis(ConnectionError("refused")))
+
+        report = await checker.check()
+
+        assert report.checks["redis"].status == HealthStatus.DOWN
+
+    @pytest.mark.asyncio
+    async def test_redis_not_configured_is_ok(self):
+        checker = make_checker(redis_configured=False)
+
+        report = await checker.check()
+
+        assert report.checks["redis"].status == HealthStatus.OK
+        assert report.checks["redis"].detail == {"backend": "memory"}
+
+    @pytest.mark.asyncio
+    async def test_saturated_pool_fails_readiness(self):
+        pool = {"size": 5, "max_overflow": 10, "checked_out": 15, "idle": 0, "overflow": 10}
+        checker = make_checker(pool=pool)
+
+        await checker.check()
+        ready, body = checker.readiness()
+
+        assert not ready
+        assert body["checks"]["db_pool"]["status"] == "down"
+
+    @pytest.mark.asyncio
+    async def test_busy_pool_is_degraded(self):
+        pool = {"size": 5, "max_overflow": 10, "checked_out": 12, "idle": 0, "overflow": 7}
+        checker = make_checker(pool=pool)
+
+        report = await checker.check()
+
+        assert report.checks["db_pool"].status == HealthStatus.DEGRADED
+        assert checker.readiness()[0]
+
+    @pytest.mark.asyncio
+    async def test_cold_cache_is_degraded_but_ready(self):
+        checker = make_checker(warm=False)
+
+        report = await checker.check()
+
+        assert report.status == HealthStatus.DEGRADED
+        assert report.checks["caches"].detail == {"course_catalog": False}
+        assert checker.readiness()[0]
+
+
+class TestReadiness:
+    def test_not_ready_before_first_check(self):
+        ready, body = make_checker().readiness()
+
+        assert not ready
+        assert body["status"] == "down"
+
+    @pytest.mark.asyncio
+    async def test_stale_report_is_not_ready(self):
+        checker = make_checker(interval=0.001)
+        await checker.check()
+        await asyncio.sleep(0.01)
+
+        ready, body = checker.readiness()
+
+        assert not ready
+        assert body["reason"] == "health checks are not running"
+
+    @pytest.mark.asyncio
+    async def test_readiness_does_not_run_checks(self):
+        calls = 0
+
+        async def counting_db():
+            nonlocal calls
+            calls += 1
+
+        checker = make_checker(ping_db=counting_db)
+        await checker.check()
+        for _ in range(5):
+            checker.readiness()
+
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_background_task_refreshes_report(self):
+        checker = make_checker(interval=0.01)
+
+        checker.start()
+        await asyncio.sleep(0.005)
+        first = checker.readiness()[1]["checked_at"]
+        await asyncio.sleep(0.03)
+        await checker.stop()
+
+        assert checker.readiness()[1]["checked_at"] != first
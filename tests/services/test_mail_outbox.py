@@ -0,0 +1,156 @@
+"""Unit tests for the email outbox worker."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.constants import MailConstants
+from app.models import OutboxEmail
+from app.services.mail_outbox import MailOutbox, SendPacer
+from app.services.mailer import MailSendError
+
+
+def _email(email_id: int, attempts: int = 1) -> OutboxEmail:
+    return OutboxEmail(
+        id=email_id,
+        to_email=f"user{email_id}@knou.ac.kr",
+        subject="인증",
+        html_body="<p>hi</p>",
+        attempts=attempts,
+    )
+
+
+@pytest.fixture
+def repo():
+    with patch("app.services.mail_outbox.EmailOutboxRepository") as MockRepo:
+        MockRepo.return_value = AsyncMock()
+        yield MockRepo.return_value
+
+
+@pytest.fixture
+def transport():
+    return AsyncMock()
+
+
+@pytest.fixture
+def outbox(repo, transport):
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=AsyncMock())
+    session.__aexit__ = AsyncMock(return_value=None)
+    return MailOutbox(
+        session_factory=MagicMock(return_value=session),
+        transport_factory=lambda: transport,
+        rate=0,
+    )
+
+
+class TestRunOnce:
+    @pytest.mark.asyncio
+    async def test_sends_batch_and_marks_sent(self, outbox, repo, transport):
+        repo.claim_due.return_value = [_email(1), _email(2)]
+
+        assert await outbox.run_once() == 2
+
+        assert [c.args[0].to_email for c in transport.send.call_args_list] == [
+            "user1@knou.ac.kr", "user2@knou.ac.kr"
+        ]
+        repo.mark_sent.assert_called_once_with([1, 2])
+        repo.reschedule.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_empty_outbox_does_not_build_transport(self, repo):
+        repo.claim_due.return_value = []
+        factory = MagicMock()
+        session = MagicMock(__aenter__=AsyncMock(), __aexit__=AsyncMock(return_value=None))
+        outbox = MailOutbox(MagicMock(return_value=session), factory, rate=0)
+
+        assert await outbox.run_once() == 0
+        factory.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_is_rescheduled(self, outbox, repo, transport):
+        repo.claim_due.return_value = [_email(1), _email(2)]
+        transport.send.side_effect = [MailSendError("timeout"), None]
+
+        await outbox.run_once()
+
+        repo.mark_sent.assert_called_once_with([2])
+        email_id, next_attempt_at, error = repo.reschedule.call_args.args
+        assert email_id == 1
+        assert error == "timeout"
+        repo.mark_failed.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_permanent_failure_is_not_retried(self, outbox, repo, transport):
+        repo.claim_due.return_value = [_email(1)]
+        transport.send.side_effect = MailSendError("bad address", permanent=True)
+
+        await outbox.run_once()
+
+        repo.mark_failed.assert_called_once_with(1, "bad address")
+        repo.reschedule.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self, outbox, repo, transport):
+        repo.claim_due.return_value = [_email(1, attempts=MailConstants.MAX_ATTEMPTS)]
+        transport.send.side_effect = MailSendError("timeout")
+
+        await outbox.run_once()
+
+        repo.mark_failed.assert_called_once_with(1, "timeout")
+
+    @pytest.mark.asyncio
+    async def test_renews_lease_while_sending(self, outbox, repo, transport):
+        repo.claim_due.return_value = [_email(1), _email(2, attempts=3)]
+
+        async def slow_send(message):
+            await asyncio.sleep(0.05)
+
+        transport.send.side_effect = slow_send
+
+        with patch.object(MailConstants, "LEASE_RENEW_INTERVAL_SECONDS", 0.01):
+            await outbox.run_once()
+            calls = repo.extend_lease.await_count
+            await asyncio.sleep(0.03)
+
+        assert calls >= 1
+        repo.extend_lease.assert_called_with([(1, 1), (2, 3)], MailConstants.CLAIM_LEASE_SECONDS)
+        # Stops once the batch is recorded
+        assert repo.extend_lease.await_count == calls
+        repo.mark_sent.assert_called_once_with([1, 2])
+
+
+class TestSendPacer:
+    @pytest.mark.asyncio
+    async def test_spaces_sends_and_honours_pause(self):
+        pacer = SendPacer(rate=100)
+        loop = asyncio.get_running_loop()
+
+        started = loop.time()
+        for _ in range(3):
+            await pacer.wait()
+        assert loop.time() - started >= 0.02
+
+        pacer.pause(0.05)
+        started = loop.time()
+        await pacer.wait()
+        assert loop.time() - started >= 0.04
+
+
+class TestEnqueue:
+    @pytest.mark.asyncio
+    async def test_wakes_worker_only_after_commit(self, outbox, repo):
+        session = Session()
+        db = SimpleNamespace(sync_session=session)
+
+        await outbox.enqueue(db, "user@knou.ac.kr", "인증", "<p>hi</p>")
+        repo.create.assert_called_once_with(
+            to_email="user@knou.ac.kr", subject="인증", html_body="<p>hi</p>"
+        )
+        assert not outbox._wakeup.is_set()
+
+        session.commit()
+        assert outbox._wakeup.is_set()
@@ -0,0 +1,144 @@
+"""Mail transports against a local fake SMTP server."""
+
+import asyncio
+import email
+
+import httpx
+import pytest
+
+from app.services.mailer import MailMessage, MailSendError, SendGridTransport, SmtpTransport
+
+
+class FakeSmtpServer:
+    """Just enough SMTP to accept messages; `reject_rcpt` answers RCPT with that code."""
+
+    def __init__(self):
+        self.messages: list[email.message.Message] = []
+        self.connections = 0
+        self.reject_rcpt: int | None = None
+        self._server: asyncio.Server | None = None
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def close(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+
+        async def reply(line: str) -> None:
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        await reply("220 fake ESMTP")
+        while line := (await reader.readline()).decode().rstrip("\r\n"):
+            command = line.split(" ", 1)[0].upper()
+            if command in ("EHLO", "HELO"):
+                await reply("250 fake")
+            elif command == "RCPT" and self.reject_rcpt:
+                await reply(f"{self.reject_rcpt} rejected")
+            elif command == "DATA":
+                await reply("354 go ahead")
+                data = bytearray()
+                while (chunk := await reader.readline()) != b".\r\n":
+                    data += chunk
+                self.messages.append(email.message_from_bytes(bytes(data)))
+                await reply("250 queued")
+            elif command == "QUIT":
+                await reply("221 bye")
+                break
+            else:
+                await reply("250 ok")
+        writer.close()
+
+
+@pytest.fixture
+async def smtp_server():
+    server = FakeSmtpServer()
+    await server.start()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+async def transport(smtp_server):
+    transport = SmtpTransport("127.0.0.1", smtp_server.port, "no-reply@knouhoney.com")
+    yield transport
+    await transport.close()
+
+
+class TestSmtpTransport:
+    @pytest.mark.asyncio
+    async def test_sends_over_one_connection(self, transport, smtp_server):
+        for i in range(3):
+            await transport.send(MailMessage(f"user{i}@knou.ac.kr", "인증", "<p>hi</p>"))
+
+        assert [m["To"] for m in smtp_server.messages] == [
+            "user0@knou.ac.kr", "user1@knou.ac.kr", "user2@knou.ac.kr"
+        ]
+        assert smtp_server.messages[0].get_content_type() == "text/html"
+        assert smtp_server.connections == 1
+
+    @pytest.mark.asyncio
+    async def test_temporary_rejection_is_retryable(self, transport, smtp_server):
+        smtp_server.reject_rcpt = 451
+
+        with pytest.raises(MailSendError) as exc_info:
+            await transport.send(MailMessage("user@knou.ac.kr", "s", "b"))
+
+        assert not exc_info.value.permanent
+
+    @pytest.mark.asyncio
+    async def test_permanent_rejection(self, transport, smtp_server):
+        smtp_server.reject_rcpt = 550
+
+        with pytest.raises(MailSendError) as exc_info:
+            await transport.send(MailMessage("user@knou.ac.kr", "s", "b"))
+
+        assert exc_info.value.permanent
+
+
+def _sendgrid(status_code: int, headers: dict | None = None) -> SendGridTransport:
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(status_code, headers=headers))
+    )
+    return SendGridTransport("key", "no-reply@knouhoney.com", client=client)
+
+
+class TestSendGridTransport:
+    MESSAGE = MailMessage("user@knou.ac.kr", "s", "b")
+
+    @pytest.mark.asyncio
+    async def test_accepted(self):
+        await _sendgrid(202).send(self.MESSAGE)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status_code", [401, 403, 500, 503])
+    async def test_auth_and_server_errors_are_retryable(self, status_code, caplog):
+        with pytest.raises(MailSendError) as exc_info:
+            await _sendgrid(status_code).send(self.MESSAGE)
+
+        assert not exc_info.value.permanent
+        if status_code < 500:
+            assert any(r.levelname == "CRITICAL" for r in caplog.records)
+
+    @pytest.mark.asyncio
+    async def test_rejected_message_is_permanent(self):
+        with pytest.raises(MailSendError) as exc_info:
+            await _sendgrid(400).send(self.MESSAGE)
+
+        assert exc_info.value.permanent
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_pauses_sending(self):
+        with pytest.raises(MailSendError) as exc_info:
+            await _sendgrid(429, {"Retry-After": "7"}).send(self.MESSAGE)
+
+        assert not exc_info.value.permanent
+        assert exc_info.value.retry_after == 7.0
@@ -0,0 +1,73 @@
+"""Unit tests for the in-memory tag registry."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.constants import CacheKeys
+from app.models import Tag, TagType
+from app.services.cache import InMemoryBackend
+from app.services.tag_registry import TagRegistry
+
+TAGS = [
+    Tag(id=1, name="기말시험", type=TagType.EVAL_METHOD),
+    Tag(id=2, name="기출많음", type=TagType.FREEFORM),
+]
+
+
+@pytest.fixture
+def session_factory():
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    return MagicMock(return_value=session)
+
+
+@pytest.fixture
+def mock_tag_service():
+    with patch("app.services.tag_registry.TagService") as MockService:
+        MockService.return_value.get_all = AsyncMock(return_value=TAGS)
+        yield MockService
+
+
+class TestTagRegistry:
+    @pytest.mark.asyncio
+    async def test_loads_on_first_use(self, session_factory, mock_tag_service):
+        registry = TagRegistry(session_factory=session_factory)
+
+        await registry.ensure_fresh()
+
+        assert registry.is_loaded
+        assert [t.name for t in registry.all()] == ["기말시험", "기출많음"]
+        assert [t.id for t in registry.get_many([2, 1])] == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_unknown_id_returns_none(self, session_factory, mock_tag_service):
+        registry = TagRegistry(session_factory=session_factory)
+        await registry.ensure_fresh()
+
+        assert registry.get_many([1, 999]) is None
+        assert registry.get_many([]) == []
+
+    @pytest.mark.asyncio
+    async def test_served_from_memory(self, session_factory, mock_tag_service):
+        cache = InMemoryBackend()
+        registry = TagRegistry(session_factory=session_factory)
+
+        await registry.ensure_fresh(cache)
+        await registry.ensure_fresh(cache)
+
+        assert session_factory.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_reloads_on_version_change(self, session_factory, mock_tag_service):
+        cache = InMemoryBackend()
+        registry = TagRegistry(session_factory=session_factory, check_interval=0)
+        await registry.ensure_fresh(cache)
+
+        await registry.publish_version(cache)
+        await registry.ensure_fresh(cache)
+        await registry.ensure_fresh(cache)
+
+        assert session_factory.call_count == 2
+        assert registry._version == await cache.get(CacheKeys.TAG_CATALOG_VERSION)